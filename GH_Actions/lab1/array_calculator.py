@@ -0,0 +1,101 @@
+"""
+Vectorized calculator operations on NumPy arrays.
+
+ArrayCalculator has the same methods as Calculator but accepts NumPy arrays,
+Python sequences or any buffer-protocol object (array.array, memoryview, ...)
+and broadcasts them like NumPy does. Invalid elements (division by zero,
+square root of a negative number) are checked across the whole array at once:
+either all of them are reported in a single ArrayValueError, or the result is
+returned as a masked array with those elements masked out.
+"""
+
+import numpy as np
+
+from calculator import Calculator
+
+
+class ArrayValueError(ValueError):
+    """Raised when one or more array elements are invalid for an operation."""
+
+    def __init__(self, message, mask):
+        super().__init__(message)
+        self.mask = mask
+        self.count = int(np.count_nonzero(mask))
+        self.indices = np.argwhere(mask)
+
+
+class ArrayCalculator(Calculator):
+    """A calculator whose operations work element-wise on whole arrays."""
+
+    ERROR_MODES = ("raise", "mask")
+
+    def __init__(self, errors="raise"):
+        """
+        Create an array calculator.
+
+        errors: "raise" to raise ArrayValueError listing every invalid element,
+                or "mask" to return a numpy.ma.MaskedArray with them masked
+        """
+        if errors not in self.ERROR_MODES:
+            raise ValueError(f"errors must be one of {self.ERROR_MODES}")
+        self.errors = errors
+
+    def add(self, a, b):
+        """Add two arrays element-wise."""
+        return np.add(np.asarray(a), np.asarray(b))
+
+    def subtract(self, a, b):
+        """Subtract b from a element-wise."""
+        return np.subtract(np.asarray(a), np.asarray(b))
+
+    def multiply(self, a, b):
+        """Multiply two arrays element-wise."""
+        return np.multiply(np.asarray(a), np.asarray(b))
+
+    def divide(self, a, b):
+        """Divide a by b element-wise, checking every divisor for zero."""
+        a = np.asarray(a)
+        b = np.asarray(b)
+        invalid = b == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = np.true_divide(a, b)
+        return self._check(result, invalid, "Cannot divide by zero")
+
+    def power(self, base, exponent):
+        """Raise base to the power of exponent element-wise."""
+        base = np.asarray(base)
+        exponent = np.asarray(exponent)
+        # NumPy refuses negative integer powers of integers; Calculator
+        # returns a float for those (2 ** -1 == 0.5), so do the same
+        if (np.issubdtype(base.dtype, np.integer)
+                and np.issubdtype(exponent.dtype, np.integer)
+                and np.any(exponent < 0)):
+            return np.float_power(base, exponent)
+        result = np.power(base, exponent)
+        if np.issubdtype(result.dtype, np.integer):
+            # Integer powers wrap around silently; Calculator's are exact,
+            # so flag every element whose true value does not fit the dtype
+            info = np.iinfo(result.dtype)
+            with np.errstate(over="ignore"):
+                exact = np.float_power(base, exponent)
+            invalid = (exact >= 2.0 ** info.bits if info.min == 0 else
+                       (exact >= 2.0 ** (info.bits - 1)) | (exact < -(2.0 ** (info.bits - 1))))
+            return self._check(result, invalid, "Result is too large for the integer type")
+        return result
+
+    def square_root(self, number):
+        """Calculate the square root element-wise, checking for negative numbers."""
+        number = np.asarray(number)
+        invalid = number < 0
+        with np.errstate(invalid="ignore"):
+            result = np.sqrt(number)
+        return self._check(result, invalid, "Cannot calculate square root of negative number")
+
+    def _check(self, result, invalid, message):
+        """Apply the error mode to the elements of result flagged in invalid."""
+        invalid = np.broadcast_to(invalid, np.shape(result))
+        if self.errors == "mask":
+            return np.ma.masked_array(result, mask=invalid)
+        if invalid.any():
+            raise ArrayValueError(message, invalid)
+        return result
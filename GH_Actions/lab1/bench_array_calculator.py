@@ -0,0 +1,57 @@
+"""
+Benchmark: ArrayCalculator versus a scalar Calculator loop.
+
+Usage:
+    python bench_array_calculator.py [size]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+
+from array_calculator import ArrayCalculator
+from calculator import Calculator
+
+
+def scalar_loop(method, a, b=None):
+    """Apply a scalar Calculator method element by element."""
+    if b is None:
+        return [method(x) for x in a]
+    return [method(x, y) for x, y in zip(a, b)]
+
+
+def main():
+    """Time each operation both ways and print the speedup."""
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    a = rng.uniform(1, 100, size)
+    b = rng.uniform(1, 100, size)
+    a_list, b_list = a.tolist(), b.tolist()
+
+    calc = Calculator()
+    array_calc = ArrayCalculator()
+
+    cases = [
+        ("add", lambda: scalar_loop(calc.add, a_list, b_list),
+         lambda: array_calc.add(a, b)),
+        ("divide", lambda: scalar_loop(calc.divide, a_list, b_list),
+         lambda: array_calc.divide(a, b)),
+        ("power", lambda: scalar_loop(calc.power, a_list, [2.0] * size),
+         lambda: array_calc.power(a, 2.0)),
+        ("square_root", lambda: scalar_loop(calc.square_root, a_list),
+         lambda: array_calc.square_root(a)),
+    ]
+
+    print(f"Calculator vs ArrayCalculator, {size:,} elements")
+    print("-" * 56)
+    print(f"{'operation':<12} {'scalar loop':>12} {'vectorized':>12} {'speedup':>10}")
+    for name, scalar, vectorized in cases:
+        scalar_time = min(timeit.repeat(scalar, number=1, repeat=3))
+        vector_time = min(timeit.repeat(vectorized, number=1, repeat=3))
+        print(f"{name:<12} {scalar_time * 1000:>10.1f}ms {vector_time * 1000:>10.2f}ms "
+              f"{scalar_time / vector_time:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
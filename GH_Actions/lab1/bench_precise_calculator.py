@@ -0,0 +1,75 @@
+"""
+Benchmark: PreciseCalculator backends.
+
+Times each operation per backend on small operands, then the big-number
+cases that motivated the exact backends.
+
+Usage:
+    python bench_precise_calculator.py [iterations]
+"""
+
+import decimal
+import sys
+import timeit
+
+from precise_calculator import PreciseCalculator
+
+
+def time_per_call(func, iterations):
+    """Return the best time per call in microseconds."""
+    best = min(timeit.repeat(func, number=iterations, repeat=3))
+    return best / iterations * 1_000_000
+
+
+def main():
+    """Print a timing table per backend and the big-number comparisons."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    calculators = {
+        "float": PreciseCalculator("float"),
+        "decimal": PreciseCalculator("decimal", decimal.Context(prec=50)),
+        "fraction": PreciseCalculator("fraction"),
+        "integer": PreciseCalculator("integer"),
+    }
+    operations = {
+        "add": lambda calc: calc.add(123, 456),
+        "divide": lambda calc: calc.divide(144, 12),
+        "power": lambda calc: calc.power(7, 20),
+        "square_root": lambda calc: calc.square_root(144),
+    }
+
+    print(f"PreciseCalculator backends, {iterations:,} calls per cell (us/call)")
+    print("-" * 60)
+    print(f"{'operation':<12}" + "".join(f"{name:>12}" for name in calculators))
+    for op_name, op in operations.items():
+        row = f"{op_name:<12}"
+        for calc in calculators.values():
+            row += f"{time_per_call(lambda: op(calc), iterations):>12.2f}"
+        print(row)
+
+    print()
+    print("Big numbers")
+    print("-" * 60)
+    integer = calculators["integer"]
+    big_square = (10 ** 200 + 7) ** 2
+    cases = [
+        ("isqrt of 400-digit square", lambda: integer.square_root(big_square)),
+        ("decimal sqrt, prec=50", lambda: calculators["decimal"].square_root(big_square)),
+        ("power(3, 10**100, mod)", lambda: integer.power(3, 10 ** 100, 1_000_000_007)),
+        ("power(3, 100_000)", lambda: integer.power(3, 100_000)),
+        ("guarded power(3, 10**9)", lambda: _rejected(integer, 3, 10 ** 9)),
+    ]
+    for name, func in cases:
+        print(f"{name:<32}{time_per_call(func, 100):>12.2f} us")
+
+
+def _rejected(calc, base, exponent):
+    """Call power() expecting the size guard to reject it."""
+    try:
+        calc.power(base, exponent)
+    except ValueError:
+        return None
+    raise AssertionError("power() was not rejected")
+
+
+if __name__ == "__main__":
+    main()
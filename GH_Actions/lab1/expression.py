@@ -0,0 +1,230 @@
+"""
+Arithmetic expressions compiled on top of Calculator.
+
+A formula such as "(price - cost) / price * 100" is parsed once into a tree
+of Calculator operations, constant sub-expressions are folded at compile
+time, and the result is turned into a chain of closures (the plan) that can
+be evaluated cheaply against many variable bindings:
+
+    expr = compile_expression("(price - cost) / price * 100")
+    expr.evaluate(price=20, cost=15)               # 25.0
+    expr.evaluate_batch({"price": [...], "cost": [...]})
+
+Division by zero and square roots of negative numbers raise the same
+ValueError as Calculator does.
+"""
+
+import ast
+from functools import lru_cache
+
+from calculator import Calculator
+
+
+# Python operator -> Calculator method
+BINARY_OPERATORS = {
+    ast.Add: "add",
+    ast.Sub: "subtract",
+    ast.Mult: "multiply",
+    ast.Div: "divide",
+    ast.Pow: "power",
+}
+
+# Function name usable in formulas -> Calculator method
+FUNCTIONS = {
+    "sqrt": "square_root",
+}
+
+# Integer powers estimated to need more bits than this are not folded, so
+# compiling a formula never computes a huge number
+MAX_FOLDED_POWER_BITS = 4096
+
+
+class ExpressionError(ValueError):
+    """Raised for formulas that cannot be parsed or evaluated."""
+
+
+def _parse(source):
+    """
+    Parse source into a tree of tuples:
+
+        ("const", value)
+        ("var", name)
+        ("call", method_name, (operand, ...))
+    """
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression: {e.msg}") from None
+    return _convert(tree.body)
+
+
+def _convert(node):
+    """Convert a Python AST node into the expression tree."""
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"Unsupported constant: {node.value!r}")
+        return ("const", node.value)
+    if isinstance(node, ast.Name):
+        return ("var", node.id)
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        method = BINARY_OPERATORS[type(node.op)]
+        return ("call", method, (_convert(node.left), _convert(node.right)))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+        return _convert(node.operand)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return ("call", "subtract", (("const", 0), _convert(node.operand)))
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in FUNCTIONS and len(node.args) == 1 and not node.keywords):
+        return ("call", FUNCTIONS[node.func.id], (_convert(node.args[0]),))
+    raise ExpressionError(f"Unsupported syntax: {ast.dump(node)}")
+
+
+def _too_large_to_fold(method, values):
+    """Return True if calling method on values could build a huge integer."""
+    if method != "power":
+        return False
+    base, exponent = values
+    if not isinstance(base, int) or not isinstance(exponent, int) or abs(base) <= 1:
+        return False  # float powers overflow quickly instead
+    # Same estimate as PreciseCalculator._check_power_size
+    return base.bit_length() * abs(exponent) > MAX_FOLDED_POWER_BITS
+
+
+def _fold(node, calc):
+    """Evaluate sub-trees whose operands are all constants."""
+    if node[0] != "call":
+        return node
+    _, method, operands = node
+    operands = tuple(_fold(operand, calc) for operand in operands)
+    if all(operand[0] == "const" for operand in operands):
+        values = [operand[1] for operand in operands]
+        if _too_large_to_fold(method, values):
+            return ("call", method, operands)
+        try:
+            return ("const", getattr(calc, method)(*values))
+        except (ValueError, ArithmeticError):
+            # Leave it to fail at evaluation time with Calculator's error
+            pass
+    return ("call", method, operands)
+
+
+def _variables(node):
+    """Return the set of variable names used in a tree."""
+    if node[0] == "var":
+        return {node[1]}
+    if node[0] == "call":
+        return set().union(*(_variables(operand) for operand in node[2]))
+    return set()
+
+
+def _build(node, calc):
+    """Turn a tree into a closure taking a variable mapping, bound to calc's methods."""
+    kind = node[0]
+    if kind == "const":
+        value = node[1]
+        return lambda env: value
+    if kind == "var":
+        name = node[1]
+        return lambda env: env[name]
+
+    _, method_name, operands = node
+    method = getattr(calc, method_name)
+    if len(operands) == 1:
+        operand = _build(operands[0], calc)
+        return lambda env: method(operand(env))
+
+    left, right = operands
+    # Specialise constant operands so they are not re-fetched on every call
+    if right[0] == "const":
+        value, left = right[1], _build(left, calc)
+        return lambda env: method(left(env), value)
+    if left[0] == "const":
+        value, right = left[1], _build(right, calc)
+        return lambda env: method(value, right(env))
+    left, right = _build(left, calc), _build(right, calc)
+    return lambda env: method(left(env), right(env))
+
+
+class Expression:
+    """A parsed, constant-folded formula that can be evaluated many times."""
+
+    def __init__(self, source):
+        """Parse and fold source."""
+        self.source = source
+        self.tree = _fold(_parse(source), Calculator())
+        self.variables = frozenset(_variables(self.tree))
+        self._plan = _build(self.tree, Calculator())
+        self._array_plans = {}
+
+    def __repr__(self):
+        return f"Expression({self.source!r})"
+
+    def evaluate(self, variables=None, **kwargs):
+        """
+        Evaluate the formula for one set of variable values.
+
+        Values can be passed as a mapping, as keyword arguments, or both.
+        """
+        if kwargs:
+            variables = dict(variables or {}, **kwargs)
+        try:
+            return self._plan(variables or {})
+        except KeyError as e:
+            raise ExpressionError(f"Missing variable: {e.args[0]}") from None
+
+    __call__ = evaluate
+
+    def evaluate_many(self, rows):
+        """Evaluate the formula for each mapping in rows and return a list of results."""
+        plan = self._plan
+        try:
+            return [plan(row) for row in rows]
+        except KeyError as e:
+            raise ExpressionError(f"Missing variable: {e.args[0]}") from None
+
+    def evaluate_batch(self, columns, errors="raise"):
+        """
+        Evaluate the formula over columns of values.
+
+        columns maps each variable name to a sequence (or NumPy array) of
+        values; all columns are evaluated together using ArrayCalculator, so
+        the result is a NumPy array. errors is passed to ArrayCalculator:
+        "raise" reports every invalid row at once, "mask" returns a masked
+        array. Without NumPy, falls back to evaluating row by row and
+        returns a list (with None for invalid rows when errors="mask").
+        """
+        missing = self.variables.difference(columns)
+        if missing:
+            raise ExpressionError(f"Missing variable: {sorted(missing)[0]}")
+
+        try:
+            import numpy as np
+            from array_calculator import ArrayCalculator
+        except ImportError:
+            return self._evaluate_rows(columns, errors)
+
+        plan = self._array_plans.get(errors)
+        if plan is None:
+            plan = self._array_plans[errors] = _build(self.tree, ArrayCalculator(errors))
+        env = {name: np.asarray(columns[name]) for name in self.variables}
+        return plan(env)
+
+    def _evaluate_rows(self, columns, errors):
+        """Row-by-row fallback for evaluate_batch."""
+        names = sorted(self.variables)
+        rows = (dict(zip(names, values)) for values in zip(*(columns[name] for name in names)))
+        if errors != "mask":
+            return self.evaluate_many(rows)
+        results = []
+        for row in rows:
+            try:
+                results.append(self._plan(row))
+            except ValueError:
+                results.append(None)
+        return results
+
+
+@lru_cache(maxsize=256)
+def compile_expression(source):
+    """Return the compiled Expression for source, reusing cached plans."""
+    return Expression(source)
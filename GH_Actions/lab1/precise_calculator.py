@@ -0,0 +1,200 @@
+"""
+Calculator with selectable numeric backends.
+
+Calculator works with Python floats: power() uses ** (unbounded for big
+integer exponents) and square_root() uses ** 0.5 (loses precision for large
+integers). PreciseCalculator keeps the same methods and error messages but
+lets you choose how numbers are represented:
+
+    float     - same as Calculator
+    decimal   - decimal.Decimal, rounded to a configurable decimal.Context
+    fraction  - fractions.Fraction, exact rational arithmetic
+    integer   - exact int arithmetic with math.isqrt and modular pow()
+
+Exact backends can produce enormous numbers (2 ** 10**9 needs 125 MB), so
+power() estimates the size of the result first and raises
+ResultTooLargeError if it would exceed max_result_bits.
+"""
+
+import decimal
+import math
+import operator
+from fractions import Fraction
+
+from calculator import Calculator
+
+
+DEFAULT_MAX_RESULT_BITS = 1 << 20  # 1 Mbit, about 315,000 decimal digits
+
+
+class ResultTooLargeError(ValueError):
+    """Raised when a result would exceed the calculator's size budget."""
+
+
+class PreciseCalculator(Calculator):
+    """A calculator that computes with float, Decimal, Fraction or int values."""
+
+    BACKENDS = ("float", "decimal", "fraction", "integer")
+
+    def __init__(self, backend="float", context=None, max_result_bits=DEFAULT_MAX_RESULT_BITS):
+        """
+        Create a calculator.
+
+        backend: one of BACKENDS
+        context: decimal.Context for the decimal backend (and for inexact
+                 square roots with the fraction backend); defaults to a copy
+                 of the current context
+        max_result_bits: largest power() result allowed for exact backends
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}")
+        self.backend = backend
+        self.context = context if context is not None else decimal.getcontext().copy()
+        self.max_result_bits = max_result_bits
+
+    def convert(self, number):
+        """Convert a number to the backend's representation."""
+        if self.backend == "float":
+            return number
+        if self.backend == "decimal":
+            if isinstance(number, Fraction):
+                return self.context.divide(decimal.Decimal(number.numerator), number.denominator)
+            if isinstance(number, float):
+                # Use the shortest repr so 0.1 becomes Decimal("0.1")
+                number = repr(number)
+            return self.context.create_decimal(number)
+        if self.backend == "fraction":
+            return Fraction(number)
+        try:
+            return operator.index(number)
+        except TypeError:
+            raise ValueError("Integer backend requires integers") from None
+
+    def add(self, a, b):
+        """Add two numbers and return the result."""
+        a, b = self.convert(a), self.convert(b)
+        if self.backend == "decimal":
+            return self.context.add(a, b)
+        return a + b
+
+    def subtract(self, a, b):
+        """Subtract b from a and return the result."""
+        a, b = self.convert(a), self.convert(b)
+        if self.backend == "decimal":
+            return self.context.subtract(a, b)
+        return a - b
+
+    def multiply(self, a, b):
+        """Multiply two numbers and return the result."""
+        a, b = self.convert(a), self.convert(b)
+        if self.backend == "decimal":
+            return self.context.multiply(a, b)
+        return a * b
+
+    def divide(self, a, b):
+        """
+        Divide a by b and return the result.
+
+        The integer backend returns an int when the division is exact and a
+        Fraction otherwise.
+        """
+        a, b = self.convert(a), self.convert(b)
+        if b == 0:
+            raise ValueError("Cannot divide by zero")
+        if self.backend == "decimal":
+            return self.context.divide(a, b)
+        if self.backend == "integer":
+            quotient, remainder = divmod(a, b)
+            return quotient if remainder == 0 else Fraction(a, b)
+        return a / b
+
+    def power(self, base, exponent, modulus=None):
+        """
+        Raise base to the power of exponent.
+
+        With modulus, computes (base ** exponent) % modulus using the
+        three-argument pow(), which never builds the full power; base,
+        exponent and modulus must then be integers.
+        """
+        if modulus is not None:
+            try:
+                return pow(operator.index(base), operator.index(exponent), operator.index(modulus))
+            except TypeError:
+                raise ValueError("Modular power requires integers") from None
+
+        base, exponent = self.convert(base), self.convert(exponent)
+        if self.backend == "decimal":
+            # Decimal gives Infinity for 0 ** -n; match the other backends
+            if exponent < 0 and base == 0:
+                raise ValueError("Cannot divide by zero")
+            if exponent == 0 and base == 0:
+                return decimal.Decimal(1)  # Decimal leaves 0 ** 0 undefined
+            try:
+                return self.context.power(base, exponent)
+            except decimal.Overflow:
+                raise ResultTooLargeError(
+                    f"Result exceeds the decimal context (Emax={self.context.Emax})"
+                ) from None
+            except decimal.InvalidOperation:
+                # e.g. a negative base with a fractional exponent
+                raise ValueError("Result is not a real number") from None
+        if self.backend == "float":
+            if isinstance(base, int) and isinstance(exponent, int):
+                # int ** int is exact, so it can grow without bound here too
+                self._check_power_size(base, exponent)
+            return base ** exponent
+
+        self._check_power_size(base, exponent)
+        if exponent < 0 and base == 0:
+            raise ValueError("Cannot divide by zero")
+        if self.backend == "integer" and exponent < 0:
+            return Fraction(1, base ** -exponent)
+        return base ** exponent
+
+    def square_root(self, number):
+        """
+        Calculate the square root of a number.
+
+        The integer backend uses math.isqrt and raises ValueError if the
+        number is not a perfect square. The fraction backend returns an exact
+        Fraction for perfect squares and rounds through the decimal context
+        otherwise.
+        """
+        number = self.convert(number)
+        if number < 0:
+            raise ValueError("Cannot calculate square root of negative number")
+        if self.backend == "float":
+            return number ** 0.5
+        if self.backend == "decimal":
+            return self.context.sqrt(number)
+        if self.backend == "integer":
+            root = math.isqrt(number)
+            if root * root != number:
+                raise ValueError("Square root is not an integer")
+            return root
+
+        numerator_root = math.isqrt(number.numerator)
+        denominator_root = math.isqrt(number.denominator)
+        if (numerator_root * numerator_root == number.numerator
+                and denominator_root * denominator_root == number.denominator):
+            return Fraction(numerator_root, denominator_root)
+        root = self.context.sqrt(self.context.divide(
+            decimal.Decimal(number.numerator), number.denominator))
+        return Fraction(root)
+
+    def _check_power_size(self, base, exponent):
+        """Raise ResultTooLargeError if base ** exponent would exceed max_result_bits."""
+        if not isinstance(exponent, int) and getattr(exponent, "denominator", 1) != 1:
+            if self.backend == "integer":
+                raise ValueError("Integer backend requires integers")
+            return  # Fraction ** non-integer Fraction gives a float
+        base = Fraction(base)
+        if abs(base) in (0, 1):
+            return  # 0, 1 and -1 stay small whatever the exponent
+        bits = max(base.numerator.bit_length(), base.denominator.bit_length())
+        estimated = bits * abs(int(exponent))
+        if estimated > self.max_result_bits:
+            raise ResultTooLargeError(
+                f"Result would need about {estimated} bits "
+                f"(limit is {self.max_result_bits})"
+            )
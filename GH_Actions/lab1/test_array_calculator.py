@@ -0,0 +1,95 @@
+"""
+Unit tests for the ArrayCalculator class.
+"""
+
+import array
+import unittest
+
+try:
+    import numpy as np
+    from array_calculator import ArrayCalculator, ArrayValueError
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestArrayCalculator(unittest.TestCase):
+    """Test cases for the ArrayCalculator class."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.calc = ArrayCalculator()
+        self.masking_calc = ArrayCalculator(errors="mask")
+
+    def test_add_broadcasts(self):
+        """Test element-wise addition with broadcasting."""
+        np.testing.assert_array_equal(self.calc.add([1, 2, 3], 1), [2, 3, 4])
+        np.testing.assert_array_equal(
+            self.calc.add([[1], [2]], [10, 20]), [[11, 21], [12, 22]]
+        )
+
+    def test_buffer_protocol_inputs(self):
+        """Test that buffer-protocol objects are accepted."""
+        a = array.array("d", [1.0, 4.0, 9.0])
+        np.testing.assert_array_equal(self.calc.square_root(memoryview(a)), [1.0, 2.0, 3.0])
+        np.testing.assert_array_equal(self.calc.multiply(a, a), [1.0, 16.0, 81.0])
+
+    def test_subtract(self):
+        """Test element-wise subtraction."""
+        np.testing.assert_array_equal(self.calc.subtract([10, 0], [4, 5]), [6, -5])
+
+    def test_divide(self):
+        """Test element-wise division."""
+        np.testing.assert_allclose(self.calc.divide([20, 7], [4, 3]), [5, 2.333333], rtol=1e-5)
+
+    def test_divide_by_zero_reports_all_elements(self):
+        """Test that every zero divisor is reported at once."""
+        with self.assertRaises(ArrayValueError) as context:
+            self.calc.divide([1, 2, 3, 4], [1, 0, 2, 0])
+        self.assertEqual(str(context.exception), "Cannot divide by zero")
+        self.assertEqual(context.exception.count, 2)
+        self.assertEqual(context.exception.indices.ravel().tolist(), [1, 3])
+        self.assertIsInstance(context.exception, ValueError)
+
+    def test_divide_by_zero_masked(self):
+        """Test that zero divisors are masked in mask mode."""
+        result = self.masking_calc.divide([1, 2, 3], [1, 0, 2])
+        self.assertEqual(result.mask.tolist(), [False, True, False])
+        self.assertEqual(result.compressed().tolist(), [1.0, 1.5])
+
+    def test_power(self):
+        """Test element-wise power, including negative integer exponents."""
+        np.testing.assert_array_equal(self.calc.power([2, 5, 10], [3, 2, 0]), [8, 25, 1])
+        np.testing.assert_array_equal(self.calc.power(2, [-1, 1]), [0.5, 2.0])
+
+    def test_power_integer_overflow(self):
+        """Test that integer results too large for the dtype are reported or masked."""
+        with self.assertRaises(ArrayValueError) as context:
+            self.calc.power([10, 2, -10], [30, 62, 19])
+        self.assertEqual(context.exception.indices.tolist(), [[0], [2]])
+
+        result = self.masking_calc.power(np.array([2, 2], dtype=np.uint8),
+                                         np.array([7, 8], dtype=np.uint8))
+        self.assertEqual(result.mask.tolist(), [False, True])
+        self.assertEqual(result.compressed().tolist(), [128])
+
+    def test_square_root_negative(self):
+        """Test that negative numbers are reported or masked."""
+        with self.assertRaises(ArrayValueError) as context:
+            self.calc.square_root([4, -1, 9, -16])
+        self.assertEqual(str(context.exception),
+                         "Cannot calculate square root of negative number")
+        self.assertEqual(context.exception.count, 2)
+
+        result = self.masking_calc.square_root([4, -1, 9])
+        self.assertEqual(result.mask.tolist(), [False, True, False])
+        self.assertEqual(result.compressed().tolist(), [2.0, 3.0])
+
+    def test_invalid_error_mode(self):
+        """Test that an unknown error mode raises ValueError."""
+        with self.assertRaises(ValueError):
+            ArrayCalculator(errors="ignore")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for compiled Calculator expressions.
+"""
+
+import unittest
+from expression import Expression, ExpressionError, compile_expression
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+
+class TestExpression(unittest.TestCase):
+    """Test cases for the expression compiler."""
+
+    def test_evaluate(self):
+        """Test evaluating a formula with variables."""
+        expr = compile_expression("(price - cost) / price * 100")
+        self.assertEqual(expr.evaluate(price=20, cost=15), 25.0)
+        self.assertEqual(expr({"price": 10, "cost": 5}), 50.0)
+        self.assertEqual(expr.variables, {"price", "cost"})
+
+    def test_operator_precedence(self):
+        """Test that Python operator precedence is respected."""
+        self.assertEqual(Expression("2 + 3 * 4 ** 2").evaluate(), 50)
+        self.assertEqual(Expression("-x ** 2").evaluate(x=3), -9)
+        self.assertEqual(Expression("+x - -1").evaluate(x=3), 4)
+
+    def test_square_root(self):
+        """Test the sqrt function."""
+        self.assertEqual(Expression("sqrt(a * a + b * b)").evaluate(a=3, b=4), 5)
+
+    def test_constant_folding(self):
+        """Test that constant sub-expressions are folded at compile time."""
+        expr = Expression("x * (2 + 3) + sqrt(16)")
+        self.assertEqual(
+            expr.tree,
+            ("call", "add", (("call", "multiply", (("var", "x"), ("const", 5))), ("const", 4.0)))
+        )
+        self.assertEqual(expr.evaluate(x=2), 14.0)
+
+    def test_huge_powers_are_not_folded(self):
+        """Test that compiling does not compute huge constant powers."""
+        expr = Expression("9 ** 9 ** 7")
+        self.assertEqual(expr.tree, ("call", "power", (("const", 9), ("const", 9 ** 7))))
+        self.assertEqual(Expression("2 ** 100").tree, ("const", 2 ** 100))
+
+    def test_compile_cache(self):
+        """Test that compiling the same source reuses the plan."""
+        self.assertIs(compile_expression("a + b"), compile_expression("a + b"))
+
+    def test_divide_by_zero(self):
+        """Test that division by zero keeps Calculator's error."""
+        with self.assertRaises(ValueError) as context:
+            Expression("a / b").evaluate(a=1, b=0)
+        self.assertEqual(str(context.exception), "Cannot divide by zero")
+
+        # Constant division by zero is not folded away, it fails when evaluated
+        expr = Expression("1 / 0 + x")
+        with self.assertRaises(ValueError):
+            expr.evaluate(x=1)
+
+    def test_square_root_negative(self):
+        """Test that negative square roots keep Calculator's error."""
+        with self.assertRaises(ValueError) as context:
+            Expression("sqrt(x)").evaluate(x=-4)
+        self.assertEqual(str(context.exception), "Cannot calculate square root of negative number")
+
+    def test_invalid_expressions(self):
+        """Test that unsupported syntax raises ExpressionError."""
+        for source in ["1 +", "x % 2", "abs(x)", "x.real", "'a' + 'b'", "True + 1", "__import__('os')"]:
+            with self.assertRaises(ExpressionError, msg=source):
+                Expression(source)
+
+    def test_missing_variable(self):
+        """Test that a missing variable raises ExpressionError."""
+        with self.assertRaises(ExpressionError):
+            Expression("x + y").evaluate(x=1)
+
+    def test_evaluate_many(self):
+        """Test evaluating many bindings."""
+        expr = Expression("a * b")
+        self.assertEqual(expr.evaluate_many([{"a": 1, "b": 2}, {"a": 3, "b": 4}]), [2, 12])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_evaluate_batch(self):
+        """Test evaluating over column arrays."""
+        expr = Expression("(a - b) / a")
+        result = expr.evaluate_batch({"a": [2, 4, 5], "b": [1, 1, 5]})
+        np.testing.assert_allclose(result, [0.5, 0.75, 0.0])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_evaluate_batch_errors(self):
+        """Test that batch evaluation reports or masks invalid rows."""
+        expr = Expression("a / b")
+        with self.assertRaises(ValueError):
+            expr.evaluate_batch({"a": [1, 2], "b": [1, 0]})
+
+        result = expr.evaluate_batch({"a": [1, 2], "b": [1, 0]}, errors="mask")
+        self.assertEqual(result.mask.tolist(), [False, True])
+
+    def test_evaluate_batch_row_fallback(self):
+        """Test the row-by-row fallback used without NumPy."""
+        expr = Expression("a / b")
+        columns = {"a": [1, 2], "b": [2, 0]}
+        self.assertEqual(expr._evaluate_rows(columns, "mask"), [0.5, None])
+        with self.assertRaises(ValueError):
+            expr._evaluate_rows(columns, "raise")
+
+
+if __name__ == "__main__":
+    unittest.main()
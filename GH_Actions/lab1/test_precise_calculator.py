@@ -0,0 +1,111 @@
+"""
+Unit tests for the PreciseCalculator class.
+"""
+
+import decimal
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+from precise_calculator import PreciseCalculator, ResultTooLargeError
+
+
+class TestPreciseCalculator(unittest.TestCase):
+    """Test cases for the PreciseCalculator class."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.float_calc = PreciseCalculator()
+        self.decimal_calc = PreciseCalculator("decimal", decimal.Context(prec=50))
+        self.fraction_calc = PreciseCalculator("fraction")
+        self.integer_calc = PreciseCalculator("integer", max_result_bits=10_000)
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend raises ValueError."""
+        with self.assertRaises(ValueError):
+            PreciseCalculator("complex")
+
+    def test_float_backend_matches_calculator(self):
+        """Test that the float backend behaves like Calculator."""
+        self.assertEqual(self.float_calc.add(5, 3), 8)
+        self.assertEqual(self.float_calc.divide(20, 4), 5)
+        self.assertEqual(self.float_calc.power(2, -1), 0.5)
+        self.assertEqual(self.float_calc.square_root(16), 4)
+
+    def test_decimal_backend(self):
+        """Test decimal arithmetic with a configurable context."""
+        self.assertEqual(self.decimal_calc.add(0.1, 0.2), Decimal("0.3"))
+        self.assertEqual(self.decimal_calc.divide(1, 3), Decimal("0." + "3" * 50))
+        self.assertEqual(str(self.decimal_calc.square_root(2))[:22], "1.41421356237309504880")
+        self.assertEqual(self.decimal_calc.power("1.5", 2), Decimal("2.25"))
+
+    def test_fraction_backend(self):
+        """Test exact rational arithmetic."""
+        self.assertEqual(self.fraction_calc.divide(1, 3), Fraction(1, 3))
+        self.assertEqual(self.fraction_calc.add(Fraction(1, 3), Fraction(1, 6)), Fraction(1, 2))
+        self.assertEqual(self.fraction_calc.power(Fraction(2, 3), -2), Fraction(9, 4))
+        self.assertEqual(self.fraction_calc.square_root(Fraction(9, 16)), Fraction(3, 4))
+        self.assertAlmostEqual(float(self.fraction_calc.square_root(2)), 1.414213, places=5)
+
+    def test_integer_backend(self):
+        """Test exact integer arithmetic."""
+        big = 10 ** 40 + 1
+        self.assertEqual(self.integer_calc.square_root(big * big), big)
+        self.assertEqual(self.integer_calc.divide(10, 2), 5)
+        self.assertEqual(self.integer_calc.divide(7, 2), Fraction(7, 2))
+        self.assertEqual(self.integer_calc.power(2, -2), Fraction(1, 4))
+        with self.assertRaises(ValueError):
+            self.integer_calc.square_root(2)
+        with self.assertRaises(ValueError):
+            self.integer_calc.add(1.5, 1)
+
+    def test_modular_power(self):
+        """Test modular power with huge exponents."""
+        self.assertEqual(self.integer_calc.power(3, 10 ** 100, 1_000_007),
+                         pow(3, 10 ** 100, 1_000_007))
+        self.assertEqual(self.float_calc.power(2, 10, 1000), 24)
+        with self.assertRaises(ValueError):
+            self.float_calc.power(2.5, 2, 7)
+
+    def test_power_size_budget(self):
+        """Test that oversized exact powers are rejected before computing."""
+        with self.assertRaises(ResultTooLargeError):
+            self.integer_calc.power(2, 10 ** 9)
+        with self.assertRaises(ResultTooLargeError):
+            self.fraction_calc.power(Fraction(1, 3), -(10 ** 7))
+        self.assertEqual(self.integer_calc.power(2, 1000), 2 ** 1000)
+        self.assertEqual(self.integer_calc.power(1, 10 ** 9), 1)
+
+    def test_power_size_budget_float_and_decimal(self):
+        """Test that the default backend checks int powers and decimal overflow is a ValueError."""
+        with self.assertRaises(ResultTooLargeError):
+            self.float_calc.power(7, 10 ** 6)
+        self.assertEqual(self.float_calc.power(7, 3), 343)
+        self.assertEqual(self.float_calc.power(2.0, 10), 1024.0)
+        with self.assertRaises(ResultTooLargeError):
+            self.decimal_calc.power(10, 10 ** 9)
+        with self.assertRaises(ValueError):
+            self.decimal_calc.power(0, -1)
+        with self.assertRaises(ValueError):
+            self.decimal_calc.power(-8, 0.5)
+        self.assertEqual(self.decimal_calc.power(0, 0), 1)
+
+    def test_divide_by_zero(self):
+        """Test that every backend rejects division by zero."""
+        for calc in (self.float_calc, self.decimal_calc, self.fraction_calc, self.integer_calc):
+            with self.assertRaises(ValueError) as context:
+                calc.divide(10, 0)
+            self.assertEqual(str(context.exception), "Cannot divide by zero")
+        with self.assertRaises(ValueError):
+            self.integer_calc.power(0, -1)
+
+    def test_square_root_negative(self):
+        """Test that every backend rejects negative square roots."""
+        for calc in (self.float_calc, self.decimal_calc, self.fraction_calc, self.integer_calc):
+            with self.assertRaises(ValueError) as context:
+                calc.square_root(-4)
+            self.assertEqual(str(context.exception),
+                             "Cannot calculate square root of negative number")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: string_utils on bytes and memoryview inputs
+
+Compares decoding each buffer to str and calling the function on it (what
+callers holding receive buffers had to do) against passing the buffer
+directly. Timings are per call on one buffer of the given size; "peak" is
+the largest temporary allocation made during the call, from tracemalloc.
+
+Usage:
+    python bench_string_utils.py [size_in_kb]
+"""
+
+import random
+import sys
+import timeit
+import tracemalloc
+
+from string_utils import count_vowels, count_words, is_palindrome, split_words
+
+FUNCTIONS = [count_vowels, count_words, split_words, is_palindrome]
+
+
+def make_text(size, alphabet):
+    """Return about size bytes of space-separated words drawn from alphabet."""
+    rng = random.Random(1)
+    words = ["".join(rng.choices(alphabet, k=rng.randint(1, 10))) for _ in range(2000)]
+    parts, length = [], 0
+    while length < size:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word.encode("utf-8")) + 1
+    return " ".join(parts)
+
+
+def peak_bytes(func):
+    """Return the peak memory allocated while func runs."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def seconds(func):
+    """Return the best time of one call to func."""
+    number = 5
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    """Print a comparison table"""
+    size = (int(sys.argv[1]) if len(sys.argv) > 1 else 1024) * 1024
+    inputs = [
+        ("ascii", make_text(size, "abcdefghijklmnopqrstuvwxyzAEIOU")),
+        ("utf-8", make_text(size, "abcdefghijklmnopqrstuvwxyzéüñ")),
+    ]
+
+    print(f"{size // 1024:,} KB per buffer (ms per call, peak temporary memory in KB)\n")
+    print(f"{'function':<16}{'input':<20}{'decode+call':>12}{'peak':>10}"
+          f"{'direct':>10}{'peak':>10}{'speedup':>10}")
+    print("-" * 88)
+    for func in FUNCTIONS:
+        for text_name, text in inputs:
+            data = text.encode("utf-8")
+            # A slice of a larger receive buffer, as the ingest layer holds it
+            view = memoryview(b"\0" * 16 + data)[16:]
+            for kind, buffer in [("bytes", data), ("memoryview", view)]:
+                def decoded():
+                    return func(str(buffer, "utf-8"))
+
+                def direct():
+                    return func(buffer)
+
+                before, after = seconds(decoded), seconds(direct)
+                print(f"{func.__name__:<16}{text_name + ' ' + kind:<20}"
+                      f"{before * 1000:>12.2f}{peak_bytes(decoded) / 1024:>10.0f}"
+                      f"{after * 1000:>10.2f}{peak_bytes(direct) / 1024:>10.0f}"
+                      f"{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Archival of Completed Todos
+Moves completed todos to compressed cold storage after a retention period
+"""
+
+import heapq
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from business_logic import TodoManager
+from clock import MICROSECONDS, parse_timestamp
+
+# Each archive frame is a 4-byte little-endian length followed by that many
+# bytes of zlib-compressed JSON (a list of todos)
+FRAME_HEADER = struct.Struct("<I")
+
+
+class ArchiveStore:
+    """
+    Append-only compressed file of archived todos
+
+    Todos are written in batches, one compressed frame per batch. An
+    in-memory index maps each todo ID to the offset of its frame, so a single
+    todo is retrieved by reading and decompressing one frame.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) an archive file and index its contents
+
+        Args:
+            path: Location of the archive file
+        """
+        self.path = path
+        self._index = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self._load_index()
+
+    def _load_index(self) -> None:
+        """Rebuild the ID -> frame offset index by reading every frame"""
+        with open(self.path, "rb") as f:
+            offset = 0
+            while True:
+                header = f.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    break
+                (length,) = FRAME_HEADER.unpack(header)
+                blob = f.read(length)
+                if len(blob) < length:
+                    break  # Truncated final frame from an interrupted write
+                for todo in json.loads(zlib.decompress(blob)):
+                    self._index[todo["id"]] = offset
+                offset += FRAME_HEADER.size + length
+
+    def append(self, todos: List[Dict]) -> None:
+        """
+        Write a batch of todos as one compressed frame
+
+        Args:
+            todos: Todo dictionaries to archive
+        """
+        if not todos:
+            return
+        blob = zlib.compress(json.dumps(todos).encode())
+        with self._lock:
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(FRAME_HEADER.pack(len(blob)) + blob)
+                f.flush()
+                os.fsync(f.fileno())
+            for todo in todos:
+                self._index[todo["id"]] = offset
+
+    def get(self, todo_id: int) -> Optional[Dict]:
+        """
+        Retrieve an archived todo
+
+        Args:
+            todo_id: The ID of the todo
+
+        Returns:
+            Todo dictionary if archived, None otherwise
+        """
+        offset = self._index.get(todo_id)
+        if offset is None:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            (length,) = FRAME_HEADER.unpack(f.read(FRAME_HEADER.size))
+            todos = json.loads(zlib.decompress(f.read(length)))
+        for todo in todos:
+            if todo["id"] == todo_id:
+                return todo
+        return None
+
+    def __contains__(self, todo_id: int) -> bool:
+        return todo_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class ArchivalEngine:
+    """
+    Archives completed todos a fixed time after their last update
+
+    Expiry times are kept in a min-heap, fed by TodoManager change events,
+    so the engine only ever looks at todos that are due instead of scanning
+    the whole store. Each todo has at most one heap entry: updates only
+    record the latest deadline, and an entry that comes due early is pushed
+    back to it. Todos are checked again under the manager's lock right
+    before they are archived and deleted, so a concurrent edit or reopen
+    is never lost.
+    """
+
+    def __init__(self, manager: TodoManager, store: ArchiveStore, archive_after: float,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the engine
+
+        Args:
+            manager: The TodoManager to archive from
+            store: Where archived todos are written
+            archive_after: Seconds after updated_at a completed todo is archived
+            clock: Time source (epoch seconds), injectable for tests
+        """
+        self.manager = manager
+        self.store = store
+        self.archive_after = archive_after
+        self.clock = clock
+        self.archived = 0
+        # Min-heap of (due, todo ID), one live entry per todo
+        self._heap = []
+        # Todo ID -> due time of its heap entry
+        self._heap_due = {}
+        # Todo ID -> (latest due time, updated_at it was computed from)
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+        manager.add_listener(self._on_change)
+        for todo in list(manager.todos.values()):
+            self._schedule(todo)
+
+    def _schedule(self, todo: Dict) -> None:
+        """Record the archive deadline of a completed todo"""
+        if not todo["completed"]:
+            with self._condition:
+                self._pending.pop(todo["id"], None)
+            return
+        due = parse_timestamp(todo["updated_at"]) / MICROSECONDS + self.archive_after
+        todo_id = todo["id"]
+        with self._condition:
+            self._pending[todo_id] = (due, todo["updated_at"])
+            heap_due = self._heap_due.get(todo_id)
+            if heap_due is not None and heap_due <= due:
+                return  # The existing entry is pushed back when it comes due
+            self._heap_due[todo_id] = due
+            heapq.heappush(self._heap, (due, todo_id))
+            if self._heap[0][1] == todo_id:
+                # New earliest deadline: wake the worker to recompute its sleep
+                self._condition.notify()
+
+    def _on_change(self, event: str, todo: Dict) -> None:
+        """TodoManager listener"""
+        if event == "deleted":
+            with self._condition:
+                self._pending.pop(todo["id"], None)
+        else:
+            self._schedule(todo)
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """
+        Archive every todo that is due
+
+        Args:
+            now: Current epoch time (defaults to the clock)
+
+        Returns:
+            Number of todos archived
+        """
+        now = self.clock() if now is None else now
+        candidates = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                due, todo_id = heapq.heappop(self._heap)
+                if self._heap_due.get(todo_id) != due:
+                    continue  # Superseded by an earlier entry
+                del self._heap_due[todo_id]
+                pending = self._pending.get(todo_id)
+                if pending is None:
+                    continue
+                if pending[0] > now:
+                    # Updated since this entry was pushed: wait for the new deadline
+                    self._heap_due[todo_id] = pending[0]
+                    heapq.heappush(self._heap, (pending[0], todo_id))
+                    continue
+                del self._pending[todo_id]
+                candidates.append((todo_id, pending[1]))
+
+        if not candidates:
+            return 0
+        # Request threads write under the same lock, so nothing can change a
+        # todo between the check and its deletion
+        with self.manager.lock:
+            due = []
+            for todo_id, updated_at in candidates:
+                todo = self.manager.todos.get(todo_id)
+                if todo is not None and todo["completed"] and todo["updated_at"] == updated_at:
+                    due.append(todo)
+            if not due:
+                return 0
+            # Write to cold storage first, so nothing is lost if removal fails
+            self.store.append(due)
+            for todo in due:
+                self.manager.delete_todo(todo["id"])
+        self.archived += len(due)
+        return len(due)
+
+    def next_due(self) -> Optional[float]:
+        """Return the epoch time of the earliest scheduled archive, if any"""
+        with self._condition:
+            return self._heap[0][0] if self._heap else None
+
+    def start(self) -> None:
+        """Run the engine in a background daemon thread"""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="todo-archival", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Sleep until the next deadline, archive, repeat"""
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                timeout = None
+                if self._heap:
+                    timeout = max(0.0, self._heap[0][0] - self.clock())
+                if timeout is None or timeout > 0:
+                    self._condition.wait(timeout)
+                    continue
+            self.run_pending()
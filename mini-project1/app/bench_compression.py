@@ -0,0 +1,48 @@
+"""
+Benchmark: CPU time versus bytes saved for each compression setting
+
+Builds a GET /api/todos style listing and compresses it with every
+available encoding and a range of levels.
+
+Usage:
+    python bench_compression.py [number_of_todos]
+"""
+
+import json
+import sys
+import timeit
+
+from business_logic import TodoManager
+from compression import ENCODERS, compress
+
+
+def build_listing(count):
+    """Return the JSON body of a listing with count todos"""
+    manager = TodoManager()
+    for i in range(count):
+        manager.create_todo(f"Todo number {i}", f"Description for todo {i} with some detail")
+    todos = manager.get_all_todos()
+    return json.dumps({"success": True, "count": len(todos), "data": todos}).encode()
+
+
+def main():
+    """Print size and timing per encoding and level"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    body = build_listing(count)
+
+    print(f"Listing of {count:,} todos: {len(body):,} bytes uncompressed")
+    print("-" * 64)
+    print(f"{'encoding':<10}{'level':>6}{'bytes':>12}{'ratio':>8}{'compress':>12}{'MB/s':>10}")
+    for encoding, (_, default_level, max_level) in ENCODERS.items():
+        levels = sorted({1, default_level, max_level})
+        for level in levels:
+            compressed = compress(body, encoding, level)
+            seconds = min(timeit.repeat(lambda: compress(body, encoding, level),
+                                        number=3, repeat=3)) / 3
+            print(f"{encoding:<10}{level:>6}{len(compressed):>12,}"
+                  f"{len(body) / len(compressed):>7.1f}x{seconds * 1000:>10.2f}ms"
+                  f"{len(body) / seconds / 1e6:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
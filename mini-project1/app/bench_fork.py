@@ -0,0 +1,132 @@
+"""
+Benchmark: per-worker memory and cold start with and without preloading
+
+Simulates a pre-forking server on a snapshot of N todos, in three modes:
+
+    no-preload      every worker imports the app and loads the snapshot itself
+    preload         the master builds the app once and forks workers
+    preload+freeze  as preload, with gc disabled during loading, then
+                    gc.freeze() and gc re-enabled in the master before
+                    forking (what gunicorn.conf.py does)
+
+Each worker runs a full garbage collection (as a busy worker eventually
+would), serves a request and reports its cold start (fork to first
+response) and memory from /proc/self/smaps_rollup. USS is the memory that
+is private to the worker, i.e. what each additional worker really costs.
+
+Usage:
+    python bench_fork.py [number_of_todos] [workers]
+
+Linux only.
+"""
+
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ["no-preload", "preload", "preload+freeze"]
+
+
+def memory_kb():
+    """Return RSS, PSS and USS (private) of this process in kB"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": values.get("Rss", 0),
+        "pss": values.get("Pss", 0),
+        "uss": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+    }
+
+
+def worker(app, forked_at, write_fd):
+    """Body of a forked worker: become ready, serve, report and exit"""
+    if app is None:
+        from main import create_app
+        app = create_app(start_background=False)
+    gc.enable()
+    gc.collect()
+    response = app.test_client().get('/api/todos/1')
+    cold_start = time.perf_counter() - forked_at
+    report = {"status": response.status_code, "cold_start_ms": cold_start * 1000}
+    report.update(memory_kb())
+    os.write(write_fd, (json.dumps(report) + "\n").encode())
+    os._exit(0)
+
+
+def run_mode(mode, workers):
+    """Run one mode in this process and print one JSON line per worker"""
+    app = None
+    if mode != "no-preload":
+        if mode == "preload+freeze":
+            gc.disable()
+        from main import create_app
+        app = create_app(start_background=False)
+        if mode == "preload+freeze":
+            gc.freeze()
+            gc.enable()
+
+    read_fd, write_fd = os.pipe()
+    pids = []
+    for _ in range(workers):
+        forked_at = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            worker(app, forked_at, write_fd)
+        pids.append(pid)
+    os.close(write_fd)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    with os.fdopen(read_fd) as f:
+        sys.stdout.write(f.read())
+
+
+def main():
+    """Print a comparison table"""
+    if len(sys.argv) > 1 and sys.argv[1] == "--mode":
+        run_mode(sys.argv[2], int(sys.argv[3]))
+        return
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("bench_fork.py needs Linux (/proc/self/smaps_rollup)")
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    from snapshot import write_snapshot
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, "todos.snap")
+        now = "2025-01-01T00:00:00"
+        write_snapshot(snapshot_path, (
+            {"id": i, "title": f"Todo {i}", "description": f"Description for todo {i}",
+             "completed": i % 3 == 0, "created_at": now, "updated_at": now}
+            for i in range(1, count + 1)
+        ), count + 1)
+        env = dict(os.environ, TODO_SNAPSHOT=snapshot_path,
+                   TODO_ARCHIVE_PATH=os.path.join(tmp, "archive.bin"))
+
+        print(f"{count:,} todos, {workers} workers (per-worker averages, MB)\n")
+        print(f"{'mode':<16}{'cold start':>12}{'RSS':>10}{'PSS':>10}{'USS':>10}")
+        print("-" * 58)
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, str(workers)],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout
+            reports = [json.loads(line) for line in output.splitlines() if line]
+            average = {key: sum(r[key] for r in reports) / len(reports)
+                       for key in ("cold_start_ms", "rss", "pss", "uss")}
+            print(f"{mode:<16}{average['cold_start_ms']:>10.0f}ms"
+                  f"{average['rss'] / 1024:>10.1f}{average['pss'] / 1024:>10.1f}"
+                  f"{average['uss'] / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark: timestamping todos
+
+Compares formatting with datetime.utcnow().isoformat() against the clock's
+cached per-second prefix, and times bulk creation one by one and in a batch.
+
+Usage:
+    python bench_timestamps.py [number_of_todos]
+"""
+
+import sys
+import timeit
+from datetime import datetime
+
+from business_logic import TodoManager
+from clock import SystemClock
+
+
+def main():
+    """Print timings"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    clock = SystemClock()
+    number = 100000
+
+    rows = [
+        ("datetime.utcnow().isoformat()", lambda: datetime.utcnow().isoformat()),
+        ("SystemClock.timestamp()", clock.timestamp),
+    ]
+    for name, func in rows:
+        seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+        print(f"{name:<32}{seconds * 1e9:>10.0f} ns per call")
+
+    items = [{"title": f"Todo {i}", "description": f"Description {i}"} for i in range(count)]
+
+    def one_by_one():
+        manager = TodoManager()
+        for item in items:
+            manager.create_todo(item["title"], item["description"])
+
+    def batch():
+        TodoManager().create_todos(items)
+
+    print()
+    for name, func in [("create_todo x N", one_by_one), ("create_todos", batch)]:
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        print(f"{name:<32}{seconds:>10.3f} s for {count:,} todos")
+
+
+if __name__ == "__main__":
+    main()
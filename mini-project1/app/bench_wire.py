@@ -0,0 +1,58 @@
+"""
+Benchmark: JSON versus MessagePack for Todo API payloads
+
+Compares encode time, decode time and bytes on the wire for a single todo
+response and for a large listing.
+
+Usage:
+    python bench_wire.py [number_of_todos]
+"""
+
+import sys
+import timeit
+
+from business_logic import TodoManager
+from wire import JSON_MIMETYPE, MSGPACK_MIMETYPE, decode, encode, msgpack
+
+
+def build_payloads(count):
+    """Return (single todo response, listing response) payloads"""
+    manager = TodoManager()
+    for i in range(count):
+        manager.create_todo(f"Todo number {i}", f"Description for todo {i}")
+    todos = manager.get_all_todos()
+    single = {"success": True, "data": todos[0]}
+    listing = {"success": True, "count": len(todos), "data": todos}
+    return single, listing
+
+
+def measure(payload, mimetype, number):
+    """Return (bytes, encode seconds, decode seconds) per call"""
+    body = encode(payload, mimetype)
+    encode_time = min(timeit.repeat(lambda: encode(payload, mimetype),
+                                    number=number, repeat=3)) / number
+    decode_time = min(timeit.repeat(lambda: decode(body, mimetype),
+                                    number=number, repeat=3)) / number
+    return len(body), encode_time, decode_time
+
+
+def main():
+    """Print a comparison table"""
+    if msgpack is None:
+        print("msgpack is not installed: pip install msgpack")
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    single, listing = build_payloads(count)
+
+    print(f"{'payload':<18}{'format':<10}{'bytes':>12}{'encode':>12}{'decode':>12}")
+    print("-" * 64)
+    for name, payload, number in [("single todo", single, 20000),
+                                  (f"{count:,} todos", listing, 5)]:
+        for label, mimetype in [("json", JSON_MIMETYPE), ("msgpack", MSGPACK_MIMETYPE)]:
+            size, encode_time, decode_time = measure(payload, mimetype, number)
+            print(f"{name:<18}{label:<10}{size:>12,}"
+                  f"{encode_time * 1e6:>10.1f}us{decode_time * 1e6:>10.1f}us")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,18 +3,106 @@ Business Logic for Todo Application
 Handles all todo-related operations and data management
 """
 
-from datetime import datetime
-from typing import Optional, List, Dict
+import sys
+import threading
+from functools import wraps
+from typing import Callable, Optional, List, Dict, Iterable, Sequence
+
+from clock import SystemClock
+from snapshot import read_snapshot, write_snapshot
+
+# Fields of a todo, in the order they are created
+TODO_FIELDS = ("id", "title", "description", "completed", "created_at", "updated_at")
+
+# Approximate bytes held per todo besides its strings: the todo dict, its ID,
+# and the entries in the manager's dictionaries
+TODO_OVERHEAD = sys.getsizeof(dict.fromkeys(TODO_FIELDS)) + 200
+
+
+def estimate_todo_size(title: str, description: str, timestamp: str) -> int:
+    """
+    Estimate the memory held by one todo
+    
+    Args:
+        title: The title
+        description: The description
+        timestamp: A formatted timestamp (stored twice)
+        
+    Returns:
+        Approximate size in bytes
+    """
+    return (TODO_OVERHEAD + sys.getsizeof(title) + sys.getsizeof(description)
+            + 2 * sys.getsizeof(timestamp))
+
+
+def _locked(method: Callable) -> Callable:
+    """Run a TodoManager method while holding the manager's lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class MemoryLimitError(Exception):
+    """Raised when a write would take the TodoManager past a memory limit"""
+    
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        # HTTP status for the API: 413 (payload too large) or 507 (out of storage)
+        self.status = status
 
 
 class TodoManager:
     """Manages todo items with CRUD operations"""
     
-    def __init__(self):
-        """Initialize the TodoManager with empty storage"""
+    def __init__(self, clock: Optional[SystemClock] = None,
+                 soft_limit_bytes: Optional[int] = None,
+                 hard_limit_bytes: Optional[int] = None,
+                 large_todo_bytes: int = 64 * 1024):
+        """
+        Initialize the TodoManager with empty storage
+        
+        Args:
+            clock: Time source for timestamps (optional, injectable for tests)
+            soft_limit_bytes: Past this, todos larger than large_todo_bytes
+                are refused (optional)
+            hard_limit_bytes: Writes that would pass this are refused (optional)
+            large_todo_bytes: Size of a todo counted as large
+        """
         self.todos = {}
+        self.soft_limit_bytes = soft_limit_bytes
+        self.hard_limit_bytes = hard_limit_bytes
+        self.large_todo_bytes = large_todo_bytes
+        # Approximate memory held, kept up to date on every change
+        self.memory_bytes = 0
+        self._sizes = {}
         self.next_id = 1
+        self.clock = clock if clock is not None else SystemClock()
+        # Incremented on every change, so callers can cache derived data
+        self.version = 0
+        # Kept up to date on every change, so counting never scans
+        self.completed_count = 0
+        self._listeners = []
+        # Held by every write; hold it to check a todo and act on it atomically
+        self.lock = threading.RLock()
+    
+    def add_listener(self, callback: Callable[[str, Dict], None]) -> None:
+        """
+        Register a function called after every change
+        
+        Args:
+            callback: Called as callback(event, todo) where event is
+                "created", "updated" or "deleted"
+        """
+        self._listeners.append(callback)
+    
+    def _notify(self, event: str, todo: Dict) -> None:
+        """Call every registered listener"""
+        for callback in self._listeners:
+            callback(event, todo)
     
+    @_locked
     def create_todo(self, title: str, description: str = "") -> Dict:
         """
         Create a new todo item
@@ -29,17 +117,79 @@ class TodoManager:
         if not title or not title.strip():
             raise ValueError("Title cannot be empty")
         
+        title, description = title.strip(), description.strip()
+        timestamp = self.clock.timestamp()
+        size = estimate_todo_size(title, description, timestamp[1])
+        self._reserve(size, size)
+        return self._insert(title, description, timestamp[1], size)
+    
+    @_locked
+    def create_todos(self, items: Iterable[Dict]) -> List[Dict]:
+        """
+        Create several todos at once, all with the same timestamp
+        
+        Args:
+            items: Dictionaries with a "title" and an optional "description"
+            
+        Returns:
+            List of the created todos
+        """
+        cleaned = []
+        for item in items:
+            title = item.get("title")
+            if not isinstance(title, str) or not title.strip():
+                raise ValueError("Title cannot be empty")
+            cleaned.append((title.strip(), item.get("description", "").strip()))
+        
+        # Validate everything before creating anything
+        timestamp = self.clock.timestamp()
+        sizes = [estimate_todo_size(title, description, timestamp[1])
+                 for title, description in cleaned]
+        self._reserve(sum(sizes), max(sizes, default=0))
+        return [self._insert(title, description, timestamp[1], size)
+                for (title, description), size in zip(cleaned, sizes)]
+    
+    def _reserve(self, added: int, largest: int) -> None:
+        """
+        Check that adding memory is within the limits
+        
+        Args:
+            added: Bytes the write adds (negative if it frees memory)
+            largest: Size of the largest todo written
+            
+        Raises:
+            MemoryLimitError: 507 past the hard limit, 413 for a large todo
+                past the soft limit
+        """
+        if added <= 0:
+            return
+        after = self.memory_bytes + added
+        if self.hard_limit_bytes is not None and after > self.hard_limit_bytes:
+            raise MemoryLimitError("Todo storage is full", 507)
+        if (self.soft_limit_bytes is not None and after > self.soft_limit_bytes
+                and largest > self.large_todo_bytes):
+            raise MemoryLimitError(
+                f"Todo storage is nearly full; todos over {self.large_todo_bytes} "
+                f"bytes are not accepted", 413
+            )
+    
+    def _insert(self, title: str, description: str, formatted: str, size: int) -> Dict:
+        """Store a new todo created at the formatted timestamp"""
         todo = {
             "id": self.next_id,
-            "title": title.strip(),
-            "description": description.strip(),
+            "title": title,
+            "description": description,
             "completed": False,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
+            "created_at": formatted,
+            "updated_at": formatted
         }
         
         self.todos[self.next_id] = todo
+        self._sizes[self.next_id] = size
+        self.memory_bytes += size
         self.next_id += 1
+        self.version += 1
+        self._notify("created", todo)
         
         return todo
     
@@ -55,15 +205,56 @@ class TodoManager:
         """
         return self.todos.get(todo_id)
     
-    def get_all_todos(self) -> List[Dict]:
+    def get_all_todos(self, fields: Optional[Iterable[str]] = None) -> List[Dict]:
         """
         Get all todos
         
+        Args:
+            fields: Only include these fields in each todo (optional)
+            
         Returns:
             List of all todo dictionaries
         """
-        return list(self.todos.values())
+        if fields is None:
+            return list(self.todos.values())
+        fields = self.validate_fields(fields)
+        todos = list(self.todos.values())
+        return [{field: todo[field] for field in fields} for todo in todos]
     
+    def get_todo_columns(self, fields: Optional[Iterable[str]] = None) -> Dict[str, List]:
+        """
+        Get all todos as one list of values per field
+        
+        Args:
+            fields: Fields to include (optional, defaults to all)
+            
+        Returns:
+            Dictionary mapping each field to the list of its values
+        """
+        fields = TODO_FIELDS if fields is None else self.validate_fields(fields)
+        todos = list(self.todos.values())
+        return {field: [todo[field] for todo in todos] for field in fields}
+    
+    @staticmethod
+    def validate_fields(fields: Iterable[str]) -> Sequence[str]:
+        """
+        Check a list of field names
+        
+        Args:
+            fields: Field names to check
+            
+        Returns:
+            The field names, without duplicates, in the order given
+        """
+        fields = list(dict.fromkeys(fields))
+        unknown = [field for field in fields if field not in TODO_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+        if not fields:
+            raise ValueError("At least one field is required")
+        return fields
+    
+    @_locked
     def update_todo(self, todo_id: int, title: Optional[str] = None, 
                    description: Optional[str] = None, 
                    completed: Optional[bool] = None) -> Optional[Dict]:
@@ -87,20 +278,41 @@ class TodoManager:
         if title is not None:
             if not title.strip():
                 raise ValueError("Title cannot be empty")
-            todo["title"] = title.strip()
+            title = title.strip()
+        
+        if completed is not None and not isinstance(completed, bool):
+            raise ValueError("Completed must be a boolean")
+        
+        # Check the new size before changing anything
+        _, updated_at = self.clock.timestamp()
+        description = description.strip() if description is not None else None
+        size = estimate_todo_size(title if title is not None else todo["title"],
+                                  description if description is not None
+                                  else todo["description"],
+                                  updated_at)
+        old_size = self._sizes.get(todo_id, size)
+        self._reserve(size - old_size, size)
+        
+        if title is not None:
+            todo["title"] = title
         
         if description is not None:
-            todo["description"] = description.strip()
+            todo["description"] = description
         
         if completed is not None:
-            if not isinstance(completed, bool):
-                raise ValueError("Completed must be a boolean")
+            if completed != todo["completed"]:
+                self.completed_count += 1 if completed else -1
             todo["completed"] = completed
         
-        todo["updated_at"] = datetime.utcnow().isoformat()
+        todo["updated_at"] = updated_at
+        self._sizes[todo_id] = size
+        self.memory_bytes += size - old_size
+        self.version += 1
+        self._notify("updated", todo)
         
         return todo
     
+    @_locked
     def delete_todo(self, todo_id: int) -> bool:
         """
         Delete a todo
@@ -112,7 +324,12 @@ class TodoManager:
             True if deleted, False if not found
         """
         if todo_id in self.todos:
-            del self.todos[todo_id]
+            todo = self.todos.pop(todo_id)
+            self.memory_bytes -= self._sizes.pop(todo_id, 0)
+            if todo["completed"]:
+                self.completed_count -= 1
+            self.version += 1
+            self._notify("deleted", todo)
             return True
         return False
     
@@ -134,6 +351,63 @@ class TodoManager:
         """
         return [todo for todo in self.todos.values() if not todo["completed"]]
     
+    def export_snapshot(self, path: str) -> int:
+        """
+        Save all todos to a binary snapshot file
+        
+        Args:
+            path: Destination file (replaced atomically)
+            
+        Returns:
+            Number of todos saved
+        """
+        return write_snapshot(path, list(self.todos.values()), self.next_id)
+    
+    @_locked
+    def import_snapshot(self, path: str) -> int:
+        """
+        Replace all todos with the contents of a snapshot file
+        
+        Args:
+            path: Snapshot file written by export_snapshot
+            
+        Returns:
+            Number of todos loaded
+        """
+        todos, next_id = read_snapshot(path)
+        self.todos = todos
+        self.completed_count = sum(1 for todo in todos.values() if todo["completed"])
+        self._sizes = {
+            todo_id: estimate_todo_size(todo["title"], todo["description"], todo["updated_at"])
+            for todo_id, todo in todos.items()
+        }
+        self.memory_bytes = sum(self._sizes.values())
+        self.next_id = max(next_id, max(todos, default=0) + 1)
+        self.version += 1
+        if self._listeners:
+            for todo in todos.values():
+                self._notify("created", todo)
+        return len(todos)
+    
+    def memory_stats(self) -> Dict:
+        """
+        Get the approximate memory held by the todos
+        
+        Returns:
+            Dictionary with bytes used, the limits and the state of each limit
+        """
+        used = self.memory_bytes
+        return {
+            "todos": len(self.todos),
+            "bytes": used,
+            "average_todo_bytes": used // len(self.todos) if self.todos else 0,
+            "soft_limit_bytes": self.soft_limit_bytes,
+            "hard_limit_bytes": self.hard_limit_bytes,
+            "large_todo_bytes": self.large_todo_bytes,
+            "over_soft_limit": self.soft_limit_bytes is not None and used > self.soft_limit_bytes,
+            "over_hard_limit": self.hard_limit_bytes is not None and used > self.hard_limit_bytes
+        }
+    
     def count_todos(self) -> Dict[str, int]:
         """
         Get count of todos by status
@@ -141,8 +415,9 @@ class TodoManager:
         Returns:
             Dictionary with total, completed, and pending counts
         """
+        total = len(self.todos)
         return {
-            "total": len(self.todos),
-            "completed": len(self.get_completed_todos()),
-            "pending": len(self.get_pending_todos())
+            "total": total,
+            "completed": self.completed_count,
+            "pending": total - self.completed_count
         }
@@ -0,0 +1,152 @@
+"""
+Calculator API - Flask Blueprint
+Evaluates calculator operations one at a time or in batches
+"""
+
+import math
+import operator
+from typing import Any, Callable, Dict, Tuple
+
+from flask import Blueprint, jsonify, request
+
+calc_bp = Blueprint('calc', __name__, url_prefix='/api/calc')
+
+# Largest number of items accepted in one batch request
+MAX_BATCH_SIZE = 10000
+
+# Largest integer result, in bits, for a single item. Kept below Python's
+# 4300-digit limit on int -> str conversion (about 14,280 bits) so every
+# result can be serialized
+MAX_RESULT_BITS = 14000
+
+
+def _divide(a, b):
+    """Divide a by b, rejecting division by zero"""
+    if b == 0:
+        raise ValueError("Cannot divide by zero")
+    return a / b
+
+
+def _power(base, exponent):
+    """Raise base to exponent, rejecting integer results that would be huge"""
+    if (isinstance(base, int) and isinstance(exponent, int) and abs(base) > 1
+            and math.log2(abs(base)) * abs(exponent) > MAX_RESULT_BITS):
+        raise ValueError("Result too large")
+    if base == 0 and exponent < 0:
+        raise ValueError("Cannot divide by zero")
+    result = base ** exponent
+    if isinstance(result, complex):
+        raise ValueError("Result is not a real number")
+    return result
+
+
+def _square_root(number):
+    """Calculate the square root, rejecting negative numbers"""
+    if number < 0:
+        raise ValueError("Cannot calculate square root of negative number")
+    return number ** 0.5
+
+
+# Operation name -> (function, number of operands); built once at import
+# so each item is a single dict lookup
+OPERATIONS: Dict[str, Tuple[Callable, int]] = {
+    "add": (operator.add, 2),
+    "subtract": (operator.sub, 2),
+    "multiply": (operator.mul, 2),
+    "divide": (_divide, 2),
+    "power": (_power, 2),
+    "square_root": (_square_root, 1),
+}
+
+
+def _is_number(value: Any) -> bool:
+    """Check for an int or float that is not a bool"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def evaluate(item: Any) -> Dict:
+    """
+    Evaluate a single {op, a, b} item
+
+    Args:
+        item: Dictionary with "op", "a" and (for binary operations) "b"
+
+    Returns:
+        {"result": value} on success, {"error": message} otherwise
+    """
+    if not isinstance(item, dict):
+        return {"error": "Item must be an object"}
+
+    entry = OPERATIONS.get(item.get("op"))
+    if entry is None:
+        return {"error": f"Unknown operation: {item.get('op')}"}
+    func, arity = entry
+
+    a = item.get("a")
+    if not _is_number(a):
+        return {"error": "Operand 'a' must be a number"}
+    try:
+        if arity == 1:
+            result = func(a)
+        else:
+            b = item.get("b")
+            if not _is_number(b):
+                return {"error": "Operand 'b' must be a number"}
+            result = func(a, b)
+    except ValueError as e:
+        return {"error": str(e)}
+    except (OverflowError, ZeroDivisionError):
+        return {"error": "Result too large"}
+
+    if isinstance(result, float) and not math.isfinite(result):
+        return {"error": "Result too large"}
+    # multiply can also exceed the limit, e.g. two 4000-digit operands
+    if isinstance(result, int) and result.bit_length() > MAX_RESULT_BITS:
+        return {"error": "Result too large"}
+    return {"result": result}
+
+
+@calc_bp.route('', methods=['POST'])
+def calculate():
+    """Evaluate one operation, or a batch sent as {"items": [...]} or a list"""
+    data = request.get_json(silent=True)
+    if data is None:
+        return jsonify({
+            "success": False,
+            "error": "No data provided"
+        }), 400
+
+    if isinstance(data, dict) and "items" in data:
+        items = data["items"]
+    elif isinstance(data, list):
+        items = data
+    else:
+        result = evaluate(data)
+        if "error" in result:
+            return jsonify({
+                "success": False,
+                "error": result["error"]
+            }), 400
+        return jsonify({
+            "success": True,
+            "data": result
+        }), 200
+
+    if not isinstance(items, list):
+        return jsonify({
+            "success": False,
+            "error": "Items must be a list"
+        }), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({
+            "success": False,
+            "error": f"Batch too large (max {MAX_BATCH_SIZE} items)"
+        }), 413
+
+    results = [evaluate(item) for item in items]
+    return jsonify({
+        "success": True,
+        "count": len(results),
+        "errors": sum(1 for result in results if "error" in result),
+        "data": results
+    }), 200
@@ -0,0 +1,86 @@
+"""
+Clock for Todo Timestamps
+Reads the time once per operation and formats it with a per-second cache
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Tuple
+
+MICROSECONDS = 1_000_000
+
+
+def parse_timestamp(value: str) -> int:
+    """Convert a timestamp made by SystemClock.format() back to epoch microseconds"""
+    moment = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+    return (int(moment.timestamp()) * MICROSECONDS) + moment.microsecond
+
+
+class SystemClock:
+    """
+    Wall clock producing integer epoch microseconds (UTC)
+
+    format() gives the same text as datetime.utcnow().isoformat(). The
+    "YYYY-MM-DDTHH:MM:SS" part only changes once a second, so the last one
+    built is kept and reused; only the microseconds are formatted per call.
+    """
+
+    def __init__(self):
+        """Initialize the clock with an empty prefix cache"""
+        # (epoch second, formatted prefix), replaced as a whole so threads
+        # never see a mismatched pair
+        self._prefix: Tuple[int, str] = (-1, "")
+
+    def now(self) -> int:
+        """Return the current time in epoch microseconds"""
+        return time.time_ns() // 1000
+
+    def format(self, epoch_us: int) -> str:
+        """
+        Format epoch microseconds as a naive UTC ISO 8601 timestamp
+
+        Args:
+            epoch_us: Time in epoch microseconds
+
+        Returns:
+            Timestamp such as "2025-12-20T10:00:00.123456"
+        """
+        second, micro = divmod(epoch_us, MICROSECONDS)
+        cached_second, prefix = self._prefix
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._prefix = (second, prefix)
+        if micro:
+            return "%s.%06d" % (prefix, micro)
+        return prefix
+
+    def timestamp(self) -> Tuple[int, str]:
+        """Return the current time as (epoch microseconds, formatted)"""
+        epoch_us = self.now()
+        return epoch_us, self.format(epoch_us)
+
+
+class FakeClock(SystemClock):
+    """Deterministic clock for tests and benchmarks"""
+
+    def __init__(self, start: float = 1735689600.0, step: float = 0.0):
+        """
+        Initialize the clock
+
+        Args:
+            start: Initial time in epoch seconds (default 2025-01-01T00:00:00)
+            step: Seconds the clock moves forward after every read
+        """
+        super().__init__()
+        self._now = round(start * MICROSECONDS)
+        self._step = round(step * MICROSECONDS)
+
+    def now(self) -> int:
+        """Return the fake time and advance it by step"""
+        current = self._now
+        self._now += self._step
+        return current
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward"""
+        self._now += round(seconds * MICROSECONDS)
@@ -0,0 +1,225 @@
+"""
+Response Compression for the Todo API
+Negotiates gzip/deflate (and zstd/brotli when installed) from Accept-Encoding
+"""
+
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from flask import Flask, g, request
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+
+# Encoding -> (compress function, default level, maximum level)
+ENCODERS: Dict[str, tuple] = {
+    "gzip": (lambda data, level: gzip.compress(data, compresslevel=level, mtime=0), 6, 9),
+    # HTTP "deflate" is the zlib format, not raw deflate
+    "deflate": (lambda data, level: zlib.compress(data, level), 6, 9),
+}
+if zstandard is not None:
+    ENCODERS["zstd"] = (
+        lambda data, level: zstandard.ZstdCompressor(level=level).compress(data), 3, 22
+    )
+if brotli is not None:
+    ENCODERS["br"] = (lambda data, level: brotli.compress(data, quality=level), 5, 11)
+
+# Server preference when the client accepts several encodings equally
+PREFERENCE = ["zstd", "br", "gzip", "deflate"]
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    Compress data with the given content encoding
+
+    Args:
+        data: Bytes to compress
+        encoding: One of ENCODERS
+        level: Compression level (defaults to the encoder's default)
+
+    Returns:
+        Compressed bytes
+    """
+    func, default_level, max_level = ENCODERS[encoding]
+    level = default_level if level is None else max(1, min(level, max_level))
+    return func(data, level)
+
+
+def negotiate(accept_encoding: Optional[str],
+              available: Iterable[str] = None) -> Optional[str]:
+    """
+    Choose a content encoding from an Accept-Encoding header
+
+    Args:
+        accept_encoding: The header value, e.g. "gzip;q=0.8, br"
+        available: Encodings the server can produce (defaults to ENCODERS)
+
+    Returns:
+        The chosen encoding, or None to send the body uncompressed
+    """
+    if not accept_encoding:
+        return None
+    available = list(ENCODERS) if available is None else list(available)
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if name:
+            weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in sorted(available, key=lambda e: PREFERENCE.index(e)
+                           if e in PREFERENCE else len(PREFERENCE)):
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressedBodyCache:
+    """
+    Small LRU cache of compressed response bodies
+
+    Entries are keyed by (path with query string, encoding, Accept header)
+    and tagged with the store version they were built from, so any change to
+    the store invalidates them without explicit purging.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of bodies kept
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, version: int) -> Optional[Tuple[bytes, str]]:
+        """Return the (body, mimetype) stored for key if it was built from version"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key: tuple, version: int, body: bytes, mimetype: str) -> None:
+        """Store a body built from version"""
+        with self._lock:
+            self._entries[key] = (version, body, mimetype)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def init_compression(app: Flask, min_size: int = 1024, level: Optional[int] = None,
+                     version_getter: Optional[Callable[[], int]] = None,
+                     cacheable_endpoints: Iterable[str] = (),
+                     cache: Optional[CompressedBodyCache] = None) -> CompressedBodyCache:
+    """
+    Compress responses according to the request's Accept-Encoding
+
+    GET requests to cacheable_endpoints are served from a cache of compressed
+    bodies while version_getter() is unchanged, skipping both the view and
+    the compression.
+
+    Args:
+        app: The Flask application
+        min_size: Bodies smaller than this many bytes are sent uncompressed
+        level: Compression level for every encoding (None = encoder default)
+        version_getter: Returns the current store version
+        cacheable_endpoints: Endpoint names whose bodies depend only on the
+            URL and the store version
+        cache: Cache to use (a new one is created if omitted)
+
+    Returns:
+        The compressed body cache
+    """
+    cache = cache if cache is not None else CompressedBodyCache()
+    cacheable_endpoints = frozenset(cacheable_endpoints)
+
+    def cache_key():
+        """Return the cache key for this request, or None if not cacheable"""
+        if (version_getter is None or request.method != 'GET'
+                or request.endpoint not in cacheable_endpoints):
+            return None
+        encoding = negotiate(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return None
+        # The Accept header decides the wire format (JSON or MessagePack)
+        return (request.full_path, encoding, request.headers.get('Accept', ''))
+
+    @app.before_request
+    def serve_cached():
+        key = cache_key()
+        if key is None:
+            return None
+        version = version_getter()
+        cached = cache.get(key, version)
+        if cached is None:
+            # Remember the version the view will render, for storing later
+            g.compression_cache = (key, version)
+            return None
+        g.compression_cached = True
+        response = app.response_class(cached[0], status=200, mimetype=cached[1])
+        response.headers['Content-Encoding'] = key[1]
+        response.vary.update(('Accept-Encoding', 'Accept'))
+        return response
+
+    @app.after_request
+    def compress_response(response):
+        if g.pop('compression_cached', False):
+            return response
+        response.vary.add('Accept-Encoding')
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        encoding = negotiate(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        body = compress(data, encoding, level)
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+
+        pending = g.pop('compression_cache', None)
+        # Only store if nothing changed while the view was rendering
+        if (pending is not None and response.status_code == 200
+                and pending[1] == version_getter()):
+            cache.put(pending[0], pending[1], body, response.mimetype)
+        return response
+
+    return cache
@@ -0,0 +1,55 @@
+"""
+Gunicorn configuration for the Todo API
+
+    gunicorn -c gunicorn.conf.py
+
+The application is built once in the master (preload_app) so the todos
+loaded from TODO_SNAPSHOT, the archive index and the tenant map are shared
+with every worker copy-on-write. Two things keep those pages shared:
+
+- The garbage collector is disabled as soon as this file is imported, which
+  gunicorn does before preloading the app. Once the app is loaded
+  (when_ready, before the first fork) gc.freeze() moves everything it
+  built into the permanent generation and collection is turned back on,
+  so collections in the master and the workers never write to (and
+  thereby copy) the preloaded objects. pre_fork freezes again to cover
+  anything the master allocated since.
+- Background threads do not survive fork(), so they are started in each
+  worker (post_fork) rather than in the master.
+
+Only the preloaded starting state is shared. The todo store lives in each
+worker's memory, so with more than one worker, writes made in one worker
+are invisible to the others. The default is therefore a single worker;
+set WEB_CONCURRENCY above 1 only for read-only use of a snapshot.
+"""
+
+import gc
+import os
+
+# Before the app (and main) are imported: no collections while it is built
+gc.disable()
+
+from main import start_background_threads  # noqa: E402
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+preload_app = True
+wsgi_app = "main:create_app(start_background=False)"
+
+
+def when_ready(server):
+    """In the master, after the app is preloaded: freeze it and collect again"""
+    gc.freeze()
+    gc.enable()
+
+
+def pre_fork(server, worker):
+    """In the master, before each fork: stop tracking the preloaded objects"""
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """In each new worker: collect normally and start per-worker threads"""
+    gc.enable()
+    start_background_threads(worker.app.wsgi())
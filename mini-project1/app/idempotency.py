@@ -0,0 +1,161 @@
+"""
+Idempotency support for the Todo API
+Remembers responses by Idempotency-Key so retried requests are not repeated
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+# Longest Idempotency-Key header value accepted
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyConflict(Exception):
+    """Raised when a key is reused with a different request body"""
+
+
+class _Entry:
+    """A stored (or in-progress) response for one idempotency key"""
+
+    __slots__ = ("fingerprint", "expires_at", "status", "body", "done")
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.status = None
+        self.body = None
+        self.done = threading.Event()
+
+
+class IdempotencyCache:
+    """
+    Bounded, TTL-evicting map of (client, idempotency key) -> stored response
+
+    Keys are scoped per client, so two callers that happen to pick the same
+    key do not see each other's responses. The first request for a key runs
+    the handler; concurrent requests with
+    the same key wait for it and then get the same stored response, so the
+    work is done once. Responses with a 5xx status are not stored, so those
+    requests can be retried.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 24 * 3600,
+                 clock: Callable[[], float] = time.monotonic,
+                 wait_timeout: float = 30.0):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of keys remembered
+            ttl: Seconds a stored response is replayed for
+            clock: Time source, injectable for tests
+            wait_timeout: Seconds a duplicate waits for the first request
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.wait_timeout = wait_timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(body: bytes) -> str:
+        """Return a digest identifying a request body"""
+        return hashlib.sha256(body).hexdigest()
+
+    def execute(self, key: str, body: bytes,
+                handler: Callable[[], Tuple[int, Any]],
+                client: str = "") -> Tuple[int, Any, bool]:
+        """
+        Run handler once per key and replay its response afterwards
+
+        Args:
+            key: The Idempotency-Key value
+            body: Raw request body, used to detect key reuse
+            handler: Produces (status, response data) for a new request; the
+                response data (e.g. serialized body and content type) is
+                stored as-is and replayed
+            client: Identity of the caller the key belongs to
+
+        Returns:
+            Tuple of (status, body, replayed)
+
+        Raises:
+            IdempotencyKeyConflict: If the key was used with another body
+            TimeoutError: If the original request is still running after
+                wait_timeout seconds
+        """
+        key = (client, key)
+        fingerprint = self.fingerprint(body)
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._evict(now)
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = _Entry(fingerprint, now + self.ttl)
+                    self._entries[key] = entry
+                    owner = True
+                else:
+                    owner = False
+
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyConflict(
+                    "Idempotency-Key was already used with a different request"
+                )
+
+            if owner:
+                return self._run(key, entry, handler) + (False,)
+
+            if not entry.done.wait(self.wait_timeout):
+                raise TimeoutError("Timed out waiting for the original request")
+            if entry.status is not None:
+                return entry.status, entry.body, True
+            # The original request failed and was not stored; try again
+
+    def _run(self, key: Tuple[str, str], entry: _Entry,
+             handler: Callable[[], Tuple[int, Any]]) -> Tuple[int, Any]:
+        """Run the handler for a new key and store or discard its response"""
+        try:
+            status, body = handler()
+        except BaseException:
+            self._discard(key, entry)
+            raise
+        if status >= 500:
+            self._discard(key, entry)
+        else:
+            entry.status = status
+            entry.body = body
+        entry.done.set()
+        return status, body
+
+    def _discard(self, key: Tuple[str, str], entry: _Entry) -> None:
+        """Forget an entry so the key can be used again"""
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+        entry.done.set()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries and the oldest ones over max_entries"""
+        # Entries share one TTL, so insertion order is also expiry order
+        entries = self._entries
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if entry.expires_at > now and len(entries) < self.max_entries:
+                break
+            del entries[key]
+
+    def get(self, key: str, client: str = "") -> Optional[Tuple[int, Any]]:
+        """Return the stored (status, body) for a client's key, if any"""
+        with self._lock:
+            entry = self._entries.get((client, key))
+        if entry is None or entry.status is None or entry.expires_at <= self.clock():
+            return None
+        return entry.status, entry.body
+
+    def __len__(self) -> int:
+        return len(self._entries)
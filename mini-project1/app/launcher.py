@@ -0,0 +1,372 @@
+"""
+Todo API Launcher
+Starts gunicorn with measured worker/thread settings, and measures them
+
+Command line:
+    python launcher.py calibrate              # sweep settings, write tuning.json
+    python launcher.py calibrate --read-only  # also sweep workers, for snapshots
+    python launcher.py serve                  # start gunicorn with tuning.json
+    python launcher.py serve --dry-run        # print the gunicorn command
+
+calibrate starts gunicorn on localhost once per combination of threads
+and worker class, drives it with a synthetic /api/todos mix of reads and
+writes from separate client processes, and records throughput and p99
+latency. The best combination is the one with the highest throughput
+whose p99 is within --max-p99-ms (or the lowest p99 if none is). serve
+falls back to the gunicorn.conf.py defaults without a tuning file.
+
+The todo store lives in each worker's memory, so with several workers a
+write made in one is lost to the others. The sweep therefore keeps one
+worker. --read-only also tries more workers, with a mix of reads only,
+and writes to tuning.read-only.json; serve only starts several workers
+from a file marked read-only.
+"""
+
+import argparse
+import http.client
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TUNING_FILE = os.path.join(APP_DIR, 'tuning.json')
+READ_ONLY_TUNING_FILE = os.path.join(APP_DIR, 'tuning.read-only.json')
+
+# Requests of the synthetic mix as (weight, method, path, has body); {id} is
+# replaced with one of the seeded todo IDs
+REQUEST_MIX = [
+    (50, 'GET', '/api/todos/{id}', False),
+    (25, 'GET', '/api/todos?fields=id,title,completed', False),
+    (15, 'PUT', '/api/todos/{id}', True),
+    (10, 'POST', '/api/todos', True),
+]
+
+# The mix for --read-only calibration, where writes would be lost
+READ_ONLY_MIX = [entry for entry in REQUEST_MIX if entry[1] == 'GET']
+
+# Todos every worker starts with (loaded from a snapshot)
+SEED_TODOS = 1000
+
+
+def worker_classes() -> List[str]:
+    """Return the gunicorn worker classes usable here"""
+    classes = ['sync', 'gthread']
+    if importlib.util.find_spec('gevent') is not None:
+        classes.append('gevent')
+    return classes
+
+
+def candidate_settings(cpus: int, classes: List[str],
+                       read_only: bool = False) -> List[Dict]:
+    """
+    Build the combinations tried by the sweep
+
+    Args:
+        cpus: Number of CPUs
+        classes: Worker classes to try
+        read_only: Also try several workers (only safe without writes)
+
+    Returns:
+        List of {"workers", "threads", "worker_class"} settings
+    """
+    worker_counts = sorted({1, cpus, 2 * cpus + 1}) if read_only else [1]
+    candidates = []
+    for worker_class in classes:
+        # sync handles one request per worker; gevent ignores threads
+        thread_counts = [2, 4, 8] if worker_class == 'gthread' else [1]
+        for workers in worker_counts:
+            for threads in thread_counts:
+                candidates.append({"workers": workers, "threads": threads,
+                                   "worker_class": worker_class})
+    return candidates
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the value below which the given fraction of values fall"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def choose_best(results: List[Dict], max_p99_ms: float) -> Dict:
+    """
+    Pick the best measured setting
+
+    Args:
+        results: Measurements with "throughput_rps" and "p99_ms"
+        max_p99_ms: Largest acceptable p99 latency
+
+    Returns:
+        The highest-throughput result within the p99 budget, or the
+        lowest-p99 result if none is within it
+    """
+    usable = [r for r in results if r.get("error_rate", 0) < 0.01]
+    within = [r for r in usable if r["p99_ms"] <= max_p99_ms]
+    if within:
+        return max(within, key=lambda r: (r["throughput_rps"], -r["p99_ms"]))
+    return min(usable or results, key=lambda r: r["p99_ms"])
+
+
+def gunicorn_command(settings: Optional[Dict], bind: Optional[str] = None) -> List[str]:
+    """
+    Build the gunicorn command line for a setting
+
+    Args:
+        settings: {"workers", "threads", "worker_class"}, or None for the
+            gunicorn.conf.py defaults
+        bind: Address to listen on (default from gunicorn.conf.py)
+
+    Returns:
+        The command as a list of arguments
+    """
+    command = [sys.executable, '-m', 'gunicorn', '-c', os.path.join(APP_DIR, 'gunicorn.conf.py')]
+    if settings:
+        command += ['--workers', str(settings['workers']),
+                    '--threads', str(settings['threads']),
+                    '--worker-class', settings['worker_class']]
+    if bind:
+        command += ['--bind', bind]
+    return command
+
+
+def _free_port() -> int:
+    """Return a free localhost port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(port: int, timeout: float = 30.0) -> None:
+    """Poll /health until the server answers"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                connection.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start within {timeout:.0f}s")
+
+
+def _client(args: Tuple[int, float, int, List]) -> Tuple[List[float], int]:
+    """
+    Load generator process: send the request mix until the deadline
+
+    Returns:
+        Tuple of (latencies in seconds, number of failed requests)
+    """
+    port, deadline, seed, mix = args
+    rng = random.Random(seed)
+    weights = [entry[0] for entry in mix]
+    latencies, errors = [], 0
+    connection = None
+    while time.time() < deadline:
+        _, method, path, has_body = rng.choices(mix, weights)[0]
+        path = path.format(id=rng.randint(1, SEED_TODOS))
+        body = json.dumps({"title": "Load test", "completed": rng.random() < 0.5}) \
+            if has_body else None
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            connection.request(method, path, body=body,
+                               headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors += 1
+            if response.will_close:
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            if connection is not None:
+                connection.close()
+            connection = None
+            continue
+        latencies.append(time.perf_counter() - start)
+    if connection is not None:
+        connection.close()
+    return latencies, errors
+
+
+def measure(settings: Dict, clients: int, duration: float, env: Dict,
+            mix: List = REQUEST_MIX) -> Dict:
+    """
+    Start gunicorn with one setting and drive it with the request mix
+
+    Args:
+        settings: {"workers", "threads", "worker_class"}
+        clients: Concurrent client processes
+        duration: Seconds of load
+        env: Environment for the server
+        mix: Weighted requests to send
+
+    Returns:
+        The settings with throughput_rps, p50_ms, p99_ms and error_rate added
+    """
+    port = _free_port()
+    server = subprocess.Popen(gunicorn_command(settings, f'127.0.0.1:{port}'),
+                              cwd=APP_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_until_ready(port)
+        deadline = time.time() + duration
+        with multiprocessing.Pool(clients) as pool:
+            outcomes = pool.map(_client, [(port, deadline, i, mix) for i in range(clients)])
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies = [latency for outcome in outcomes for latency in outcome[0]]
+    errors = sum(outcome[1] for outcome in outcomes)
+    total = len(latencies) + errors
+    return dict(settings,
+                throughput_rps=round(len(latencies) / duration, 1),
+                p50_ms=round(percentile(latencies, 0.50) * 1000, 2),
+                p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+                error_rate=round(errors / total, 4) if total else 1.0)
+
+
+def calibrate(args) -> int:
+    """Run the sweep and write the tuning file"""
+    if importlib.util.find_spec('gunicorn') is None:
+        print("gunicorn is not installed: pip install -r requirements.txt", file=sys.stderr)
+        return 1
+    from snapshot import write_snapshot
+
+    cpus = os.cpu_count() or 1
+    candidates = candidate_settings(cpus, worker_classes(), args.read_only)
+    mix = READ_ONLY_MIX if args.read_only else REQUEST_MIX
+    output = args.output or (READ_ONLY_TUNING_FILE if args.read_only else DEFAULT_TUNING_FILE)
+    clients = args.clients or 4 * cpus
+    print(f"{len(candidates)} settings, {clients} clients, {args.duration:.0f}s each")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, 'seed.snap')
+        now = "2025-01-01T00:00:00"
+        write_snapshot(snapshot_path, (
+            {"id": i, "title": f"Todo {i}", "description": f"Seed todo {i}",
+             "completed": i % 2 == 0, "created_at": now, "updated_at": now}
+            for i in range(1, SEED_TODOS + 1)
+        ), SEED_TODOS + 1)
+        env = dict(os.environ, TODO_SNAPSHOT=snapshot_path,
+                   TODO_ARCHIVE_PATH=os.path.join(tmp, 'archive.bin'))
+        # Measure the server itself, not the protections in front of it
+        for name in ('RATE_LIMIT_RPS', 'SHED_MAX_IN_FLIGHT', 'SHED_MAX_QUEUE_MS',
+                     'PROFILE_ADMIN_TOKEN'):
+            env.pop(name, None)
+
+        print(f"{'class':<10}{'workers':>8}{'threads':>8}{'req/s':>10}"
+              f"{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        results = []
+        for settings in candidates:
+            result = measure(settings, clients, args.duration, env, mix)
+            results.append(result)
+            print(f"{result['worker_class']:<10}{result['workers']:>8}{result['threads']:>8}"
+                  f"{result['throughput_rps']:>10.0f}{result['p50_ms']:>9.1f}"
+                  f"{result['p99_ms']:>9.1f}{result['error_rate']:>8.1%}")
+
+    best = choose_best(results, args.max_p99_ms)
+    tuning = {
+        "workers": best["workers"],
+        "threads": best["threads"],
+        "worker_class": best["worker_class"],
+        "read_only": args.read_only,
+        "throughput_rps": best["throughput_rps"],
+        "p99_ms": best["p99_ms"],
+        "max_p99_ms": args.max_p99_ms,
+        "cpu_count": cpus,
+        "calibrated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": results
+    }
+    with open(output, 'w') as f:
+        json.dump(tuning, f, indent=2)
+    print(f"\nBest: {best['worker_class']} x {best['workers']} workers x "
+          f"{best['threads']} threads ({best['throughput_rps']:.0f} req/s, "
+          f"p99 {best['p99_ms']:.1f} ms) -> {output}")
+    return 0
+
+
+def load_tuning(path: str) -> Optional[Dict]:
+    """Read a tuning file, or return None if there is none"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        tuning = json.load(f)
+    settings = {key: tuning[key] for key in ("workers", "threads", "worker_class")}
+    settings["read_only"] = tuning.get("read_only", False)
+    return settings
+
+
+def serve(args) -> int:
+    """Start gunicorn with the tuned settings"""
+    settings = load_tuning(args.tuning)
+    if settings is not None and settings["worker_class"] not in worker_classes():
+        print(f"Worker class {settings['worker_class']} is not installed, "
+              f"using the defaults", file=sys.stderr)
+        settings = None
+    if settings is not None and settings["workers"] > 1 and not settings["read_only"]:
+        # Each worker would keep its own todos and lose the others' writes
+        print(f"{args.tuning} asks for {settings['workers']} workers but was not "
+              f"calibrated with --read-only, using 1 worker", file=sys.stderr)
+        settings["workers"] = 1
+    command = gunicorn_command(settings, args.bind)
+    if args.dry_run:
+        print(" ".join(command))
+        return 0
+    if importlib.util.find_spec('gunicorn') is None:
+        print("gunicorn is not installed: pip install -r requirements.txt", file=sys.stderr)
+        return 1
+    os.chdir(APP_DIR)
+    os.execv(command[0], command)
+
+
+def main(argv=None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Run or calibrate the Todo API server")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="start gunicorn with the tuned settings")
+    serve_parser.add_argument("--tuning", default=DEFAULT_TUNING_FILE,
+                              help="tuning file written by calibrate")
+    serve_parser.add_argument("--bind", help="address to listen on, e.g. 0.0.0.0:8000")
+    serve_parser.add_argument("--dry-run", action="store_true",
+                              help="print the gunicorn command instead of running it")
+
+    calibrate_parser = commands.add_parser("calibrate", help="measure settings on localhost")
+    calibrate_parser.add_argument("--duration", type=float, default=5.0,
+                                  help="seconds of load per setting (default 5)")
+    calibrate_parser.add_argument("--clients", type=int,
+                                  help="concurrent client processes (default 4 per CPU)")
+    calibrate_parser.add_argument("--max-p99-ms", type=float, default=100.0,
+                                  help="p99 latency budget (default 100)")
+    calibrate_parser.add_argument("--read-only", action="store_true",
+                                  help="also sweep several workers, measuring reads only; "
+                                       "for serving a snapshot without writes")
+    calibrate_parser.add_argument("--output",
+                                  help="where to write the tuning file (default "
+                                       "tuning.json, or tuning.read-only.json with --read-only)")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        return serve(args)
+    return calibrate(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,19 +3,56 @@ Todo API - Flask Application
 A simple REST API for managing todo items
 """
 
-from flask import Flask, jsonify, request
+from flask import Blueprint, Flask, current_app, jsonify, request
 from datetime import datetime
-from business_logic import TodoManager
+from business_logic import MemoryLimitError, TodoManager
+from calculator_api import calc_bp
+from idempotency import IdempotencyCache, IdempotencyKeyConflict, MAX_KEY_LENGTH
+from rate_limit import LoadShedder, TokenBucketLimiter, init_rate_limiting
+from compression import init_compression
+from wire import InvalidPayload, UnsupportedWireFormat, respond, todo_payload
+from archival import ArchivalEngine, ArchiveStore
+from profiling import SamplingProfiler, init_profiling
+from tenancy import TenantRegistry, init_tenancy
+from typing import Optional
+from werkzeug.exceptions import RequestEntityTooLarge
+import atexit
 import os
 
-app = Flask(__name__)
-todo_manager = TodoManager()
+todo_bp = Blueprint('todos', __name__)
 
-# Configuration
-app.config['DEBUG'] = os.getenv('FLASK_DEBUG', 'False') == 'True'
 
+class AppState:
+    """
+    Objects behind one application instance
 
-@app.route('/', methods=['GET'])
+    Everything here is built once in create_app; under gunicorn --preload
+    that happens in the master, so workers start from the same todos
+    (e.g. loaded from TODO_SNAPSHOT) and share those pages copy-on-write
+    until they change. The stores are in memory and mutable, so after the
+    fork every worker has its own copy: a todo created in one worker is
+    not seen by the others. Background threads are only started by
+    start_background, after the fork.
+    """
+
+    def __init__(self, todo_manager: TodoManager, archive_store: ArchiveStore,
+                 tenant_registry: TenantRegistry, idempotency_cache: IdempotencyCache):
+        # Mutable stores, private to each worker after the fork
+        self.todo_manager = todo_manager
+        self.archive_store = archive_store
+        self.tenant_registry = tenant_registry
+        # Per-worker
+        self.idempotency_cache = idempotency_cache
+        self.archival_engine: Optional[ArchivalEngine] = None
+        self.sampling_profiler: Optional[SamplingProfiler] = None
+
+
+def _state() -> AppState:
+    """Return the state of the current application"""
+    return current_app.extensions['todo_api']
+
+
+@todo_bp.route('/', methods=['GET'])
 def home():
     """Welcome endpoint"""
     return jsonify({
@@ -28,12 +65,16 @@ def home():
             "POST /api/todos": "Create a new todo",
             "GET /api/todos/<id>": "Get a specific todo",
             "PUT /api/todos/<id>": "Update a todo",
-            "DELETE /api/todos/<id>": "Delete a todo"
+            "DELETE /api/todos/<id>": "Delete a todo",
+            "GET /api/todos/archive/<id>": "Get an archived todo",
+            "GET /api/todos/stats": "Todo counts and memory use",
+            "GET /api/<tenant>/todos": "List a tenant's todos (also POST, and GET/PUT/DELETE /<id>)",
+            "POST /api/calc": "Evaluate a calculation or a batch of them"
         }
     }), 200
 
 
-@app.route('/health', methods=['GET'])
+@todo_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
@@ -43,92 +84,185 @@ def health_check():
     }), 200
 
 
-@app.route('/api/todos', methods=['GET'])
+@todo_bp.route('/api/todos', methods=['GET'])
 def get_todos():
-    """Get all todos"""
+    """Get all todos, optionally only some fields (?fields=) or as columns (?format=columnar)"""
     try:
-        todos = todo_manager.get_all_todos()
-        return jsonify({
+        fields = request.args.get('fields')
+        if fields is not None:
+            fields = [field.strip() for field in fields.split(',') if field.strip()]
+        output_format = request.args.get('format', 'rows')
+        if output_format not in ('rows', 'columnar'):
+            return respond({
+                "success": False,
+                "error": "Format must be 'rows' or 'columnar'"
+            }, 400)
+        
+        try:
+            if output_format == 'columnar':
+                columns = _state().todo_manager.get_todo_columns(fields)
+                return respond({
+                    "success": True,
+                    "count": len(next(iter(columns.values()))),
+                    "fields": list(columns),
+                    "data": columns
+                }, 200)
+            todos = _state().todo_manager.get_all_todos(fields)
+        except ValueError as e:
+            return respond({
+                "success": False,
+                "error": str(e)
+            }, 400)
+        
+        return respond({
             "success": True,
             "count": len(todos),
             "data": todos
-        }), 200
+        }, 200)
     except Exception as e:
-        return jsonify({
+        return respond({
             "success": False,
             "error": str(e)
-        }), 500
+        }, 500)
 
 
-@app.route('/api/todos/<int:todo_id>', methods=['GET'])
+@todo_bp.route('/api/todos/<int:todo_id>', methods=['GET'])
 def get_todo(todo_id):
     """Get a specific todo by ID"""
     try:
-        todo = todo_manager.get_todo(todo_id)
+        todo = _state().todo_manager.get_todo(todo_id)
         if todo:
-            return jsonify({
+            return respond({
                 "success": True,
                 "data": todo
-            }), 200
+            }, 200)
         else:
-            return jsonify({
+            return respond({
                 "success": False,
                 "error": "Todo not found"
-            }), 404
+            }, 404)
     except Exception as e:
-        return jsonify({
+        return respond({
             "success": False,
             "error": str(e)
-        }), 500
+        }, 500)
 
 
-@app.route('/api/todos', methods=['POST'])
+@todo_bp.route('/api/todos', methods=['POST'])
 def create_todo():
-    """Create a new todo"""
+    """Create a new todo, replaying the stored response for a repeated Idempotency-Key"""
+    key = request.headers.get('Idempotency-Key')
+    if key is None:
+        return _create_todo()
+
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return respond({
+            "success": False,
+            "error": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"
+        }, 400)
+
+    def handler():
+        response = _create_todo()
+        return response.status_code, (response.get_data(), response.mimetype)
+
     try:
-        data = request.get_json()
+        status, (body, mimetype), replayed = _state().idempotency_cache.execute(
+            key, request.get_data(), handler, client=_idempotency_client()
+        )
+    except IdempotencyKeyConflict as e:
+        return respond({
+            "success": False,
+            "error": str(e)
+        }, 422)
+    except TimeoutError as e:
+        # The original request with this key is still running
+        response = respond({
+            "success": False,
+            "error": str(e)
+        }, 409)
+        response.headers['Retry-After'] = '1'
+        return response
+
+    response = current_app.response_class(body, status=status, mimetype=mimetype)
+    if replayed:
+        response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _idempotency_client() -> str:
+    """Return the caller an Idempotency-Key belongs to: its API key, else its address"""
+    api_key = request.headers.get('X-API-Key')
+    if api_key:
+        return "key:" + api_key
+    return "ip:" + (request.remote_addr or "unknown")
+
+
+def _create_todo():
+    """Create a todo from the request body and return the response"""
+    try:
+        data = todo_payload()
         
         if not data:
-            return jsonify({
+            return respond({
                 "success": False,
                 "error": "No data provided"
-            }), 400
+            }, 400)
         
         title = data.get('title')
         if not title:
-            return jsonify({
+            return respond({
                 "success": False,
                 "error": "Title is required"
-            }), 400
+            }, 400)
         
         description = data.get('description', '')
-        todo = todo_manager.create_todo(title, description)
+        todo = _state().todo_manager.create_todo(title, description)
         
-        return jsonify({
+        return respond({
             "success": True,
             "message": "Todo created successfully",
             "data": todo
-        }), 201
+        }, 201)
+    except UnsupportedWireFormat as e:
+        return respond({
+            "success": False,
+            "error": str(e)
+        }, 415)
+    except InvalidPayload as e:
+        return respond({
+            "success": False,
+            "error": str(e)
+        }, 400)
+    except RequestEntityTooLarge:
+        return respond({
+            "success": False,
+            "error": "Request body too large"
+        }, 413)
+    except MemoryLimitError as e:
+        return respond({
+            "success": False,
+            "error": str(e)
+        }, e.status)
     except Exception as e:
-        return jsonify({
+        return respond({
             "success": False,
             "error": str(e)
-        }), 500
+        }, 500)
 
 
-@app.route('/api/todos/<int:todo_id>', methods=['PUT'])
+@todo_bp.route('/api/todos/<int:todo_id>', methods=['PUT'])
 def update_todo(todo_id):
     """Update a todo"""
     try:
-        data = request.get_json()
+        data = todo_payload()
         
         if not data:
-            return jsonify({
+            return respond({
                 "success": False,
                 "error": "No data provided"
-            }), 400
+            }, 400)
         
-        todo = todo_manager.update_todo(
+        todo = _state().todo_manager.update_todo(
             todo_id,
             title=data.get('title'),
             description=data.get('description'),
@@ -136,47 +270,102 @@ def update_todo(todo_id):
         )
         
         if todo:
-            return jsonify({
+            return respond({
                 "success": True,
                 "message": "Todo updated successfully",
                 "data": todo
-            }), 200
+            }, 200)
         else:
-            return jsonify({
+            return respond({
                 "success": False,
                 "error": "Todo not found"
-            }), 404
+            }, 404)
+    except UnsupportedWireFormat as e:
+        return respond({
+            "success": False,
+            "error": str(e)
+        }, 415)
+    except InvalidPayload as e:
+        return respond({
+            "success": False,
+            "error": str(e)
+        }, 400)
+    except RequestEntityTooLarge:
+        return respond({
+            "success": False,
+            "error": "Request body too large"
+        }, 413)
+    except MemoryLimitError as e:
+        return respond({
+            "success": False,
+            "error": str(e)
+        }, e.status)
+    except Exception as e:
+        return respond({
+            "success": False,
+            "error": str(e)
+        }, 500)
+
+
+@todo_bp.route('/api/todos/stats', methods=['GET'])
+def get_todo_stats():
+    """Get todo counts and approximate memory use"""
+    todo_manager = _state().todo_manager
+    return respond({
+        "success": True,
+        "data": {
+            "counts": todo_manager.count_todos(),
+            "memory": todo_manager.memory_stats()
+        }
+    }, 200)
+
+
+@todo_bp.route('/api/todos/archive/<int:todo_id>', methods=['GET'])
+def get_archived_todo(todo_id):
+    """Get a todo from the archive"""
+    try:
+        todo = _state().archive_store.get(todo_id)
+        if todo:
+            return respond({
+                "success": True,
+                "data": todo
+            }, 200)
+        else:
+            return respond({
+                "success": False,
+                "error": "Archived todo not found"
+            }, 404)
     except Exception as e:
-        return jsonify({
+        return respond({
             "success": False,
             "error": str(e)
-        }), 500
+        }, 500)
 
 
-@app.route('/api/todos/<int:todo_id>', methods=['DELETE'])
+@todo_bp.route('/api/todos/<int:todo_id>', methods=['DELETE'])
 def delete_todo(todo_id):
     """Delete a todo"""
     try:
-        success = todo_manager.delete_todo(todo_id)
+        success = _state().todo_manager.delete_todo(todo_id)
         
         if success:
-            return jsonify({
+            return respond({
                 "success": True,
                 "message": "Todo deleted successfully"
-            }), 200
+            }, 200)
         else:
-            return jsonify({
+            return respond({
                 "success": False,
                 "error": "Todo not found"
-            }), 404
+            }, 404)
     except Exception as e:
-        return jsonify({
+        return respond({
             "success": False,
             "error": str(e)
-        }), 500
+        }, 500)
 
 
-@app.errorhandler(404)
+@todo_bp.app_errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
     return jsonify({
@@ -185,7 +374,16 @@ def not_found(error):
     }), 404
 
 
-@app.errorhandler(500)
+@todo_bp.app_errorhandler(413)
+def request_too_large(error):
+    """Handle bodies over MAX_CONTENT_LENGTH"""
+    return jsonify({
+        "success": False,
+        "error": "Request body too large"
+    }), 413
+
+
+@todo_bp.app_errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
     return jsonify({
@@ -194,8 +392,166 @@ def internal_error(error):
     }), 500
 
 
+def create_app(todo_manager: Optional[TodoManager] = None,
+               archive_store: Optional[ArchiveStore] = None,
+               start_background: bool = True) -> Flask:
+    """
+    Build the Todo API application from environment settings
+
+    Args:
+        todo_manager: Todo storage (default: a new one, loaded from
+            TODO_SNAPSHOT if set)
+        archive_store: Archive of completed todos (default: TODO_ARCHIVE_PATH)
+        start_background: Start background threads now; pass False when
+            preloading in a server that forks, and call
+            start_background_threads() in each worker instead
+
+    Returns:
+        The Flask application
+    """
+    app = Flask(__name__)
+    app.register_blueprint(calc_bp)
+    app.register_blueprint(todo_bp)
+
+    # Configuration
+    app.config['DEBUG'] = os.getenv('FLASK_DEBUG', 'False') == 'True'
+
+    # Memory limits for each TodoManager (off unless set)
+    soft_limit_mb = os.getenv('TODO_MEMORY_SOFT_LIMIT_MB')
+    hard_limit_mb = os.getenv('TODO_MEMORY_HARD_LIMIT_MB')
+    manager_options = {
+        "soft_limit_bytes": int(float(soft_limit_mb) * 2**20) if soft_limit_mb else None,
+        "hard_limit_bytes": int(float(hard_limit_mb) * 2**20) if hard_limit_mb else None,
+        "large_todo_bytes": int(os.getenv('TODO_LARGE_TODO_BYTES', 64 * 1024))
+    }
+    # Refuse oversized bodies before they are read and parsed; the memory
+    # limits only apply once a todo has been built. The default leaves room
+    # for calculator batches.
+    app.config['MAX_CONTENT_LENGTH'] = int(os.getenv(
+        'MAX_REQUEST_BYTES', 16 * manager_options["large_todo_bytes"]))
+
+    if todo_manager is None:
+        todo_manager = TodoManager(**manager_options)
+        # Warm start from a snapshot file written by TodoManager.export_snapshot
+        if os.getenv('TODO_SNAPSHOT') and os.path.exists(os.getenv('TODO_SNAPSHOT')):
+            todo_manager.import_snapshot(os.getenv('TODO_SNAPSHOT'))
+
+    state = AppState(
+        todo_manager=todo_manager,
+        archive_store=archive_store if archive_store is not None
+        else ArchiveStore(os.getenv('TODO_ARCHIVE_PATH', 'todo_archive.bin')),
+        # Per-tenant todos under /api/<tenant>/todos. With TENANT_DATA_DIR,
+        # rarely used tenants are saved there and unloaded beyond TENANT_MAX_LOADED.
+        tenant_registry=TenantRegistry(
+            data_dir=os.getenv('TENANT_DATA_DIR'),
+            max_loaded=int(os.getenv('TENANT_MAX_LOADED', 1000)),
+            manager_options=manager_options
+        ),
+        # Responses to POST /api/todos remembered by Idempotency-Key header
+        idempotency_cache=IdempotencyCache(
+            max_entries=int(os.getenv('IDEMPOTENCY_MAX_KEYS', 10000)),
+            ttl=float(os.getenv('IDEMPOTENCY_TTL_SECONDS', 24 * 3600))
+        )
+    )
+    app.extensions['todo_api'] = state
+
+    # Per-client rate limiting and load shedding for /api/todos and the
+    # tenant routes (off by default)
+    rate_limit_rps = float(os.getenv('RATE_LIMIT_RPS', 0))
+    shed_max_in_flight = int(os.getenv('SHED_MAX_IN_FLIGHT', 0))
+    shed_max_queue_ms = float(os.getenv('SHED_MAX_QUEUE_MS', 0))
+    if rate_limit_rps or shed_max_in_flight or shed_max_queue_ms:
+        init_rate_limiting(
+            app,
+            limiter=TokenBucketLimiter(
+                rate=rate_limit_rps,
+                burst=float(os.getenv('RATE_LIMIT_BURST', max(1, 2 * rate_limit_rps)))
+            ) if rate_limit_rps else None,
+            shedder=LoadShedder(shed_max_in_flight, shed_max_queue_ms)
+            if shed_max_in_flight or shed_max_queue_ms else None,
+            api_keys=[key.strip() for key in os.getenv('RATE_LIMIT_API_KEYS', '').split(',')
+                      if key.strip()]
+        )
+
+    # Response compression; listings are cached compressed until the store changes.
+    # Installed after rate limiting so cached listings are still rate limited.
+    if os.getenv('COMPRESSION_ENABLED', 'True') == 'True':
+        compression_level = os.getenv('COMPRESSION_LEVEL')
+        init_compression(
+            app,
+            min_size=int(os.getenv('COMPRESSION_MIN_SIZE', 1024)),
+            level=int(compression_level) if compression_level else None,
+            version_getter=lambda: todo_manager.version,
+            cacheable_endpoints={'todos.get_todos'}
+        )
+
+    # Completed todos are moved to a compressed archive file after
+    # TODO_ARCHIVE_AFTER_HOURS (off by default)
+    if os.getenv('TODO_ARCHIVE_AFTER_HOURS'):
+        state.archival_engine = ArchivalEngine(
+            todo_manager,
+            state.archive_store,
+            archive_after=float(os.getenv('TODO_ARCHIVE_AFTER_HOURS')) * 3600
+        )
+
+    init_tenancy(app, state.tenant_registry, admin_token=os.getenv('ADMIN_TOKEN'))
+    if state.tenant_registry.data_dir:
+        atexit.register(state.tenant_registry.flush)
+
+    # Profiling (off unless PROFILE_ADMIN_TOKEN is set): single requests are
+    # profiled with cProfile on request, and a sampling profiler runs in the
+    # background unless PROFILE_SAMPLE_INTERVAL_MS=0
+    if os.getenv('PROFILE_ADMIN_TOKEN'):
+        sample_interval_ms = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', 10))
+        if sample_interval_ms > 0:
+            state.sampling_profiler = SamplingProfiler(
+                interval=sample_interval_ms / 1000,
+                window=float(os.getenv('PROFILE_SAMPLE_WINDOW_SECONDS', 300))
+            )
+        init_profiling(app, os.getenv('PROFILE_ADMIN_TOKEN'), state.sampling_profiler)
+
+    if start_background:
+        start_background_threads(app)
+    return app
+
+
+def start_background_threads(app: Flask) -> None:
+    """
+    Start the archival and sampling threads of an application
+
+    Threads do not survive fork(), so a preloading server calls this in
+    each worker after forking (see gunicorn.conf.py).
+    """
+    state = app.extensions['todo_api']
+    if state.archival_engine is not None:
+        state.archival_engine.start()
+    if state.sampling_profiler is not None:
+        state.sampling_profiler.start()
+
+
+_default_app = None
+
+
+def __getattr__(name):
+    """
+    Build the default application on first use of main.app or main.todo_manager
+
+    Creating it lazily keeps "import main" free of side effects, so a server
+    can import create_app without also building a second application.
+    """
+    global _default_app
+    if name not in ('app', 'todo_manager', 'archive_store', 'tenant_registry',
+                    'idempotency_cache'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _default_app is None:
+        _default_app = create_app()
+    if name == 'app':
+        return _default_app
+    return getattr(_default_app.extensions['todo_api'], name)
+
+
 if __name__ == '__main__':
     # Run the application
     # In production, use a proper WSGI server like gunicorn
     port = int(os.getenv('PORT', 5000))
-    app.run(host='0.0.0.0', port=port)
+    create_app().run(host='0.0.0.0', port=port)
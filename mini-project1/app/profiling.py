@@ -0,0 +1,324 @@
+"""
+Profiling for the Todo API
+Opt-in cProfile of single requests and a background sampling profiler
+"""
+
+import cProfile
+import hmac
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qs
+
+from flask import Blueprint, Flask, Response, jsonify, request
+
+# Header carrying the admin token, for both profiled requests and /admin/profile
+TOKEN_HEADER = 'X-Admin-Token'
+
+
+def token_matches(supplied: Optional[str], token: str) -> bool:
+    """Compare an admin token in constant time"""
+    return bool(supplied) and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+class RequestProfiler:
+    """
+    WSGI middleware that runs cProfile around single requests
+
+    A request is profiled when it has an "X-Profile: 1" header or a
+    "profile=1" query parameter and the admin token in X-Admin-Token;
+    otherwise it passes straight through. The response is unchanged apart
+    from an X-Profile-Id header naming the stored profile. The most recent
+    max_profiles profiles are kept in memory.
+    """
+
+    def __init__(self, wsgi_app: Callable, token: str, max_profiles: int = 20):
+        """
+        Wrap a WSGI application
+
+        Args:
+            wsgi_app: The application to wrap
+            token: Admin token required to profile a request
+            max_profiles: Number of profiles kept
+        """
+        self.wsgi_app = wsgi_app
+        self.token = token
+        self.max_profiles = max_profiles
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _requested(self, environ: Dict) -> bool:
+        """Return True if this request asks to be profiled with a valid token"""
+        flag = environ.get('HTTP_X_PROFILE')
+        if flag is None and 'profile=' in environ.get('QUERY_STRING', ''):
+            flag = parse_qs(environ['QUERY_STRING']).get('profile', [None])[0]
+        if flag not in ('1', 'true'):
+            return False
+        return token_matches(environ.get('HTTP_X_ADMIN_TOKEN'), self.token)
+
+    def __call__(self, environ: Dict, start_response: Callable):
+        if not self._requested(environ):
+            return self.wsgi_app(environ, start_response)
+
+        profile_id = uuid.uuid4().hex[:12]
+
+        def profiled_start_response(status, headers, exc_info=None):
+            return start_response(status, headers + [('X-Profile-Id', profile_id)], exc_info)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active on this thread; serve normally
+            return self.wsgi_app(environ, start_response)
+        start = time.perf_counter()
+        try:
+            app_iter = self.wsgi_app(environ, profiled_start_response)
+            try:
+                # Consume the body inside the profile so streamed work is included
+                body = b"".join(app_iter)
+            finally:
+                if hasattr(app_iter, 'close'):
+                    app_iter.close()
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+
+        profiler.create_stats()
+        with self._lock:
+            self._profiles[profile_id] = {
+                "id": profile_id,
+                "method": environ.get('REQUEST_METHOD'),
+                "path": environ.get('PATH_INFO'),
+                "duration_ms": round(elapsed * 1000, 3),
+                "time": time.time(),
+                "stats": profiler.stats
+            }
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return [body]
+
+    def list_profiles(self) -> list:
+        """Return a summary of the stored profiles, newest last"""
+        with self._lock:
+            return [{key: value for key, value in profile.items() if key != "stats"}
+                    for profile in self._profiles.values()]
+
+    def get_stats(self, profile_id: str) -> Optional[Dict]:
+        """Return the raw cProfile stats of a stored profile"""
+        with self._lock:
+            profile = self._profiles.get(profile_id)
+        return None if profile is None else profile["stats"]
+
+
+class _StoredStats:
+    """Stored raw stats in the shape pstats.Stats loads from a profiler"""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        """Already created"""
+
+
+def format_stats(stats: Dict, sort_by: str = 'cumulative', limit: int = 50) -> str:
+    """
+    Render raw cProfile stats as a pstats report
+
+    Args:
+        stats: Raw stats from a profiler
+        sort_by: pstats sort key
+        limit: Number of functions listed
+
+    Returns:
+        The report text
+    """
+    out = io.StringIO()
+    pstats.Stats(_StoredStats(stats), stream=out).sort_stats(sort_by).print_stats(limit)
+    return out.getvalue()
+
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler for every thread in the process
+
+    A background thread wakes every interval seconds, reads the current
+    stack of each other thread with sys._current_frames() and counts it as
+    a collapsed stack ("thread;outer;...;inner"). Counts are kept in
+    one-second buckets covering the last window seconds, so the output can
+    be limited to a recent period. Nothing is installed in the profiled
+    threads, so the cost is independent of request volume.
+    """
+
+    def __init__(self, interval: float = 0.01, window: float = 300,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the profiler
+
+        Args:
+            interval: Seconds between samples
+            window: Seconds of samples kept
+            clock: Time source (epoch seconds), injectable for tests
+        """
+        self.interval = interval
+        self.window = window
+        self.clock = clock
+        self.samples = 0
+        self._buckets = deque()
+        self._labels = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _label(self, code) -> str:
+        """Return the flamegraph label of a code object"""
+        label = self._labels.get(code)
+        if label is None:
+            label = (f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                     f":{code.co_firstlineno})")
+            self._labels[code] = label
+        return label
+
+    def sample(self, now: Optional[float] = None) -> None:
+        """
+        Record the current stack of every thread except the calling one
+
+        Args:
+            now: Current epoch time (defaults to the clock)
+        """
+        now = self.clock() if now is None else now
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            labels.reverse()
+            stacks.append(";".join(labels))
+
+        second = int(now)
+        with self._lock:
+            if not self._buckets or self._buckets[-1][0] != second:
+                self._buckets.append((second, Counter()))
+            self._buckets[-1][1].update(stacks)
+            while self._buckets and self._buckets[0][0] <= second - self.window:
+                self._buckets.popleft()
+            self.samples += 1
+
+    def collapsed(self, seconds: Optional[float] = None) -> str:
+        """
+        Return sample counts in collapsed-stack format
+
+        Each line is "frame;frame;...;frame count", the input expected by
+        flamegraph.pl, speedscope and similar tools.
+
+        Args:
+            seconds: Only include the most recent seconds (default: the whole window)
+
+        Returns:
+            The collapsed stacks, one per line
+        """
+        since = float('-inf') if seconds is None else int(self.clock() - seconds)
+        totals = Counter()
+        with self._lock:
+            for second, counts in self._buckets:
+                if second > since:
+                    totals.update(counts)
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(totals.items()))
+
+    def start(self) -> None:
+        """Sample in a background daemon thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Take a sample every interval until stopped"""
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+def init_profiling(app: Flask, token: str,
+                   sampler: Optional[SamplingProfiler] = None,
+                   max_profiles: int = 20) -> RequestProfiler:
+    """
+    Install per-request profiling and the /admin/profile endpoints
+
+    Endpoints (all require the admin token in X-Admin-Token):
+        GET /admin/profile/requests         stored request profiles
+        GET /admin/profile/requests/<id>    pstats report (?sort=, ?limit=),
+                                            or the raw stats with ?format=pstats
+        GET /admin/profile/samples          collapsed stacks from the sampler
+                                            (?seconds= for a recent period)
+
+    Args:
+        app: The Flask application
+        token: Admin token
+        sampler: Sampling profiler to expose (optional)
+        max_profiles: Number of request profiles kept
+
+    Returns:
+        The request profiler middleware
+    """
+    profiler = RequestProfiler(app.wsgi_app, token, max_profiles)
+    app.wsgi_app = profiler
+    bp = Blueprint('profiling', __name__, url_prefix='/admin/profile')
+
+    @bp.before_request
+    def require_token():
+        if not token_matches(request.headers.get(TOKEN_HEADER), token):
+            return jsonify({"success": False, "error": "Invalid admin token"}), 403
+        return None
+
+    @bp.route('/requests', methods=['GET'])
+    def list_request_profiles():
+        return jsonify({"success": True, "data": profiler.list_profiles()}), 200
+
+    @bp.route('/requests/<profile_id>', methods=['GET'])
+    def get_request_profile(profile_id):
+        stats = profiler.get_stats(profile_id)
+        if stats is None:
+            return jsonify({"success": False, "error": "Profile not found"}), 404
+        if request.args.get('format') == 'pstats':
+            # Same bytes as Profile.dump_stats, readable by pstats and snakeviz
+            response = Response(marshal.dumps(stats), mimetype='application/octet-stream')
+            response.headers['Content-Disposition'] = \
+                f'attachment; filename="{profile_id}.pstats"'
+            return response
+        sort_by = request.args.get('sort', 'cumulative')
+        if sort_by not in pstats.Stats.sort_arg_dict_default:
+            return jsonify({"success": False, "error": f"Unknown sort key: {sort_by}"}), 400
+        limit = request.args.get('limit', 50, type=int)
+        return Response(format_stats(stats, sort_by, limit), mimetype='text/plain')
+
+    @bp.route('/samples', methods=['GET'])
+    def get_samples():
+        if sampler is None:
+            return jsonify({"success": False, "error": "Sampling profiler is not running"}), 404
+        seconds = request.args.get('seconds', type=float)
+        return Response(sampler.collapsed(seconds), mimetype='text/plain')
+
+    app.register_blueprint(bp)
+    return profiler
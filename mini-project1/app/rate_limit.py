@@ -0,0 +1,210 @@
+"""
+Rate Limiting and Load Shedding for the Todo API
+Per-client token buckets and early rejection when the server is overloaded
+"""
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Collection, Optional, Pattern, Tuple
+
+from flask import Flask, g, jsonify, request
+
+
+# /api/todos and every tenant's /api/<tenant>/todos, with their sub-paths
+TODO_PATHS = re.compile(r"/api/(?:[^/]+/)?todos(?:/|$)")
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket rate limiter keyed by client
+
+    Each active client costs one small list ([tokens, last_seen]). Buckets
+    are kept in least-recently-seen order, so idle ones are evicted from
+    the front in O(1) per bucket.
+    """
+
+    def __init__(self, rate: float, burst: float, idle_ttl: float = 300.0,
+                 max_clients: int = 100000,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the limiter
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            burst: Bucket capacity (requests allowed in a burst)
+            idle_ttl: Seconds after which an unused bucket is dropped
+            max_clients: Maximum number of buckets kept
+            clock: Time source, injectable for tests
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.idle_ttl = idle_ttl
+        self.max_clients = max_clients
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, client: str) -> Tuple[bool, float]:
+        """
+        Take one token for a client
+
+        Returns:
+            Tuple of (allowed, seconds until a token is available)
+        """
+        with self._lock:
+            now = self.clock()
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                self._evict(now)
+                bucket = self._buckets[client] = [self.burst, now]
+            else:
+                self._buckets.move_to_end(client)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0.0
+            return False, (1 - bucket[0]) / self.rate
+
+    def _evict(self, now: float) -> None:
+        """Drop idle buckets and make room for a new one"""
+        buckets = self._buckets
+        while buckets:
+            client, (_, last_seen) = next(iter(buckets.items()))
+            if now - last_seen < self.idle_ttl and len(buckets) < self.max_clients:
+                break
+            del buckets[client]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class LoadShedder:
+    """
+    Rejects requests early when too many are in flight or they queued too long
+    """
+
+    def __init__(self, max_in_flight: int = 0, max_queue_ms: float = 0):
+        """
+        Initialize the load shedder
+
+        Args:
+            max_in_flight: Concurrent requests allowed per process (0 = no limit)
+            max_queue_ms: Longest time a request may wait before being
+                handled, taken from the X-Request-Start header (0 = no limit)
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue_ms = max_queue_ms
+        self.in_flight = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    def enter(self, queue_ms: Optional[float] = None) -> Optional[str]:
+        """
+        Admit a request
+
+        Returns:
+            None if admitted (call leave() when done), otherwise the reason
+        """
+        if self.max_queue_ms and queue_ms is not None and queue_ms > self.max_queue_ms:
+            self.shed += 1
+            return "Request queued too long"
+        with self._lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                self.shed += 1
+                return "Too many requests in flight"
+            self.in_flight += 1
+        return None
+
+    def leave(self) -> None:
+        """Mark an admitted request as finished"""
+        with self._lock:
+            self.in_flight -= 1
+
+
+def queue_time_ms(header: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Milliseconds since the proxy received the request
+
+    Args:
+        header: X-Request-Start value, e.g. "t=1700000000.123" (nginx), in
+            seconds, milliseconds or microseconds since the epoch
+        now: Current epoch seconds (defaults to time.time())
+
+    Returns:
+        Queue time in milliseconds, or None if the header is missing or invalid
+    """
+    if not header:
+        return None
+    try:
+        start = float(header.strip().removeprefix("t="))
+    except ValueError:
+        return None
+    if start > 1e14:
+        start /= 1e6
+    elif start > 1e11:
+        start /= 1e3
+    return max(0.0, ((now if now is not None else time.time()) - start) * 1000)
+
+
+def client_id(api_keys: Optional[Collection[str]] = None) -> str:
+    """
+    Identify the caller by API key, falling back to the client address
+
+    Only keys in api_keys are trusted: anyone can send a fresh random key
+    with every request, so an unchecked key would get a full bucket each time.
+    """
+    api_key = request.headers.get('X-API-Key')
+    if api_key and api_keys and api_key in api_keys:
+        return "key:" + api_key
+    return "ip:" + (request.remote_addr or "unknown")
+
+
+def init_rate_limiting(app: Flask, limiter: Optional[TokenBucketLimiter] = None,
+                       shedder: Optional[LoadShedder] = None,
+                       paths: Pattern = TODO_PATHS,
+                       api_keys: Optional[Collection[str]] = None) -> None:
+    """
+    Install rate limiting and load shedding for requests matching paths
+
+    Args:
+        app: The Flask application
+        limiter: Per-client limiter; over-limit requests get 429
+        shedder: Load shedder; shed requests get 503
+        paths: Only requests whose path matches this (from the start) are checked
+        api_keys: Known X-API-Key values that get their own bucket; other
+            callers are limited by client address
+    """
+    api_keys = frozenset(api_keys or ())
+
+    @app.before_request
+    def check_limits():
+        if not paths.match(request.path):
+            return None
+
+        if shedder is not None:
+            reason = shedder.enter(queue_time_ms(request.headers.get('X-Request-Start')))
+            if reason is not None:
+                response = jsonify({"success": False, "error": reason})
+                response.headers['Retry-After'] = '1'
+                return response, 503
+            g.load_shedder_entered = True
+
+        if limiter is not None:
+            allowed, retry_after = limiter.allow(client_id(api_keys))
+            if not allowed:
+                response = jsonify({"success": False, "error": "Rate limit exceeded"})
+                response.headers['Retry-After'] = str(math.ceil(retry_after))
+                return response, 429
+        return None
+
+    @app.teardown_request
+    def release_slot(error=None):
+        if g.pop('load_shedder_entered', False):
+            shedder.leave()
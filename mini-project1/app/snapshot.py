@@ -0,0 +1,211 @@
+"""
+Todo Snapshots
+Compact binary snapshot files for fast bulk loading of a TodoManager
+
+File layout (all integers little-endian):
+
+    magic         8 bytes   b"TODOSNP1"
+    count         uint64    number of todos
+    next_id       uint64    TodoManager.next_id when the snapshot was taken
+    records       count x   id (int64), completed (uint8), and the lengths in
+                            characters of title, description, created_at and
+                            updated_at (uint32, uint32, uint16, uint16)
+    text          UTF-8     every string field, concatenated in record order
+                            (lone surrogates, which JSON request bodies can
+                            carry, are kept with the surrogatepass handler)
+
+Keeping all strings in one UTF-8 block means loading decodes the text once
+and then only slices it, and the fixed-size records are unpacked in a
+single struct.iter_unpack pass.
+
+Command line:
+    python snapshot.py info todos.snap
+    python snapshot.py import-json dump.json todos.snap   # dump of GET /api/todos
+    python snapshot.py export-json todos.snap > dump.json
+    python snapshot.py generate 1000000 todos.snap
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Dict, Iterable, Tuple
+
+MAGIC = b"TODOSNP1"
+HEADER = struct.Struct("<8sQQ")
+RECORD = struct.Struct("<qBIIHH")
+
+
+class SnapshotError(Exception):
+    """Raised for files that are not valid snapshots"""
+
+
+def write_snapshot(path: str, todos: Iterable[Dict], next_id: int) -> int:
+    """
+    Write todos to a snapshot file, replacing it atomically
+
+    Args:
+        path: Destination file
+        todos: Todo dictionaries
+        next_id: ID the next created todo should get
+
+    Returns:
+        Number of todos written
+    """
+    records = []
+    text = []
+    pack = RECORD.pack
+    for todo in todos:
+        title, description = todo["title"], todo["description"]
+        created_at, updated_at = todo["created_at"], todo["updated_at"]
+        records.append(pack(todo["id"], todo["completed"], len(title), len(description),
+                            len(created_at), len(updated_at)))
+        text += (title, description, created_at, updated_at)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(records), next_id))
+        f.write(b"".join(records))
+        f.write("".join(text).encode("utf-8", "surrogatepass"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+def read_snapshot(path: str) -> Tuple[Dict[int, Dict], int]:
+    """
+    Read a snapshot file
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Tuple of (todos by ID, next_id)
+
+    Raises:
+        SnapshotError: If the file is not a valid snapshot
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            raise SnapshotError(f"{path} is not a todo snapshot")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            view = memoryview(data)
+            try:
+                return _parse(view, path)
+            finally:
+                view.release()
+
+
+def _parse(view: memoryview, path: str) -> Tuple[Dict[int, Dict], int]:
+    """Parse a snapshot held in memory"""
+    magic, count, next_id = HEADER.unpack_from(view)
+    records_end = HEADER.size + count * RECORD.size
+    if magic != MAGIC or records_end > len(view):
+        raise SnapshotError(f"{path} is not a todo snapshot")
+
+    text = str(view[records_end:], "utf-8", "surrogatepass")
+    todos = {}
+    position = 0
+    for todo_id, completed, title_len, description_len, created_len, updated_len \
+            in RECORD.iter_unpack(view[HEADER.size:records_end]):
+        title_end = position + title_len
+        description_end = title_end + description_len
+        created_end = description_end + created_len
+        updated_end = created_end + updated_len
+        todos[todo_id] = {
+            "id": todo_id,
+            "title": text[position:title_end],
+            "description": text[title_end:description_end],
+            "completed": completed == 1,
+            "created_at": text[description_end:created_end],
+            "updated_at": text[created_end:updated_end]
+        }
+        position = updated_end
+    if position != len(text):
+        raise SnapshotError(f"{path} is truncated or corrupt")
+    return todos, next_id
+
+
+def read_counts(path: str) -> Tuple[int, int]:
+    """
+    Count the todos in a snapshot file without loading them
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Tuple of (total, completed)
+
+    Raises:
+        SnapshotError: If the file is not a valid snapshot
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise SnapshotError(f"{path} is not a todo snapshot")
+        magic, count, _ = HEADER.unpack(header)
+        records = f.read(count * RECORD.size)
+    if magic != MAGIC or len(records) < count * RECORD.size:
+        raise SnapshotError(f"{path} is not a todo snapshot")
+    # The completed flag is byte 8 of every fixed-size record
+    return count, records[8::RECORD.size].count(1)
+
+
+def _load_json_todos(path: str) -> list:
+    """Read todos from a JSON file: a list, or a GET /api/todos response"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["data"] if isinstance(data, dict) else data
+
+
+def main(argv=None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Create and inspect todo snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    info = commands.add_parser("info", help="show the size of a snapshot and time loading it")
+    info.add_argument("snapshot")
+
+    import_json = commands.add_parser("import-json", help="build a snapshot from JSON")
+    import_json.add_argument("json_file")
+    import_json.add_argument("snapshot")
+
+    export_json = commands.add_parser("export-json", help="print a snapshot as JSON")
+    export_json.add_argument("snapshot")
+
+    generate = commands.add_parser("generate", help="write a snapshot of synthetic todos")
+    generate.add_argument("count", type=int)
+    generate.add_argument("snapshot")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        start = time.perf_counter()
+        todos, next_id = read_snapshot(args.snapshot)
+        elapsed = time.perf_counter() - start
+        completed = sum(1 for todo in todos.values() if todo["completed"])
+        print(f"{len(todos):,} todos ({completed:,} completed), next_id {next_id}, "
+              f"{os.path.getsize(args.snapshot):,} bytes, loaded in {elapsed:.2f}s")
+    elif args.command == "import-json":
+        todos = _load_json_todos(args.json_file)
+        next_id = max((todo["id"] for todo in todos), default=0) + 1
+        print(f"Wrote {write_snapshot(args.snapshot, todos, next_id):,} todos")
+    elif args.command == "export-json":
+        todos, _ = read_snapshot(args.snapshot)
+        json.dump(list(todos.values()), sys.stdout)
+        sys.stdout.write("\n")
+    elif args.command == "generate":
+        now = "2025-01-01T00:00:00.000000"
+        todos = ({"id": i, "title": f"Todo {i}", "description": f"Description {i}",
+                  "completed": i % 3 == 0, "created_at": now, "updated_at": now}
+                 for i in range(1, args.count + 1))
+        print(f"Wrote {write_snapshot(args.snapshot, todos, args.count + 1):,} todos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,416 @@
+"""
+Multi-Tenant Todos
+Independent TodoManager shards per tenant, served under /api/<tenant>/todos
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from flask import Blueprint, Flask, jsonify, request
+
+from business_logic import MemoryLimitError, TodoManager
+from profiling import TOKEN_HEADER, token_matches
+from snapshot import SnapshotError, read_counts
+from wire import InvalidPayload, UnsupportedWireFormat, respond, todo_payload
+
+# Tenant names are also file names, so keep them to a safe alphabet
+TENANT_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+
+# Names that would shadow the single-tenant routes under /api
+RESERVED_TENANTS = frozenset({"todos", "calc"})
+
+SNAPSHOT_SUFFIX = ".snap"
+
+
+class InvalidTenant(ValueError):
+    """Raised for tenant names that are malformed or reserved"""
+
+
+class TenantLimitError(Exception):
+    """Raised when a new tenant cannot be loaded without losing another's todos"""
+
+
+def validate_tenant(name: str) -> str:
+    """
+    Check a tenant name
+
+    Args:
+        name: Tenant name from the URL
+
+    Returns:
+        The name
+
+    Raises:
+        InvalidTenant: If the name is malformed or reserved
+    """
+    if not TENANT_PATTERN.fullmatch(name) or name in RESERVED_TENANTS:
+        raise InvalidTenant(f"Invalid tenant name: {name}")
+    return name
+
+
+class _Shard:
+    """One tenant's TodoManager and the lock serializing access to it"""
+
+    __slots__ = ("manager", "lock", "users", "saved_version")
+
+    def __init__(self, manager: TodoManager):
+        self.manager = manager
+        self.lock = threading.RLock()
+        # Requests currently holding this shard; in-use shards are never evicted
+        self.users = 0
+        # manager.version when last loaded or saved, to skip clean writes
+        self.saved_version = manager.version
+
+
+class TenantRegistry:
+    """
+    Shard map of tenant name -> TodoManager
+
+    Each tenant has its own TodoManager (its own ID sequence, storage and
+    counters) and its own lock, so requests for different tenants never
+    contend. Shards are created or loaded on first use and kept in LRU
+    order; beyond max_loaded the least recently used idle shard is saved
+    as a snapshot in data_dir and dropped from memory. Without a data_dir
+    only shards that were never written to can be evicted, so max_loaded
+    is a hard cap: once that many tenants hold todos, new tenants are
+    refused with TenantLimitError.
+
+    The registry lock only guards the shard map; loading and saving
+    snapshots happens under it, which is the price of not loading a
+    tenant twice.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None, max_loaded: int = 1000,
+                 manager_options: Optional[Dict] = None):
+        """
+        Initialize the registry
+
+        Args:
+            data_dir: Directory for tenant snapshots (optional)
+            max_loaded: Number of tenants kept in memory
+            manager_options: Keyword arguments for each tenant's TodoManager,
+                e.g. memory limits (optional)
+        """
+        self.data_dir = data_dir
+        self.max_loaded = max_loaded
+        self.manager_options = manager_options or {}
+        self.loads = 0
+        self.evictions = 0
+        self._shards = OrderedDict()
+        # Tenant -> (total, completed) for tenants saved but not loaded
+        self._saved_counts = {}
+        self._lock = threading.Lock()
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+
+    def _path(self, name: str) -> Optional[str]:
+        """Return the snapshot file of a tenant"""
+        if not self.data_dir:
+            return None
+        return os.path.join(self.data_dir, name + SNAPSHOT_SUFFIX)
+
+    @contextmanager
+    def tenant(self, name: str) -> Iterator[TodoManager]:
+        """
+        Use a tenant's TodoManager with its lock held
+
+        Args:
+            name: Tenant name
+
+        Yields:
+            The tenant's TodoManager
+
+        Raises:
+            InvalidTenant: If the name is malformed or reserved
+        """
+        validate_tenant(name)
+        shard = self._checkout(name)
+        try:
+            with shard.lock:
+                yield shard.manager
+        finally:
+            with self._lock:
+                shard.users -= 1
+
+    def _checkout(self, name: str) -> _Shard:
+        """Find or load a shard and mark it in use"""
+        with self._lock:
+            shard = self._shards.get(name)
+            if shard is None:
+                # Make room before loading, so nothing is marked in use if
+                # loading fails
+                self._evict_over_limit(reserve=1)
+                if not self.data_dir and len(self._shards) >= self.max_loaded:
+                    # Nothing can be saved, so refuse
+                    raise TenantLimitError(
+                        f"Tenant limit reached ({self.max_loaded} tenants in memory)")
+                shard = self._load(name)
+                self._shards[name] = shard
+            else:
+                self._shards.move_to_end(name)
+            shard.users += 1
+            return shard
+
+    def _load(self, name: str) -> _Shard:
+        """Create a shard, from its snapshot if there is one"""
+        manager = TodoManager(**self.manager_options)
+        path = self._path(name)
+        if path and os.path.exists(path):
+            manager.import_snapshot(path)
+        self._saved_counts.pop(name, None)
+        self.loads += 1
+        return _Shard(manager)
+
+    def _save(self, name: str, shard: _Shard) -> None:
+        """Write a shard's snapshot if it changed since the last save"""
+        if shard.manager.version != shard.saved_version:
+            shard.manager.export_snapshot(self._path(name))
+            shard.saved_version = shard.manager.version
+
+    def _evictable(self, shard: _Shard) -> bool:
+        """Return True if a shard can be dropped without losing anything"""
+        if shard.users:
+            return False
+        return bool(self.data_dir) or shard.manager.next_id == 1
+
+    def _evict_over_limit(self, reserve: int = 0) -> None:
+        """Drop least recently used idle shards beyond max_loaded, minus reserve"""
+        excess = len(self._shards) + reserve - self.max_loaded
+        if excess <= 0:
+            return
+        for name in list(self._shards):
+            if excess <= 0:
+                break
+            shard = self._shards[name]
+            if not self._evictable(shard):
+                continue
+            try:
+                self._evict(name, shard)
+            except OSError:
+                # Could not save it (e.g. disk full): keep it loaded and
+                # try the next one rather than failing this request
+                continue
+            excess -= 1
+
+    def _evict(self, name: str, shard: _Shard) -> None:
+        """Save and drop one shard (registry lock held)"""
+        with shard.lock:
+            if self.data_dir:
+                self._save(name, shard)
+                counts = shard.manager.count_todos()
+                self._saved_counts[name] = (counts["total"], counts["completed"])
+            del self._shards[name]
+        self.evictions += 1
+
+    def evict(self, name: str) -> bool:
+        """
+        Save and unload a tenant now
+
+        Args:
+            name: Tenant name
+
+        Returns:
+            True if the tenant was unloaded
+        """
+        with self._lock:
+            shard = self._shards.get(name)
+            if shard is None or not self._evictable(shard):
+                return False
+            self._evict(name, shard)
+            return True
+
+    def flush(self) -> int:
+        """
+        Save every loaded tenant that changed (e.g. at shutdown)
+
+        Returns:
+            Number of tenants saved
+        """
+        if not self.data_dir:
+            return 0
+        saved = 0
+        with self._lock:
+            shards = list(self._shards.items())
+        for name, shard in shards:
+            with shard.lock:
+                if shard.manager.version != shard.saved_version:
+                    self._save(name, shard)
+                    saved += 1
+        return saved
+
+    def counts(self, per_tenant: bool = False) -> Dict:
+        """
+        Aggregate todo counts across every tenant
+
+        Loaded tenants report their TodoManager counters and unloaded ones
+        the counts recorded when they were saved; snapshots written before
+        this process started are counted from their record table once.
+
+        Args:
+            per_tenant: Include the counts of each tenant
+
+        Returns:
+            Dictionary of tenant, total, completed and pending counts
+        """
+        with self._lock:
+            counts = {}
+            for name, shard in self._shards.items():
+                shard_counts = shard.manager.count_todos()
+                counts[name] = (shard_counts["total"], shard_counts["completed"])
+            loaded = len(counts)
+            for name, saved in self._saved_counts.items():
+                counts.setdefault(name, saved)
+            for name, path in self._unseen_snapshots(counts):
+                try:
+                    self._saved_counts[name] = counts[name] = read_counts(path)
+                except SnapshotError:
+                    continue
+
+        total = sum(value[0] for value in counts.values())
+        completed = sum(value[1] for value in counts.values())
+        result = {
+            "tenants": len(counts),
+            "loaded": loaded,
+            "total": total,
+            "completed": completed,
+            "pending": total - completed
+        }
+        if per_tenant:
+            result["by_tenant"] = {
+                name: {"total": value[0], "completed": value[1], "pending": value[0] - value[1]}
+                for name, value in sorted(counts.items())
+            }
+        return result
+
+    def _unseen_snapshots(self, known: Dict) -> Iterator:
+        """Yield (tenant, path) for snapshot files of tenants not yet counted"""
+        if not self.data_dir:
+            return
+        for entry in os.scandir(self.data_dir):
+            name = entry.name[:-len(SNAPSHOT_SUFFIX)]
+            if (entry.name.endswith(SNAPSHOT_SUFFIX) and name not in known
+                    and TENANT_PATTERN.fullmatch(name)):
+                yield name, entry.path
+
+    def __len__(self) -> int:
+        return len(self._shards)
+
+
+def _error(message: str, status: int):
+    """Build an error response"""
+    return respond({"success": False, "error": message}, status)
+
+
+def init_tenancy(app: Flask, registry: TenantRegistry,
+                 admin_token: Optional[str] = None) -> None:
+    """
+    Install the /api/<tenant>/todos routes
+
+    The routes mirror the basic /api/todos CRUD routes for each tenant;
+    ?fields, ?format=columnar, /stats, /archive and Idempotency-Key are
+    only available on /api/todos. With an admin_token,
+    GET /admin/tenants (token in X-Admin-Token) returns the aggregated
+    counts, with ?per_tenant=true for a breakdown.
+
+    Args:
+        app: The Flask application
+        registry: The tenant shards
+        admin_token: Token for /admin/tenants (the endpoint is off without one)
+    """
+    bp = Blueprint('tenants', __name__)
+
+    @bp.errorhandler(InvalidTenant)
+    def invalid_tenant(error):
+        return _error(str(error), 400)
+
+    @bp.errorhandler(TenantLimitError)
+    def tenant_limit(error):
+        return _error(str(error), 507)
+
+    @bp.errorhandler(InvalidPayload)
+    def invalid_payload(error):
+        return _error(str(error), 400)
+
+    @bp.errorhandler(UnsupportedWireFormat)
+    def unsupported_wire_format(error):
+        return _error(str(error), 415)
+
+    @bp.errorhandler(MemoryLimitError)
+    def memory_limit(error):
+        return _error(str(error), error.status)
+
+    @bp.route('/api/<tenant>/todos', methods=['GET'])
+    def get_tenant_todos(tenant):
+        with registry.tenant(tenant) as manager:
+            todos = manager.get_all_todos()
+            return respond({"success": True, "count": len(todos), "data": todos}, 200)
+
+    @bp.route('/api/<tenant>/todos', methods=['POST'])
+    def create_tenant_todo(tenant):
+        data = todo_payload()
+        if not data:
+            return _error("No data provided", 400)
+        if not data.get('title'):
+            return _error("Title is required", 400)
+        with registry.tenant(tenant) as manager:
+            try:
+                todo = manager.create_todo(data['title'], data.get('description', ''))
+            except ValueError as e:
+                return _error(str(e), 400)
+            return respond({
+                "success": True,
+                "message": "Todo created successfully",
+                "data": todo
+            }, 201)
+
+    @bp.route('/api/<tenant>/todos/<int:todo_id>', methods=['GET'])
+    def get_tenant_todo(tenant, todo_id):
+        with registry.tenant(tenant) as manager:
+            todo = manager.get_todo(todo_id)
+            if not todo:
+                return _error("Todo not found", 404)
+            return respond({"success": True, "data": todo}, 200)
+
+    @bp.route('/api/<tenant>/todos/<int:todo_id>', methods=['PUT'])
+    def update_tenant_todo(tenant, todo_id):
+        data = todo_payload()
+        if not data:
+            return _error("No data provided", 400)
+        with registry.tenant(tenant) as manager:
+            try:
+                todo = manager.update_todo(
+                    todo_id,
+                    title=data.get('title'),
+                    description=data.get('description'),
+                    completed=data.get('completed')
+                )
+            except ValueError as e:
+                return _error(str(e), 400)
+            if not todo:
+                return _error("Todo not found", 404)
+            return respond({
+                "success": True,
+                "message": "Todo updated successfully",
+                "data": todo
+            }, 200)
+
+    @bp.route('/api/<tenant>/todos/<int:todo_id>', methods=['DELETE'])
+    def delete_tenant_todo(tenant, todo_id):
+        with registry.tenant(tenant) as manager:
+            if not manager.delete_todo(todo_id):
+                return _error("Todo not found", 404)
+            return respond({"success": True, "message": "Todo deleted successfully"}, 200)
+
+    if admin_token:
+        @bp.route('/admin/tenants', methods=['GET'])
+        def tenant_counts():
+            if not token_matches(request.headers.get(TOKEN_HEADER), admin_token):
+                return jsonify({"success": False, "error": "Invalid admin token"}), 403
+            per_tenant = request.args.get('per_tenant', '').lower() in ('1', 'true')
+            return jsonify({"success": True, "data": registry.counts(per_tenant)}), 200
+
+    app.register_blueprint(bp)
@@ -0,0 +1,183 @@
+"""
+Tests for archival of completed todos
+"""
+
+import pytest
+import json
+import threading
+import time
+import main
+from archival import ArchivalEngine, ArchiveStore
+from business_logic import TodoManager
+
+HOUR = 3600
+
+
+@pytest.fixture
+def manager():
+    """Create an empty TodoManager"""
+    return TodoManager()
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create an empty archive file"""
+    return ArchiveStore(str(tmp_path / "archive.bin"))
+
+
+class TestArchiveStore:
+    """Test cases for ArchiveStore"""
+
+    def test_append_and_get(self, store):
+        """Test retrieving archived todos"""
+        store.append([{"id": 1, "title": "A"}, {"id": 2, "title": "B"}])
+        store.append([{"id": 3, "title": "C"}])
+
+        assert store.get(2) == {"id": 2, "title": "B"}
+        assert store.get(3) == {"id": 3, "title": "C"}
+        assert store.get(4) is None
+        assert len(store) == 3
+
+    def test_index_is_rebuilt_on_open(self, store):
+        """Test reopening an existing archive"""
+        store.append([{"id": 1, "title": "A"}])
+        store.append([{"id": 2, "title": "B"}])
+
+        reopened = ArchiveStore(store.path)
+
+        assert 2 in reopened
+        assert reopened.get(1) == {"id": 1, "title": "A"}
+
+    def test_file_is_compressed(self, store):
+        """Test that repetitive todos take less space than their JSON"""
+        todos = [{"id": i, "title": "Same title", "description": "x" * 100}
+                 for i in range(100)]
+        store.append(todos)
+
+        with open(store.path, "rb") as f:
+            assert len(f.read()) < len(json.dumps(todos)) / 10
+
+
+class TestArchivalEngine:
+    """Test cases for ArchivalEngine"""
+
+    def test_archives_completed_todos_after_retention(self, manager, store):
+        """Test that only completed todos past the retention are archived"""
+        engine = ArchivalEngine(manager, store, archive_after=HOUR)
+        done = manager.create_todo("Done")
+        manager.create_todo("Pending")
+        manager.update_todo(done["id"], completed=True)
+
+        assert engine.run_pending(time.time() + HOUR / 2) == 0
+        assert engine.run_pending(time.time() + HOUR + 1) == 1
+
+        assert manager.get_todo(done["id"]) is None
+        assert store.get(done["id"])["title"] == "Done"
+        assert len(manager.todos) == 1
+
+    def test_reopened_todo_is_not_archived(self, manager, store):
+        """Test that a todo marked pending again stays"""
+        engine = ArchivalEngine(manager, store, archive_after=HOUR)
+        todo = manager.create_todo("Todo")
+        manager.update_todo(todo["id"], completed=True)
+        manager.update_todo(todo["id"], completed=False)
+
+        assert engine.run_pending(time.time() + 2 * HOUR) == 0
+        assert manager.get_todo(todo["id"]) is not None
+
+    def test_update_postpones_archival(self, manager, store):
+        """Test that the retention counts from the last update"""
+        engine = ArchivalEngine(manager, store, archive_after=HOUR)
+        todo = manager.create_todo("Todo")
+        manager.update_todo(todo["id"], completed=True)
+        first_due = engine.next_due()
+        time.sleep(0.01)
+        manager.update_todo(todo["id"], title="Renamed")
+
+        assert engine.run_pending(first_due) == 0
+        assert engine.run_pending(time.time() + HOUR + 1) == 1
+        assert store.get(todo["id"])["title"] == "Renamed"
+
+    def test_deleted_todo_is_skipped(self, manager, store):
+        """Test that deleted todos are not archived"""
+        engine = ArchivalEngine(manager, store, archive_after=HOUR)
+        todo = manager.create_todo("Todo")
+        manager.update_todo(todo["id"], completed=True)
+        manager.delete_todo(todo["id"])
+
+        assert engine.run_pending(time.time() + 2 * HOUR) == 0
+        assert len(store) == 0
+
+    def test_existing_todos_are_scheduled(self, manager, store):
+        """Test that todos completed before the engine started are picked up"""
+        todo = manager.create_todo("Todo")
+        manager.update_todo(todo["id"], completed=True)
+        engine = ArchivalEngine(manager, store, archive_after=HOUR)
+
+        assert engine.run_pending(time.time() + HOUR + 1) == 1
+
+    def test_one_heap_entry_per_todo(self, manager, store):
+        """Test that repeated updates do not pile up heap entries"""
+        engine = ArchivalEngine(manager, store, archive_after=HOUR)
+        todo = manager.create_todo("Todo", "")
+        manager.update_todo(todo["id"], completed=True)
+        for i in range(100):
+            manager.update_todo(todo["id"], description=f"Edit {i}")
+
+        assert len(engine._heap) == 1
+        assert engine.run_pending(time.time() + HOUR + 1) == 1
+        assert store.get(todo["id"])["description"] == "Edit 99"
+
+    def test_concurrent_reopen_is_not_lost(self, manager, store):
+        """Test that a todo reopened while archival waits for the lock stays"""
+        engine = ArchivalEngine(manager, store, archive_after=HOUR)
+        todo = manager.create_todo("Todo")
+        manager.update_todo(todo["id"], completed=True)
+        results = []
+
+        with manager.lock:
+            worker = threading.Thread(
+                target=lambda: results.append(engine.run_pending(time.time() + 2 * HOUR)))
+            worker.start()
+            worker.join(0.2)
+            # The engine has picked the todo and is blocked on the lock
+            assert worker.is_alive()
+            manager.update_todo(todo["id"], completed=False)
+        worker.join()
+
+        assert results == [0]
+        assert manager.get_todo(todo["id"])["completed"] is False
+        assert len(store) == 0
+
+    def test_background_thread(self, manager, store):
+        """Test that the background thread archives due todos"""
+        engine = ArchivalEngine(manager, store, archive_after=0.05)
+        engine.start()
+        try:
+            todo = manager.create_todo("Todo")
+            manager.update_todo(todo["id"], completed=True)
+            deadline = time.time() + 2
+            while todo["id"] in manager.todos and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            engine.stop()
+
+        assert todo["id"] in store
+        assert engine.archived == 1
+
+
+class TestArchiveEndpoint:
+    """Test cases for GET /api/todos/archive/<id>"""
+
+    def test_get_archived_todo(self, store):
+        """Test retrieving an archived todo over the API"""
+        store.append([{"id": 7, "title": "Old"}])
+        app = main.create_app(archive_store=store)
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            found = client.get('/api/todos/archive/7')
+            missing = client.get('/api/todos/archive/8')
+
+        assert found.status_code == 200
+        assert json.loads(found.data)["data"]["title"] == "Old"
+        assert missing.status_code == 404
@@ -0,0 +1,131 @@
+"""
+Integration tests for the Calculator API blueprint
+"""
+
+import pytest
+import json
+from main import app
+from calculator_api import MAX_BATCH_SIZE, evaluate
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the Flask app"""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def post_calc(client, payload):
+    """POST a payload to /api/calc and return (status, parsed body)"""
+    response = client.post('/api/calc',
+                           data=json.dumps(payload),
+                           content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+class TestEvaluate:
+    """Test cases for single item evaluation"""
+
+    def test_operations(self):
+        """Test every supported operation"""
+        assert evaluate({"op": "add", "a": 5, "b": 3}) == {"result": 8}
+        assert evaluate({"op": "subtract", "a": 10, "b": 4}) == {"result": 6}
+        assert evaluate({"op": "multiply", "a": 6, "b": 7}) == {"result": 42}
+        assert evaluate({"op": "divide", "a": 20, "b": 4}) == {"result": 5}
+        assert evaluate({"op": "power", "a": 2, "b": -1}) == {"result": 0.5}
+        assert evaluate({"op": "square_root", "a": 16}) == {"result": 4}
+
+    def test_calculator_errors(self):
+        """Test that calculator errors are returned as messages"""
+        assert evaluate({"op": "divide", "a": 1, "b": 0}) == {"error": "Cannot divide by zero"}
+        assert evaluate({"op": "square_root", "a": -4}) == {
+            "error": "Cannot calculate square root of negative number"
+        }
+
+    def test_invalid_items(self):
+        """Test validation of operations and operands"""
+        assert "error" in evaluate({"op": "modulo", "a": 1, "b": 2})
+        assert "error" in evaluate({"op": "add", "a": "1", "b": 2})
+        assert "error" in evaluate({"op": "add", "a": True, "b": 2})
+        assert "error" in evaluate({"op": "add", "a": 1})
+        assert "error" in evaluate([1, 2])
+
+    def test_oversized_results(self):
+        """Test that huge or non-real results are rejected"""
+        assert evaluate({"op": "power", "a": 2, "b": 10 ** 9}) == {"error": "Result too large"}
+        assert evaluate({"op": "power", "a": 10.0, "b": 1000}) == {"error": "Result too large"}
+        assert "error" in evaluate({"op": "power", "a": -8, "b": 0.5})
+
+
+class TestCalculatorEndpoint:
+    """Test cases for POST /api/calc"""
+
+    def test_single_operation(self, client):
+        """Test evaluating a single operation"""
+        status, data = post_calc(client, {"op": "multiply", "a": 6, "b": 7})
+
+        assert status == 200
+        assert data["success"] is True
+        assert data["data"]["result"] == 42
+
+    def test_single_operation_error(self, client):
+        """Test that a failing single operation returns 400"""
+        status, data = post_calc(client, {"op": "divide", "a": 1, "b": 0})
+
+        assert status == 400
+        assert data["success"] is False
+        assert data["error"] == "Cannot divide by zero"
+
+    def test_batch(self, client):
+        """Test a batch with per-item errors returned inline"""
+        items = [
+            {"op": "add", "a": 1, "b": 2},
+            {"op": "divide", "a": 1, "b": 0},
+            {"op": "square_root", "a": 9}
+        ]
+        status, data = post_calc(client, {"items": items})
+
+        assert status == 200
+        assert data["count"] == 3
+        assert data["errors"] == 1
+        assert data["data"] == [
+            {"result": 3},
+            {"error": "Cannot divide by zero"},
+            {"result": 3.0}
+        ]
+
+    def test_batch_with_oversized_results(self, client):
+        """Test that results too long to serialize are inline errors"""
+        items = [
+            {"op": "power", "a": 10, "b": 5000},
+            {"op": "multiply", "a": 10 ** 4000, "b": 10 ** 4000},
+            {"op": "power", "a": 10, "b": 4000}
+        ]
+        status, data = post_calc(client, {"items": items})
+
+        assert status == 200
+        assert data["errors"] == 2
+        assert data["data"][:2] == [{"error": "Result too large"}] * 2
+        assert data["data"][2] == {"result": 10 ** 4000}
+
+    def test_batch_as_list(self, client):
+        """Test that a bare list is accepted as a batch"""
+        status, data = post_calc(client, [{"op": "add", "a": i, "b": i} for i in range(1000)])
+
+        assert status == 200
+        assert data["count"] == 1000
+        assert data["data"][999] == {"result": 1998}
+
+    def test_batch_too_large(self, client):
+        """Test that oversized batches are rejected"""
+        status, data = post_calc(client, [{"op": "add", "a": 1, "b": 1}] * (MAX_BATCH_SIZE + 1))
+
+        assert status == 413
+        assert data["success"] is False
+
+    def test_no_data(self, client):
+        """Test that a request without JSON returns 400"""
+        response = client.post('/api/calc', content_type='application/json')
+
+        assert response.status_code == 400
@@ -0,0 +1,98 @@
+"""
+Tests for the timestamp clock
+"""
+
+import pytest
+from datetime import datetime, timezone
+from clock import FakeClock, SystemClock, parse_timestamp
+from business_logic import TodoManager
+
+
+def utc_isoformat(epoch_us):
+    """Reference formatting through datetime"""
+    return datetime.fromtimestamp(epoch_us / 1_000_000, timezone.utc) \
+        .replace(tzinfo=None).isoformat()
+
+
+class TestClock:
+    """Test cases for SystemClock and FakeClock"""
+
+    @pytest.mark.parametrize("epoch_us", [
+        0, 1, 999_999, 1_735_689_600_000_000, 1_735_689_600_000_001,
+        1_735_689_599_999_999, 1_766_224_800_123_456, 4_102_444_800_500_000
+    ])
+    def test_format_matches_isoformat(self, epoch_us):
+        """Test that formatting matches datetime.isoformat()"""
+        assert SystemClock().format(epoch_us) == utc_isoformat(epoch_us)
+
+    @pytest.mark.parametrize("epoch_us", [0, 1_735_689_600_000_000, 1_766_224_800_123_456])
+    def test_parse_reverses_format(self, epoch_us):
+        """Test that parse_timestamp reads back what format() wrote"""
+        assert parse_timestamp(SystemClock().format(epoch_us)) == epoch_us
+
+    def test_prefix_is_reused_within_a_second(self):
+        """Test formatting several times inside the same second"""
+        clock = SystemClock()
+        base = 1_735_689_600_000_000
+
+        assert clock.format(base + 5) == "2025-01-01T00:00:00.000005"
+        assert clock.format(base + 999_999) == "2025-01-01T00:00:00.999999"
+        assert clock.format(base + 1_000_000) == "2025-01-01T00:00:01"
+
+    def test_system_clock_is_current(self):
+        """Test that the system clock agrees with datetime"""
+        before = datetime.now(timezone.utc).timestamp()
+        epoch_us, formatted = SystemClock().timestamp()
+        after = datetime.now(timezone.utc).timestamp()
+
+        assert before - 0.001 <= epoch_us / 1_000_000 <= after + 0.001
+        assert formatted == utc_isoformat(epoch_us)
+
+    def test_fake_clock(self):
+        """Test stepping and advancing the fake clock"""
+        clock = FakeClock(start=1735689600, step=0.5)
+
+        assert clock.timestamp() == (1_735_689_600_000_000, "2025-01-01T00:00:00")
+        assert clock.timestamp()[1] == "2025-01-01T00:00:00.500000"
+        clock.advance(3600)
+        assert clock.timestamp()[1] == "2025-01-01T01:00:01"
+
+
+class TestTodoManagerTimestamps:
+    """Test cases for timestamps on todos"""
+
+    def test_created_and_updated_match_on_create(self):
+        """Test that a new todo reads the clock once"""
+        manager = TodoManager(clock=FakeClock(step=1))
+        todo = manager.create_todo("Title")
+
+        assert todo["created_at"] == todo["updated_at"] == "2025-01-01T00:00:00"
+
+    def test_update_keeps_created_timestamp(self):
+        """Test that updating only moves updated_at"""
+        clock = FakeClock()
+        manager = TodoManager(clock=clock)
+        todo = manager.create_todo("Title")
+        clock.advance(90)
+
+        manager.update_todo(todo["id"], completed=True)
+
+        assert todo["created_at"] == "2025-01-01T00:00:00"
+        assert todo["updated_at"] == "2025-01-01T00:01:30"
+
+    def test_create_todos_shares_one_timestamp(self):
+        """Test that a batch reads the clock once"""
+        manager = TodoManager(clock=FakeClock(step=1))
+        todos = manager.create_todos([{"title": "A"}, {"title": " B ", "description": "b"}])
+
+        assert [todo["id"] for todo in todos] == [1, 2]
+        assert todos[1]["title"] == "B"
+        assert {todo["created_at"] for todo in todos} == {"2025-01-01T00:00:00"}
+
+    def test_create_todos_validates_before_creating(self):
+        """Test that an invalid item creates nothing"""
+        manager = TodoManager()
+
+        with pytest.raises(ValueError, match="Title cannot be empty"):
+            manager.create_todos([{"title": "A"}, {"title": "  "}])
+        assert manager.todos == {}
@@ -0,0 +1,118 @@
+"""
+Tests for response compression
+"""
+
+import gzip
+import json
+import zlib
+from flask import Flask, jsonify
+from compression import CompressedBodyCache, compress, init_compression, negotiate
+
+
+class TestNegotiate:
+    """Test cases for Accept-Encoding negotiation"""
+
+    def test_no_header(self):
+        """Test that no header means no compression"""
+        assert negotiate(None) is None
+        assert negotiate("") is None
+        assert negotiate("identity") is None
+
+    def test_single_encoding(self):
+        """Test picking the only accepted encoding"""
+        assert negotiate("gzip") == "gzip"
+        assert negotiate("deflate") == "deflate"
+
+    def test_quality_values(self):
+        """Test that q-values decide between encodings"""
+        assert negotiate("gzip;q=0.5, deflate;q=0.9", ["gzip", "deflate"]) == "deflate"
+        assert negotiate("gzip;q=0, deflate", ["gzip", "deflate"]) == "deflate"
+
+    def test_server_preference_breaks_ties(self):
+        """Test that equal weights use the server preference"""
+        assert negotiate("deflate, gzip", ["gzip", "deflate"]) == "gzip"
+        assert negotiate("*", ["gzip", "deflate"]) == "gzip"
+        assert negotiate("br, gzip", ["gzip", "deflate"]) == "gzip"
+
+    def test_round_trip(self):
+        """Test that compressed bodies decompress to the original"""
+        data = b'{"data": []}' * 100
+        assert gzip.decompress(compress(data, "gzip")) == data
+        assert zlib.decompress(compress(data, "deflate", level=1)) == data
+
+
+class TestCompressionMiddleware:
+    """Test cases for the Flask hooks"""
+
+    def setup_method(self):
+        """Build a small app whose listing depends on a version counter"""
+        self.version = 0
+        self.renders = 0
+        app = Flask(__name__)
+        app.config['TESTING'] = True
+
+        @app.route('/api/todos')
+        def get_todos():
+            self.renders += 1
+            return jsonify({"data": ["item %d" % i for i in range(200)],
+                            "version": self.version}), 200
+
+        @app.route('/small')
+        def small():
+            return jsonify({"ok": True}), 200
+
+        self.cache = init_compression(app, min_size=100,
+                                      version_getter=lambda: self.version,
+                                      cacheable_endpoints={'get_todos'},
+                                      cache=CompressedBodyCache())
+        self.client = app.test_client()
+
+    def get(self, path, encoding="gzip"):
+        """GET a path with an Accept-Encoding header"""
+        return self.client.get(path, headers={'Accept-Encoding': encoding})
+
+    def test_large_response_is_compressed(self):
+        """Test that large bodies are compressed"""
+        response = self.get('/api/todos')
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        data = json.loads(gzip.decompress(response.data))
+        assert len(data["data"]) == 200
+
+    def test_small_response_is_not_compressed(self):
+        """Test that bodies under the threshold are sent as-is"""
+        response = self.get('/small')
+
+        assert 'Content-Encoding' not in response.headers
+        assert json.loads(response.data) == {"ok": True}
+
+    def test_uncompressed_without_accept_encoding(self):
+        """Test that clients without Accept-Encoding get plain JSON"""
+        response = self.client.get('/api/todos')
+
+        assert 'Content-Encoding' not in response.headers
+        assert len(json.loads(response.data)["data"]) == 200
+
+    def test_cached_until_version_changes(self):
+        """Test that repeated polls reuse the compressed body"""
+        first = self.get('/api/todos')
+        second = self.get('/api/todos')
+
+        assert self.renders == 1
+        assert second.data == first.data
+        assert second.headers['Content-Encoding'] == 'gzip'
+
+        self.version += 1
+        third = self.get('/api/todos')
+        assert self.renders == 2
+        assert json.loads(gzip.decompress(third.data))["version"] == 1
+
+    def test_cache_is_per_encoding(self):
+        """Test that each encoding has its own cached body"""
+        self.get('/api/todos', 'gzip')
+        response = self.get('/api/todos', 'deflate')
+
+        assert self.renders == 2
+        assert response.headers['Content-Encoding'] == 'deflate'
+        assert len(json.loads(zlib.decompress(response.data))["data"]) == 200
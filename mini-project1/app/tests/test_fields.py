@@ -0,0 +1,63 @@
+"""
+Integration tests for sparse fieldsets and columnar listings
+"""
+
+import pytest
+import json
+import main
+from business_logic import TodoManager
+
+
+@pytest.fixture
+def client():
+    """Create a test client backed by a fresh TodoManager"""
+    manager = TodoManager()
+    manager.create_todo("Todo 1", "First")
+    manager.create_todo("Todo 2", "Second")
+    app = main.create_app(todo_manager=manager)
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestSparseFieldsets:
+    """Test cases for GET /api/todos?fields= and ?format="""
+
+    def test_fields(self, client):
+        """Test that only requested fields are returned"""
+        response = client.get('/api/todos?fields=id,title')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["count"] == 2
+        assert data["data"] == [{"id": 1, "title": "Todo 1"}, {"id": 2, "title": "Todo 2"}]
+
+    def test_unknown_field(self, client):
+        """Test that unknown fields return 400"""
+        response = client.get('/api/todos?fields=id,password')
+
+        assert response.status_code == 400
+        assert json.loads(response.data)["success"] is False
+
+    def test_columnar(self, client):
+        """Test the columnar format"""
+        response = client.get('/api/todos?fields=id,completed&format=columnar')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["count"] == 2
+        assert data["fields"] == ["id", "completed"]
+        assert data["data"] == {"id": [1, 2], "completed": [False, False]}
+
+    def test_columnar_all_fields(self, client):
+        """Test the columnar format without a field list"""
+        data = json.loads(client.get('/api/todos?format=columnar').data)
+
+        assert data["data"]["description"] == ["First", "Second"]
+        assert len(data["fields"]) == 6
+
+    def test_invalid_format(self, client):
+        """Test that an unknown format returns 400"""
+        response = client.get('/api/todos?format=xml')
+
+        assert response.status_code == 400
@@ -0,0 +1,221 @@
+"""
+Tests for Idempotency-Key handling
+"""
+
+import pytest
+import json
+import threading
+import time
+import main
+from main import app
+from idempotency import IdempotencyCache, IdempotencyKeyConflict
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the Flask app"""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestIdempotencyCache:
+    """Test cases for IdempotencyCache"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test"""
+        self.clock = FakeClock()
+        self.cache = IdempotencyCache(max_entries=3, ttl=60, clock=self.clock)
+        self.calls = 0
+
+    def handler(self, status=201):
+        """Return a handler that counts its calls"""
+        def run():
+            self.calls += 1
+            return status, f"response {self.calls}".encode()
+        return run
+
+    def test_replays_stored_response(self):
+        """Test that a repeated key returns the first response"""
+        first = self.cache.execute("k", b"body", self.handler())
+        second = self.cache.execute("k", b"body", self.handler())
+
+        assert first == (201, b"response 1", False)
+        assert second == (201, b"response 1", True)
+        assert self.calls == 1
+
+    def test_conflicting_body(self):
+        """Test that reusing a key with another body raises"""
+        self.cache.execute("k", b"body", self.handler())
+
+        with pytest.raises(IdempotencyKeyConflict):
+            self.cache.execute("k", b"other", self.handler())
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL"""
+        self.cache.execute("k", b"body", self.handler())
+        self.clock.now = 61
+        result = self.cache.execute("k", b"body", self.handler())
+
+        assert result == (201, b"response 2", False)
+
+    def test_bounded_size(self):
+        """Test that the oldest keys are evicted beyond max_entries"""
+        for key in ["a", "b", "c", "d"]:
+            self.cache.execute(key, b"", self.handler())
+
+        assert len(self.cache) == 3
+        assert self.cache.get("a") is None
+        assert self.cache.get("d") == (201, b"response 4")
+
+    def test_server_errors_are_not_stored(self):
+        """Test that 5xx responses can be retried"""
+        self.cache.execute("k", b"body", self.handler(status=500))
+        result = self.cache.execute("k", b"body", self.handler())
+
+        assert result == (201, b"response 2", False)
+
+    def test_exceptions_are_not_stored(self):
+        """Test that a failing handler frees the key"""
+        def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            self.cache.execute("k", b"body", failing)
+        assert self.cache.execute("k", b"body", self.handler())[2] is False
+
+    def test_keys_are_scoped_per_client(self):
+        """Test that two clients using the same key do not share responses"""
+        first = self.cache.execute("k", b"body", self.handler(), client="alice")
+        second = self.cache.execute("k", b"other", self.handler(), client="bob")
+
+        assert first == (201, b"response 1", False)
+        assert second == (201, b"response 2", False)
+        assert self.cache.get("k", client="alice") == (201, b"response 1")
+        assert self.cache.get("k") is None
+
+    def test_waiting_duplicate_times_out(self):
+        """Test that a duplicate gives up if the original request never finishes"""
+        cache = IdempotencyCache(wait_timeout=0.01)
+        release = threading.Event()
+
+        def stuck_handler():
+            release.wait()
+            return 201, b"created"
+
+        thread = threading.Thread(target=cache.execute, args=("k", b"body", stuck_handler))
+        thread.start()
+        try:
+            while len(cache) == 0:
+                time.sleep(0.001)
+            with pytest.raises(TimeoutError):
+                cache.execute("k", b"body", stuck_handler)
+        finally:
+            release.set()
+            thread.join()
+
+    def test_concurrent_duplicates_run_once(self):
+        """Test that concurrent requests with one key collapse into one call"""
+        cache = IdempotencyCache()
+        started = threading.Event()
+        calls = []
+
+        def slow_handler():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return 201, b"created"
+
+        results = []
+
+        def worker():
+            results.append(cache.execute("k", b"body", slow_handler))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(replayed for _, _, replayed in results) == [False] + [True] * 7
+        assert all(body == b"created" for _, body, _ in results)
+
+
+class TestIdempotentCreate:
+    """Test cases for POST /api/todos with Idempotency-Key"""
+
+    def post(self, client, payload, key):
+        """POST a todo with an Idempotency-Key header"""
+        return client.post('/api/todos',
+                           data=json.dumps(payload),
+                           content_type='application/json',
+                           headers={'Idempotency-Key': key})
+
+    def test_retry_does_not_create_duplicate(self, client):
+        """Test that retries with the same key create one todo"""
+        before = len(main.todo_manager.todos)
+        first = self.post(client, {"title": "Pay rent"}, "retry-1")
+        second = self.post(client, {"title": "Pay rent"}, "retry-1")
+
+        assert first.status_code == 201
+        assert second.status_code == 201
+        assert second.data == first.data
+        assert second.headers['Idempotent-Replayed'] == 'true'
+        assert len(main.todo_manager.todos) == before + 1
+
+    def test_different_keys_create_separate_todos(self, client):
+        """Test that different keys are independent"""
+        first = json.loads(self.post(client, {"title": "A"}, "key-a").data)
+        second = json.loads(self.post(client, {"title": "A"}, "key-b").data)
+
+        assert first["data"]["id"] != second["data"]["id"]
+
+    def test_key_reused_with_other_body(self, client):
+        """Test that a reused key with a new body returns 422"""
+        self.post(client, {"title": "A"}, "reused")
+        response = self.post(client, {"title": "B"}, "reused")
+
+        assert response.status_code == 422
+        assert json.loads(response.data)["success"] is False
+
+    def test_invalid_key(self, client):
+        """Test that an overlong key returns 400"""
+        response = self.post(client, {"title": "A"}, "x" * 300)
+
+        assert response.status_code == 400
+
+    def test_same_key_from_other_client(self, client):
+        """Test that another client's key does not replay someone else's todo"""
+        first = client.post('/api/todos', json={"title": "A"},
+                            headers={'Idempotency-Key': 'shared', 'X-API-Key': 'alice'})
+        second = client.post('/api/todos', json={"title": "B"},
+                             headers={'Idempotency-Key': 'shared', 'X-API-Key': 'bob'})
+
+        assert first.status_code == 201
+        assert second.status_code == 201
+        assert 'Idempotent-Replayed' not in second.headers
+        assert json.loads(second.data)["data"]["title"] == "B"
+
+    def test_original_still_running(self, client, monkeypatch):
+        """Test that a duplicate that times out waiting gets 409 with Retry-After"""
+        def timed_out(*args, **kwargs):
+            raise TimeoutError("Timed out waiting for the original request")
+
+        monkeypatch.setattr(app.extensions['todo_api'].idempotency_cache,
+                            'execute', timed_out)
+        response = self.post(client, {"title": "A"}, "slow")
+
+        assert response.status_code == 409
+        assert response.headers['Retry-After'] == '1'
+        assert json.loads(response.data)["success"] is False
@@ -0,0 +1,93 @@
+"""
+Tests for the launcher's tuning logic
+"""
+
+import json
+from launcher import (candidate_settings, choose_best, gunicorn_command, load_tuning,
+                      main, percentile)
+
+
+class TestLauncher:
+    """Test cases for the calibration helpers and serve"""
+
+    def test_candidate_settings_keep_one_worker(self):
+        """Test that the default sweep never tries several workers"""
+        candidates = candidate_settings(2, ['sync', 'gthread'])
+
+        assert all(c["workers"] == 1 for c in candidates)
+        assert {"workers": 1, "threads": 8, "worker_class": "gthread"} in candidates
+        assert len(candidates) == 1 + 3
+
+    def test_candidate_settings_read_only(self):
+        """Test the combinations tried for a machine serving read-only"""
+        candidates = candidate_settings(2, ['sync', 'gthread'], read_only=True)
+
+        assert {"workers": 5, "threads": 1, "worker_class": "sync"} in candidates
+        assert {"workers": 2, "threads": 8, "worker_class": "gthread"} in candidates
+        assert all(c["threads"] == 1 for c in candidates if c["worker_class"] == "sync")
+        assert len(candidates) == 3 + 3 * 3
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = list(range(1, 101))
+
+        assert percentile(values, 0.99) == 99
+        assert percentile(values, 0.50) == 50
+        assert percentile([7], 0.99) == 7
+        assert percentile([], 0.99) == 0.0
+
+    def test_choose_best_within_budget(self):
+        """Test that the fastest setting within the p99 budget wins"""
+        results = [
+            {"workers": 1, "throughput_rps": 900, "p99_ms": 20},
+            {"workers": 2, "throughput_rps": 1500, "p99_ms": 80},
+            {"workers": 3, "throughput_rps": 1800, "p99_ms": 250},
+            {"workers": 4, "throughput_rps": 2000, "p99_ms": 30, "error_rate": 0.2},
+        ]
+
+        assert choose_best(results, max_p99_ms=100)["workers"] == 2
+
+    def test_choose_best_over_budget(self):
+        """Test that the lowest p99 wins when nothing meets the budget"""
+        results = [
+            {"workers": 1, "throughput_rps": 900, "p99_ms": 300},
+            {"workers": 2, "throughput_rps": 1500, "p99_ms": 200},
+        ]
+
+        assert choose_best(results, max_p99_ms=100)["workers"] == 2
+
+    def test_gunicorn_command(self):
+        """Test that tuned settings become gunicorn flags"""
+        command = gunicorn_command({"workers": 3, "threads": 4, "worker_class": "gthread"},
+                                   bind="127.0.0.1:8000")
+
+        assert command[1:3] == ['-m', 'gunicorn']
+        assert command[command.index('--workers') + 1] == '3'
+        assert command[command.index('--worker-class') + 1] == 'gthread'
+        assert command[-2:] == ['--bind', '127.0.0.1:8000']
+        assert '--workers' not in gunicorn_command(None)
+
+    def test_serve_dry_run(self, tmp_path, capsys):
+        """Test that serve uses the tuning file"""
+        tuning = tmp_path / "tuning.json"
+        tuning.write_text(json.dumps({"workers": 1, "threads": 2, "worker_class": "gthread",
+                                      "throughput_rps": 1000, "results": []}))
+
+        assert load_tuning(str(tmp_path / "missing.json")) is None
+        assert main(["serve", "--tuning", str(tuning), "--dry-run"]) == 0
+        assert "--workers 1 --threads 2 --worker-class gthread" in capsys.readouterr().out
+
+    def test_serve_needs_read_only_tuning_for_several_workers(self, tmp_path, capsys):
+        """Test that only a read-only tuning file starts more than one worker"""
+        tuning = tmp_path / "tuning.json"
+        settings = {"workers": 5, "threads": 2, "worker_class": "gthread"}
+        tuning.write_text(json.dumps(settings))
+
+        assert main(["serve", "--tuning", str(tuning), "--dry-run"]) == 0
+        output = capsys.readouterr()
+        assert "--workers 1 " in output.out
+        assert "read-only" in output.err
+
+        tuning.write_text(json.dumps(dict(settings, read_only=True)))
+        assert main(["serve", "--tuning", str(tuning), "--dry-run"]) == 0
+        assert "--workers 5 " in capsys.readouterr().out
@@ -223,3 +223,78 @@ class TestTodoManager:
         assert counts["total"] == 4
         assert counts["completed"] == 2
         assert counts["pending"] == 2
+
+    def test_count_todos_tracks_changes(self):
+        """Test that counts follow reopening, repeated updates and deletes"""
+        todo1 = self.manager.create_todo("Todo 1")
+        todo2 = self.manager.create_todo("Todo 2")
+
+        self.manager.update_todo(todo1["id"], completed=True)
+        self.manager.update_todo(todo1["id"], completed=True)
+        self.manager.update_todo(todo2["id"], completed=True)
+        self.manager.update_todo(todo2["id"], completed=False)
+        assert self.manager.count_todos()["completed"] == 1
+
+        self.manager.delete_todo(todo1["id"])
+        assert self.manager.count_todos() == {"total": 1, "completed": 0, "pending": 1}
+
+    def test_version_changes_on_mutation(self):
+        """Test that every change increments the store version"""
+        assert self.manager.version == 0
+        todo = self.manager.create_todo("Todo")
+        assert self.manager.version == 1
+        self.manager.update_todo(todo["id"], completed=True)
+        assert self.manager.version == 2
+        self.manager.get_all_todos()
+        self.manager.delete_todo(todo["id"])
+        assert self.manager.version == 3
+        self.manager.delete_todo(todo["id"])
+        assert self.manager.version == 3
+    
+    def test_get_all_todos_with_fields(self):
+        """Test projecting todos to selected fields"""
+        self.manager.create_todo("Todo 1", "Desc 1")
+        self.manager.create_todo("Todo 2")
+        
+        todos = self.manager.get_all_todos(fields=["id", "title"])
+        
+        assert todos == [{"id": 1, "title": "Todo 1"}, {"id": 2, "title": "Todo 2"}]
+    
+    def test_get_all_todos_projection_does_not_touch_stored_todos(self):
+        """Test that projected todos are copies"""
+        self.manager.create_todo("Todo")
+        
+        self.manager.get_all_todos(fields=["id"])[0]["id"] = 99
+        
+        assert self.manager.get_todo(1)["id"] == 1
+    
+    def test_get_all_todos_unknown_field_raises_error(self):
+        """Test that unknown fields raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown field"):
+            self.manager.get_all_todos(fields=["id", "secret"])
+        with pytest.raises(ValueError, match="At least one field"):
+            self.manager.get_all_todos(fields=[])
+    
+    def test_get_todo_columns(self):
+        """Test getting todos as columns"""
+        self.manager.create_todo("Todo 1")
+        todo2 = self.manager.create_todo("Todo 2")
+        self.manager.update_todo(todo2["id"], completed=True)
+        
+        columns = self.manager.get_todo_columns(["id", "completed"])
+        
+        assert columns == {"id": [1, 2], "completed": [False, True]}
+        assert list(self.manager.get_todo_columns()) == [
+            "id", "title", "description", "completed", "created_at", "updated_at"
+        ]
+    
+    def test_listeners_are_notified(self):
+        """Test that listeners receive every change"""
+        events = []
+        self.manager.add_listener(lambda event, todo: events.append((event, todo["id"])))
+        
+        todo = self.manager.create_todo("Todo")
+        self.manager.update_todo(todo["id"], completed=True)
+        self.manager.delete_todo(todo["id"])
+        
+        assert events == [("created", 1), ("updated", 1), ("deleted", 1)]
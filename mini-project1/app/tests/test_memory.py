@@ -0,0 +1,167 @@
+"""
+Tests for TodoManager memory accounting and limits
+"""
+
+import pytest
+import json
+import main
+from business_logic import MemoryLimitError, TodoManager, estimate_todo_size
+from tenancy import TenantRegistry, init_tenancy
+from flask import Flask
+
+KB = 1024
+
+
+class TestMemoryAccounting:
+    """Test cases for the running memory estimate"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test"""
+        self.manager = TodoManager()
+
+    def test_create_update_delete_are_tracked(self):
+        """Test that the estimate follows every change"""
+        todo = self.manager.create_todo("Title", "x" * 1000)
+        after_create = self.manager.memory_bytes
+        assert after_create == estimate_todo_size("Title", "x" * 1000, todo["updated_at"])
+
+        self.manager.update_todo(todo["id"], description="x" * 11000)
+        assert self.manager.memory_bytes == after_create + 10000
+
+        self.manager.update_todo(todo["id"], completed=True)
+        assert self.manager.memory_bytes == after_create + 10000
+
+        self.manager.delete_todo(todo["id"])
+        assert self.manager.memory_bytes == 0
+
+    def test_estimate_matches_recount(self):
+        """Test that incremental totals equal a full recount"""
+        for i in range(50):
+            self.manager.create_todo(f"Todo {i}", "d" * i)
+        for i in range(1, 51, 3):
+            self.manager.update_todo(i, title="Renamed", description="")
+        for i in range(2, 51, 5):
+            self.manager.delete_todo(i)
+
+        recount = sum(estimate_todo_size(t["title"], t["description"], t["updated_at"])
+                      for t in self.manager.todos.values())
+        assert self.manager.memory_bytes == recount
+
+    def test_snapshot_import_recounts(self, tmp_path):
+        """Test that loading a snapshot sets the estimate"""
+        self.manager.create_todo("A", "a" * 500)
+        self.manager.export_snapshot(str(tmp_path / "todos.snap"))
+
+        restored = TodoManager()
+        restored.import_snapshot(str(tmp_path / "todos.snap"))
+
+        assert restored.memory_bytes == self.manager.memory_bytes
+
+    def test_memory_stats(self):
+        """Test the stats summary"""
+        manager = TodoManager(soft_limit_bytes=10 * KB, hard_limit_bytes=100 * KB)
+        manager.create_todo("A", "a" * 20 * KB)
+
+        stats = manager.memory_stats()
+
+        assert stats["todos"] == 1
+        assert stats["bytes"] == stats["average_todo_bytes"] > 20 * KB
+        assert stats["over_soft_limit"] is True
+        assert stats["over_hard_limit"] is False
+
+
+class TestMemoryLimits:
+    """Test cases for soft and hard limits"""
+
+    def test_soft_limit_rejects_only_large_todos(self):
+        """Test that past the soft limit only large todos are refused"""
+        manager = TodoManager(soft_limit_bytes=20 * KB, large_todo_bytes=4 * KB)
+        manager.create_todo("Big", "x" * 16 * KB)
+
+        with pytest.raises(MemoryLimitError) as error:
+            manager.create_todo("Too big", "x" * 8 * KB)
+        assert error.value.status == 413
+
+        manager.create_todo("Small", "fine")
+        manager.create_todo("Small", "still fine")
+
+    def test_hard_limit_refuses_all_writes(self):
+        """Test that nothing passes the hard limit"""
+        manager = TodoManager(hard_limit_bytes=8 * KB)
+        todo = manager.create_todo("A", "x" * 6 * KB)
+
+        with pytest.raises(MemoryLimitError) as error:
+            manager.create_todo("B", "x" * 2 * KB)
+        assert error.value.status == 507
+        with pytest.raises(MemoryLimitError):
+            manager.update_todo(todo["id"], description="x" * 9 * KB)
+
+        assert len(manager.todos) == 1
+        assert todo["description"] == "x" * 6 * KB
+
+    def test_shrinking_is_always_allowed(self):
+        """Test that updates that free memory pass even over the limit"""
+        manager = TodoManager(hard_limit_bytes=8 * KB)
+        todo = manager.create_todo("A", "x" * 6 * KB)
+        manager.hard_limit_bytes = 1 * KB
+
+        manager.update_todo(todo["id"], description="short", completed=True)
+
+        assert todo["completed"] is True
+        assert manager.memory_bytes < 1 * KB
+
+    def test_batch_is_all_or_nothing(self):
+        """Test that a batch over the limit creates nothing"""
+        manager = TodoManager(hard_limit_bytes=8 * KB)
+
+        with pytest.raises(MemoryLimitError):
+            manager.create_todos([{"title": "A", "description": "x" * 3 * KB}] * 3)
+        assert manager.todos == {}
+        assert manager.memory_bytes == 0
+
+
+class TestMemoryAPI:
+    """Test cases for limits and stats over HTTP"""
+
+    def test_stats_and_limit_responses(self):
+        """Test 413/507 responses and GET /api/todos/stats"""
+        manager = TodoManager(soft_limit_bytes=6 * KB, hard_limit_bytes=12 * KB,
+                              large_todo_bytes=2 * KB)
+        app = main.create_app(todo_manager=manager)
+        app.config['TESTING'] = True
+        client = app.test_client()
+
+        assert client.post('/api/todos', json={"title": "A", "description": "x" * 5000}
+                           ).status_code == 201
+        assert client.post('/api/todos', json={"title": "B", "description": "x" * 3000}
+                           ).status_code == 413
+        assert client.put('/api/todos/1', json={"description": "x" * 20000}
+                          ).status_code == 507
+
+        stats = json.loads(client.get('/api/todos/stats').data)["data"]
+        assert stats["counts"]["total"] == 1
+        assert stats["memory"]["bytes"] == manager.memory_bytes
+        assert stats["memory"]["hard_limit_bytes"] == 12 * KB
+
+    def test_oversized_bodies_are_refused_before_parsing(self, monkeypatch):
+        """Test that MAX_REQUEST_BYTES rejects large bodies with 413"""
+        monkeypatch.setenv('MAX_REQUEST_BYTES', '4096')
+        app = main.create_app(todo_manager=TodoManager())
+        client = app.test_client()
+        body = {"title": "A", "description": "x" * 5000}
+
+        for path in ('/api/todos', '/api/acme/todos', '/api/calc'):
+            response = client.post(path, json=body)
+            assert response.status_code == 413
+            assert json.loads(response.data)["success"] is False
+        assert client.post('/api/todos', json={"title": "A"}).status_code == 201
+
+    def test_tenant_limits(self):
+        """Test that tenant managers get the configured limits"""
+        app = Flask(__name__)
+        init_tenancy(app, TenantRegistry(manager_options={"hard_limit_bytes": 2 * KB}))
+        client = app.test_client()
+
+        response = client.post('/api/acme/todos', json={"title": "A", "description": "x" * 4000})
+
+        assert response.status_code == 507
@@ -0,0 +1,175 @@
+"""
+Tests for request profiling and the sampling profiler
+"""
+
+import json
+import marshal
+import threading
+from flask import Flask, jsonify
+from profiling import SamplingProfiler, format_stats, init_profiling
+
+TOKEN = "secret-token"
+
+
+def busy_view_work():
+    """Some work for the profile to find"""
+    return sum(i * i for i in range(1000))
+
+
+def make_app(sampler=None):
+    """Build a small app with profiling installed"""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+
+    @app.route('/api/todos')
+    def todos():
+        return jsonify({"success": True, "total": busy_view_work()}), 200
+
+    init_profiling(app, TOKEN, sampler, max_profiles=2)
+    return app
+
+
+class TestRequestProfiling:
+    """Test cases for per-request cProfile"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test"""
+        self.app = make_app()
+        self.client = self.app.test_client()
+
+    def test_requests_are_not_profiled_by_default(self):
+        """Test that normal requests pass through untouched"""
+        response = self.client.get('/api/todos')
+
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response.headers
+
+    def test_profile_requires_token(self):
+        """Test that the profile flag without the token is ignored"""
+        response = self.client.get('/api/todos?profile=1',
+                                   headers={'X-Admin-Token': 'wrong'})
+
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response.headers
+
+    def test_profiled_request(self):
+        """Test profiling a request and reading the report"""
+        response = self.client.get('/api/todos', headers={
+            'X-Profile': '1', 'X-Admin-Token': TOKEN
+        })
+        profile_id = response.headers['X-Profile-Id']
+
+        assert json.loads(response.data)["total"] == busy_view_work()
+
+        listing = json.loads(self.client.get(
+            '/admin/profile/requests', headers={'X-Admin-Token': TOKEN}
+        ).data)
+        assert listing["data"][0]["id"] == profile_id
+        assert listing["data"][0]["path"] == '/api/todos'
+
+        report = self.client.get(f'/admin/profile/requests/{profile_id}?sort=tottime&limit=500',
+                                 headers={'X-Admin-Token': TOKEN})
+        assert report.status_code == 200
+        assert b'busy_view_work' in report.data
+
+    def test_raw_stats_download(self):
+        """Test downloading a profile in pstats format"""
+        response = self.client.get('/api/todos?profile=1',
+                                   headers={'X-Admin-Token': TOKEN})
+        raw = self.client.get(
+            f"/admin/profile/requests/{response.headers['X-Profile-Id']}?format=pstats",
+            headers={'X-Admin-Token': TOKEN}
+        )
+
+        stats = marshal.loads(raw.data)
+        assert any(key[2] == 'busy_view_work' for key in stats)
+        assert 'busy_view_work' in format_stats(stats)
+
+    def test_only_recent_profiles_are_kept(self):
+        """Test that old profiles are dropped"""
+        ids = [self.client.get('/api/todos?profile=1', headers={'X-Admin-Token': TOKEN})
+               .headers['X-Profile-Id'] for _ in range(3)]
+
+        response = self.client.get(f'/admin/profile/requests/{ids[0]}',
+                                   headers={'X-Admin-Token': TOKEN})
+
+        assert response.status_code == 404
+
+    def test_admin_endpoints_require_token(self):
+        """Test that the admin endpoints reject missing tokens"""
+        assert self.client.get('/admin/profile/requests').status_code == 403
+        assert self.client.get('/admin/profile/samples',
+                               headers={'X-Admin-Token': 'wrong'}).status_code == 403
+
+    def test_samples_without_sampler(self):
+        """Test the samples endpoint when no sampler is running"""
+        response = self.client.get('/admin/profile/samples',
+                                   headers={'X-Admin-Token': TOKEN})
+
+        assert response.status_code == 404
+
+
+class TestSamplingProfiler:
+    """Test cases for SamplingProfiler"""
+
+    def run_in_thread(self, sampler, times):
+        """Sample (at the given times) while another thread is waiting"""
+        started, release = threading.Event(), threading.Event()
+
+        def waiting_worker():
+            started.set()
+            release.wait()
+
+        worker = threading.Thread(target=waiting_worker, name="worker")
+        worker.start()
+        started.wait()
+        try:
+            for now in times:
+                sampler.sample(now)
+        finally:
+            release.set()
+            worker.join()
+
+    def test_collapsed_stacks(self):
+        """Test that other threads' stacks are counted root first"""
+        sampler = SamplingProfiler(clock=lambda: 1000.0)
+        self.run_in_thread(sampler, [1000.0, 1000.5])
+
+        lines = [line for line in sampler.collapsed().splitlines()
+                 if line.startswith("worker;")]
+
+        assert len(lines) == 1
+        stack, count = lines[0].rsplit(" ", 1)
+        assert count == "2"
+        assert "waiting_worker (test_profiling.py:" in stack
+        assert stack.index("run (threading.py") < stack.index("waiting_worker")
+
+    def test_window_and_recent_period(self):
+        """Test that old buckets are dropped and ?seconds= limits output"""
+        sampler = SamplingProfiler(window=10, clock=lambda: 1020.0)
+        self.run_in_thread(sampler, [1000.0, 1015.0, 1019.0, 1020.0])
+
+        def worker_count(text):
+            return sum(int(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+                       if line.startswith("worker;"))
+
+        assert worker_count(sampler.collapsed()) == 3
+        assert worker_count(sampler.collapsed(seconds=2)) == 2
+
+    def test_background_thread_and_endpoint(self):
+        """Test sampling in the background and reading it over HTTP"""
+        sampler = SamplingProfiler(interval=0.001)
+        sampler.start()
+        try:
+            while sampler.samples < 5:
+                threading.Event().wait(0.005)
+        finally:
+            sampler.stop()
+
+        client = make_app(sampler).test_client()
+        response = client.get('/admin/profile/samples?seconds=60',
+                              headers={'X-Admin-Token': TOKEN})
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        assert b'MainThread;' in response.data
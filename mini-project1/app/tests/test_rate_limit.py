@@ -0,0 +1,190 @@
+"""
+Tests for rate limiting and load shedding
+"""
+
+import pytest
+import json
+from flask import Flask, jsonify
+from rate_limit import LoadShedder, TokenBucketLimiter, init_rate_limiting, queue_time_ms
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_app(limiter=None, shedder=None, api_keys=None):
+    """Build a small app with rate limiting installed"""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+
+    @app.route('/api/todos')
+    def todos():
+        return jsonify({"success": True}), 200
+
+    @app.route('/api/<tenant>/todos')
+    def tenant_todos(tenant):
+        return jsonify({"success": True}), 200
+
+    @app.route('/health')
+    def health():
+        return jsonify({"status": "healthy"}), 200
+
+    init_rate_limiting(app, limiter, shedder, api_keys=api_keys)
+    return app
+
+
+class TestTokenBucketLimiter:
+    """Test cases for TokenBucketLimiter"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test"""
+        self.clock = FakeClock()
+        self.limiter = TokenBucketLimiter(rate=2, burst=3, idle_ttl=60,
+                                          max_clients=2, clock=self.clock)
+
+    def test_burst_then_limit(self):
+        """Test that a client gets its burst and then is limited"""
+        results = [self.limiter.allow("a")[0] for _ in range(4)]
+
+        assert results == [True, True, True, False]
+        assert self.limiter.allow("a")[1] == pytest.approx(0.5)
+
+    def test_refill(self):
+        """Test that tokens refill at the configured rate"""
+        for _ in range(3):
+            self.limiter.allow("a")
+        self.clock.now += 0.5
+
+        assert self.limiter.allow("a")[0] is True
+        assert self.limiter.allow("a")[0] is False
+
+    def test_clients_are_independent(self):
+        """Test that one client's usage does not affect another"""
+        for _ in range(3):
+            self.limiter.allow("a")
+
+        assert self.limiter.allow("a")[0] is False
+        assert self.limiter.allow("b")[0] is True
+
+    def test_idle_buckets_are_evicted(self):
+        """Test that idle buckets are dropped"""
+        self.limiter.allow("a")
+        self.clock.now += 61
+        self.limiter.allow("b")
+
+        assert len(self.limiter) == 1
+
+    def test_max_clients(self):
+        """Test that the least recently seen bucket is dropped when full"""
+        self.limiter.allow("a")
+        self.limiter.allow("b")
+        self.limiter.allow("a")
+        self.limiter.allow("c")
+
+        assert len(self.limiter) == 2
+        assert list(self.limiter._buckets) == ["a", "c"]
+
+    def test_invalid_settings(self):
+        """Test that invalid settings raise ValueError"""
+        with pytest.raises(ValueError):
+            TokenBucketLimiter(rate=0, burst=1)
+
+
+class TestLoadShedder:
+    """Test cases for LoadShedder"""
+
+    def test_in_flight_limit(self):
+        """Test that requests over max_in_flight are shed"""
+        shedder = LoadShedder(max_in_flight=2)
+
+        assert shedder.enter() is None
+        assert shedder.enter() is None
+        assert shedder.enter() is not None
+        shedder.leave()
+        assert shedder.enter() is None
+        assert shedder.shed == 1
+
+    def test_queue_latency_limit(self):
+        """Test that requests that queued too long are shed"""
+        shedder = LoadShedder(max_queue_ms=100)
+
+        assert shedder.enter(queue_ms=50) is None
+        assert shedder.enter(queue_ms=150) is not None
+        assert shedder.in_flight == 1
+
+    def test_queue_time_parsing(self):
+        """Test parsing X-Request-Start in several units"""
+        assert queue_time_ms("t=1000.0", now=1000.25) == pytest.approx(250)
+        assert queue_time_ms("1000000000000", now=1000000000.1) == pytest.approx(100)
+        assert queue_time_ms("1000000000000000", now=1000000000.1) == pytest.approx(100)
+        assert queue_time_ms(None) is None
+        assert queue_time_ms("garbage") is None
+
+
+class TestMiddleware:
+    """Test cases for the Flask hooks"""
+
+    def test_rate_limited_requests_get_429(self):
+        """Test that an over-limit client gets 429 with Retry-After"""
+        client = make_app(limiter=TokenBucketLimiter(rate=1, burst=2)).test_client()
+        statuses = [client.get('/api/todos').status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
+        response = client.get('/api/todos')
+        assert response.headers['Retry-After'] == '1'
+        assert json.loads(response.data)["success"] is False
+
+    def test_api_keys_are_limited_separately(self):
+        """Test that callers with different known API keys have separate buckets"""
+        client = make_app(limiter=TokenBucketLimiter(rate=1, burst=1),
+                          api_keys={'a', 'b'}).test_client()
+
+        assert client.get('/api/todos', headers={'X-API-Key': 'a'}).status_code == 200
+        assert client.get('/api/todos', headers={'X-API-Key': 'a'}).status_code == 429
+        assert client.get('/api/todos', headers={'X-API-Key': 'b'}).status_code == 200
+
+    def test_unknown_api_keys_share_the_address_bucket(self):
+        """Test that rotating unknown API keys does not get fresh buckets"""
+        client = make_app(limiter=TokenBucketLimiter(rate=1, burst=1),
+                          api_keys={'a'}).test_client()
+
+        assert client.get('/api/todos', headers={'X-API-Key': 'x1'}).status_code == 200
+        assert client.get('/api/todos', headers={'X-API-Key': 'x2'}).status_code == 429
+        assert client.get('/api/todos').status_code == 429
+        assert client.get('/api/todos', headers={'X-API-Key': 'a'}).status_code == 200
+
+    def test_other_paths_are_not_limited(self):
+        """Test that paths outside the prefix are not limited"""
+        client = make_app(limiter=TokenBucketLimiter(rate=1, burst=1)).test_client()
+
+        assert [client.get('/health').status_code for _ in range(3)] == [200, 200, 200]
+
+    def test_tenant_paths_are_limited(self):
+        """Test that tenant routes share the caller's bucket with /api/todos"""
+        client = make_app(limiter=TokenBucketLimiter(rate=1, burst=2)).test_client()
+
+        assert client.get('/api/acme/todos').status_code == 200
+        assert client.get('/api/todos').status_code == 200
+        assert client.get('/api/other/todos').status_code == 429
+
+    def test_shed_requests_get_503(self):
+        """Test that requests queued too long get 503"""
+        client = make_app(shedder=LoadShedder(max_queue_ms=100)).test_client()
+        response = client.get('/api/todos', headers={'X-Request-Start': 't=1.0'})
+
+        assert response.status_code == 503
+        assert client.get('/api/todos').status_code == 200
+
+    def test_in_flight_slot_is_released(self):
+        """Test that each finished request frees its slot"""
+        shedder = LoadShedder(max_in_flight=1)
+        client = make_app(shedder=shedder).test_client()
+
+        assert [client.get('/api/todos').status_code for _ in range(3)] == [200, 200, 200]
+        assert shedder.in_flight == 0
@@ -0,0 +1,126 @@
+"""
+Tests for TodoManager snapshots
+"""
+
+import pytest
+import json
+from business_logic import TodoManager
+from snapshot import SnapshotError, main, read_snapshot, write_snapshot
+
+
+@pytest.fixture
+def path(tmp_path):
+    """Path for a snapshot file"""
+    return str(tmp_path / "todos.snap")
+
+
+class TestSnapshot:
+    """Test cases for snapshot export and import"""
+
+    def test_round_trip(self, path):
+        """Test that a snapshot restores every field"""
+        manager = TodoManager()
+        manager.create_todo("First", "Ünïcödé description ✓")
+        second = manager.create_todo("Second")
+        manager.create_todo("Third")
+        manager.update_todo(second["id"], completed=True)
+        manager.delete_todo(3)
+
+        assert manager.export_snapshot(path) == 2
+
+        restored = TodoManager()
+        assert restored.import_snapshot(path) == 2
+        assert restored.get_all_todos() == manager.get_all_todos()
+        assert restored.get_todo(2)["completed"] is True
+        assert restored.next_id == 4
+
+    def test_lone_surrogate_round_trip(self, path):
+        """Test that a title with a lone surrogate (valid JSON) survives export"""
+        manager = TodoManager()
+        manager.create_todo("\ud800 odd", "desc \udfff")
+
+        manager.export_snapshot(path)
+        restored = TodoManager()
+        restored.import_snapshot(path)
+
+        assert restored.get_todo(1)["title"] == "\ud800 odd"
+        assert restored.get_todo(1)["description"] == "desc \udfff"
+
+    def test_new_ids_continue_after_import(self, path):
+        """Test that IDs are not reused after loading"""
+        manager = TodoManager()
+        manager.create_todo("A")
+        manager.create_todo("B")
+        manager.export_snapshot(path)
+
+        restored = TodoManager()
+        restored.import_snapshot(path)
+
+        assert restored.create_todo("C")["id"] == 3
+
+    def test_empty_snapshot(self, path):
+        """Test exporting and importing no todos"""
+        write_snapshot(path, [], 1)
+
+        assert read_snapshot(path) == ({}, 1)
+
+    def test_import_notifies_listeners(self, path):
+        """Test that listeners see imported todos"""
+        manager = TodoManager()
+        manager.create_todo("A")
+        manager.export_snapshot(path)
+
+        events = []
+        restored = TodoManager()
+        restored.add_listener(lambda event, todo: events.append((event, todo["id"])))
+        restored.import_snapshot(path)
+
+        assert events == [("created", 1)]
+
+    def test_invalid_file(self, path):
+        """Test that other files are rejected"""
+        with open(path, "wb") as f:
+            f.write(b"not a snapshot at all, just some bytes")
+
+        with pytest.raises(SnapshotError):
+            read_snapshot(path)
+
+    def test_truncated_file(self, path):
+        """Test that a truncated snapshot is rejected"""
+        manager = TodoManager()
+        manager.create_todo("Title", "Description")
+        manager.export_snapshot(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path, "wb") as f:
+            f.write(data[:-5])
+
+        with pytest.raises(SnapshotError):
+            read_snapshot(path)
+
+
+class TestSnapshotCommandLine:
+    """Test cases for the snapshot command line"""
+
+    def test_import_and_export_json(self, tmp_path, path, capsys):
+        """Test converting an API listing to a snapshot and back"""
+        listing = {"success": True, "count": 1, "data": [{
+            "id": 5, "title": "From API", "description": "", "completed": False,
+            "created_at": "2025-01-01T00:00:00", "updated_at": "2025-01-01T00:00:00"
+        }]}
+        json_path = tmp_path / "dump.json"
+        json_path.write_text(json.dumps(listing))
+
+        assert main(["import-json", str(json_path), path]) == 0
+        capsys.readouterr()
+        assert main(["export-json", path]) == 0
+
+        assert json.loads(capsys.readouterr().out) == listing["data"]
+        assert read_snapshot(path)[1] == 6
+
+    def test_generate_and_info(self, path, capsys):
+        """Test generating a synthetic snapshot"""
+        assert main(["generate", "30", path]) == 0
+        assert main(["info", path]) == 0
+
+        assert "30 todos (10 completed)" in capsys.readouterr().out
@@ -0,0 +1,208 @@
+"""
+Tests for multi-tenant todos
+"""
+
+import pytest
+import json
+import threading
+from flask import Flask
+from tenancy import (InvalidTenant, TenantLimitError, TenantRegistry, init_tenancy,
+                     validate_tenant)
+
+TOKEN = "admin-token"
+
+
+def make_client(registry):
+    """Build a small app serving the tenant routes"""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    init_tenancy(app, registry, admin_token=TOKEN)
+    return app.test_client()
+
+
+class TestTenantRegistry:
+    """Test cases for TenantRegistry"""
+
+    def test_tenants_have_separate_id_spaces(self):
+        """Test that each tenant numbers its own todos"""
+        registry = TenantRegistry()
+        with registry.tenant("acme") as manager:
+            manager.create_todo("A1")
+            manager.create_todo("A2")
+        with registry.tenant("globex") as manager:
+            todo = manager.create_todo("G1")
+
+        assert todo["id"] == 1
+        with registry.tenant("acme") as manager:
+            assert [t["title"] for t in manager.get_all_todos()] == ["A1", "A2"]
+
+    def test_invalid_names(self):
+        """Test that unsafe and reserved names are rejected"""
+        for name in ["", "../etc", "a b", "todos", "x" * 65]:
+            with pytest.raises(InvalidTenant):
+                validate_tenant(name)
+        assert validate_tenant("team-42_a") == "team-42_a"
+
+    def test_lru_eviction_and_lazy_reload(self, tmp_path):
+        """Test that idle tenants are saved, unloaded and loaded back"""
+        registry = TenantRegistry(data_dir=str(tmp_path), max_loaded=2)
+        for name in ["a", "b", "c"]:
+            with registry.tenant(name) as manager:
+                manager.create_todo(f"{name} todo")
+
+        assert len(registry) == 2
+        assert registry.evictions == 1
+        assert (tmp_path / "a.snap").exists()
+
+        with registry.tenant("a") as manager:
+            assert manager.get_todo(1)["title"] == "a todo"
+            assert manager.create_todo("next")["id"] == 2
+        assert registry.loads == 4
+
+    def test_shards_in_use_are_not_evicted(self, tmp_path):
+        """Test that a tenant held by a request stays loaded"""
+        registry = TenantRegistry(data_dir=str(tmp_path), max_loaded=1)
+        with registry.tenant("a") as held:
+            held.create_todo("Held")
+            with registry.tenant("b") as manager:
+                manager.create_todo("Other")
+            with registry.tenant("a") as again:
+                assert again is held
+
+    def test_failed_save_keeps_tenant_loaded(self, tmp_path):
+        """Test that a tenant that cannot be saved is skipped, not leaked in use"""
+        registry = TenantRegistry(data_dir=str(tmp_path), max_loaded=1)
+        with registry.tenant("a") as broken:
+            broken.create_todo("Unsaved")
+
+        def disk_full(path):
+            raise OSError("No space left on device")
+
+        broken.export_snapshot = disk_full
+        for name in ["b", "c"]:
+            with registry.tenant(name) as manager:
+                manager.create_todo("New")
+
+        with registry.tenant("a") as again:
+            assert again is broken
+        del broken.export_snapshot
+        assert registry.evict("a") is True
+        assert (tmp_path / "a.snap").exists()
+
+    def test_without_data_dir_only_unused_tenants_are_evicted(self):
+        """Test that tenants with todos are kept in memory without a data dir"""
+        registry = TenantRegistry(max_loaded=2)
+        with registry.tenant("a") as manager:
+            manager.create_todo("Keep me")
+        with registry.tenant("b"):
+            pass
+        with registry.tenant("c"):
+            pass
+
+        with registry.tenant("a") as manager:
+            assert manager.get_todo(1)["title"] == "Keep me"
+        assert len(registry) == 2
+        assert registry.evictions == 1
+
+    def test_without_data_dir_new_tenants_are_capped(self):
+        """Test that tenants with todos cannot grow past max_loaded in memory"""
+        registry = TenantRegistry(max_loaded=2)
+        for name in ("a", "b"):
+            with registry.tenant(name) as manager:
+                manager.create_todo("Todo")
+
+        with pytest.raises(TenantLimitError):
+            with registry.tenant("c"):
+                pass
+        assert len(registry) == 2
+
+        client = make_client(registry)
+        response = client.post('/api/d/todos', json={"title": "Todo"})
+        assert response.status_code == 507
+
+    def test_counts_across_loaded_saved_and_unseen_tenants(self, tmp_path):
+        """Test aggregating counts without loading every tenant"""
+        first = TenantRegistry(data_dir=str(tmp_path))
+        with first.tenant("old") as manager:
+            manager.create_todo("Old 1")
+            manager.update_todo(manager.create_todo("Old 2")["id"], completed=True)
+        first.flush()
+
+        registry = TenantRegistry(data_dir=str(tmp_path), max_loaded=1)
+        with registry.tenant("a") as manager:
+            manager.update_todo(manager.create_todo("A")["id"], completed=True)
+        with registry.tenant("b") as manager:
+            manager.create_todo("B")
+
+        counts = registry.counts(per_tenant=True)
+
+        assert counts["tenants"] == 3
+        assert counts["loaded"] == 1
+        assert (counts["total"], counts["completed"], counts["pending"]) == (4, 2, 2)
+        assert counts["by_tenant"]["old"] == {"total": 2, "completed": 1, "pending": 1}
+        assert registry.loads == 2
+
+    def test_concurrent_tenants(self):
+        """Test many threads creating todos in several tenants"""
+        registry = TenantRegistry()
+
+        def worker(name):
+            for _ in range(200):
+                with registry.tenant(name) as manager:
+                    manager.create_todo("Todo")
+
+        threads = [threading.Thread(target=worker, args=(f"t{i % 4}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for i in range(4):
+            with registry.tenant(f"t{i}") as manager:
+                assert sorted(manager.todos) == list(range(1, 401))
+
+
+class TestTenantRoutes:
+    """Test cases for /api/<tenant>/todos"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test"""
+        self.registry = TenantRegistry()
+        self.client = make_client(self.registry)
+
+    def test_crud(self):
+        """Test the full lifecycle of a tenant todo"""
+        response = self.client.post('/api/acme/todos', json={"title": "Ship it"})
+        assert response.status_code == 201
+        todo_id = json.loads(response.data)["data"]["id"]
+
+        response = self.client.put(f'/api/acme/todos/{todo_id}', json={"completed": True})
+        assert json.loads(response.data)["data"]["completed"] is True
+
+        listing = json.loads(self.client.get('/api/acme/todos').data)
+        assert listing["count"] == 1
+
+        assert self.client.get('/api/globex/todos/1').status_code == 404
+        assert self.client.delete(f'/api/acme/todos/{todo_id}').status_code == 200
+        assert self.client.get(f'/api/acme/todos/{todo_id}').status_code == 404
+
+    def test_validation_errors(self):
+        """Test bad bodies and bad tenant names"""
+        assert self.client.post('/api/acme/todos', json={}).status_code == 400
+        assert self.client.post('/api/acme/todos', json={"title": "   "}).status_code == 400
+        self.client.post('/api/acme/todos', json={"title": "A"})
+        assert self.client.put('/api/acme/todos/1', json={"completed": "yes"}).status_code == 400
+        assert self.client.get('/api/bad.name/todos').status_code == 400
+
+    def test_admin_counts(self):
+        """Test the cross-tenant counts endpoint"""
+        self.client.post('/api/acme/todos', json={"title": "A"})
+        self.client.post('/api/globex/todos', json={"title": "G"})
+
+        assert self.client.get('/admin/tenants').status_code == 403
+        response = self.client.get('/admin/tenants?per_tenant=true',
+                                   headers={'X-Admin-Token': TOKEN})
+        data = json.loads(response.data)["data"]
+
+        assert data["total"] == 2
+        assert data["by_tenant"]["acme"]["total"] == 1
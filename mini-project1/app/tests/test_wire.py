@@ -0,0 +1,108 @@
+"""
+Tests for MessagePack content negotiation on /api/todos
+"""
+
+import pytest
+import json
+import main
+from business_logic import TodoManager
+
+msgpack = pytest.importorskip("msgpack")
+
+MSGPACK = 'application/msgpack'
+
+
+@pytest.fixture
+def client():
+    """Create a test client backed by a fresh TodoManager"""
+    app = main.create_app(todo_manager=TodoManager())
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestMessagePack:
+    """Test cases for MessagePack request and response bodies"""
+
+    def test_create_with_msgpack_body(self, client):
+        """Test creating a todo from a MessagePack body"""
+        response = client.post('/api/todos',
+                               data=msgpack.packb({"title": "Binary", "description": "Body"}),
+                               content_type=MSGPACK)
+
+        assert response.status_code == 201
+        assert response.mimetype == 'application/json'
+        data = json.loads(response.data)
+        assert data["data"]["title"] == "Binary"
+
+    def test_msgpack_response(self, client):
+        """Test that Accept: application/msgpack returns MessagePack"""
+        client.post('/api/todos', data=json.dumps({"title": "One"}),
+                    content_type='application/json')
+        response = client.get('/api/todos', headers={'Accept': MSGPACK})
+
+        assert response.status_code == 200
+        assert response.mimetype == MSGPACK
+        data = msgpack.unpackb(response.data)
+        assert data["count"] == 1
+        assert data["data"][0]["title"] == "One"
+
+    def test_msgpack_round_trip(self, client):
+        """Test create, update and get entirely in MessagePack"""
+        headers = {'Accept': MSGPACK}
+        created = msgpack.unpackb(client.post(
+            '/api/todos', data=msgpack.packb({"title": "Todo"}),
+            content_type=MSGPACK, headers=headers).data)
+        todo_id = created["data"]["id"]
+
+        updated = client.put(f'/api/todos/{todo_id}',
+                             data=msgpack.packb({"completed": True}),
+                             content_type=MSGPACK, headers=headers)
+        assert msgpack.unpackb(updated.data)["data"]["completed"] is True
+
+        missing = client.get('/api/todos/999', headers=headers)
+        assert missing.status_code == 404
+        assert msgpack.unpackb(missing.data)["success"] is False
+
+    def test_json_is_default(self, client):
+        """Test that JSON is returned for */* and missing Accept headers"""
+        assert client.get('/api/todos').mimetype == 'application/json'
+        assert client.get('/api/todos', headers={'Accept': '*/*'}).mimetype == 'application/json'
+
+    def test_invalid_msgpack_body(self, client):
+        """Test that an undecodable body returns 400"""
+        response = client.post('/api/todos', data=b'\xc1\xc1',
+                               content_type=MSGPACK)
+
+        assert response.status_code == 400
+
+    def test_wrong_field_types_are_rejected(self, client):
+        """Test that non-JSON or mistyped fields get 400 and are never stored"""
+        bodies = [
+            {"title": b"bytes title"},
+            {"title": "Todo", "description": 42},
+            ["not", "an", "object"],
+        ]
+        for body in bodies:
+            response = client.post('/api/todos', data=msgpack.packb(body, use_bin_type=True),
+                                   content_type=MSGPACK)
+            assert response.status_code == 400
+
+        created = client.post('/api/todos', data=msgpack.packb({"title": "Todo"}),
+                              content_type=MSGPACK)
+        updated = client.put('/api/todos/1', data=msgpack.packb({"completed": "yes"}),
+                             content_type=MSGPACK)
+
+        assert created.status_code == 201
+        assert updated.status_code == 400
+        assert json.loads(client.get('/api/todos').data)["count"] == 1
+
+    def test_idempotent_replay_keeps_format(self, client):
+        """Test that a replayed response keeps its content type"""
+        headers = {'Accept': MSGPACK, 'Idempotency-Key': 'wire-1'}
+        body = msgpack.packb({"title": "Once"})
+        first = client.post('/api/todos', data=body, content_type=MSGPACK, headers=headers)
+        second = client.post('/api/todos', data=body, content_type=MSGPACK, headers=headers)
+
+        assert second.mimetype == MSGPACK
+        assert second.data == first.data
@@ -0,0 +1,156 @@
+"""
+Wire Formats for the Todo API
+Negotiates JSON or MessagePack for request bodies and responses
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from flask import Response, jsonify, request
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+# Content types accepted for MessagePack request bodies
+MSGPACK_MIMETYPES = frozenset({
+    'application/msgpack',
+    'application/x-msgpack',
+    'application/vnd.msgpack',
+})
+
+
+# Todo field -> type accepted in request bodies
+TODO_FIELD_TYPES = {'title': str, 'description': str, 'completed': bool}
+
+
+class UnsupportedWireFormat(Exception):
+    """Raised when a MessagePack body is sent but msgpack is not installed"""
+
+
+class InvalidPayload(ValueError):
+    """Raised when a decoded body is not a todo object with valid field types"""
+
+
+def encode(payload: Any, mimetype: str) -> bytes:
+    """
+    Serialize a payload
+
+    Args:
+        payload: JSON-compatible data
+        mimetype: JSON_MIMETYPE or MSGPACK_MIMETYPE
+
+    Returns:
+        Serialized bytes
+    """
+    if mimetype == MSGPACK_MIMETYPE:
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def decode(data: bytes, mimetype: str) -> Any:
+    """
+    Deserialize a body
+
+    Args:
+        data: Raw bytes
+        mimetype: JSON_MIMETYPE or one of MSGPACK_MIMETYPES
+
+    Returns:
+        The decoded data
+    """
+    if mimetype in MSGPACK_MIMETYPES:
+        if msgpack is None:
+            raise UnsupportedWireFormat("MessagePack is not supported by this server")
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
+
+
+def response_mimetype() -> str:
+    """Pick the response format from the request's Accept header"""
+    if msgpack is None:
+        return JSON_MIMETYPE
+    # JSON is listed first, so it wins ties such as "*/*"
+    best = request.accept_mimetypes.best_match(
+        [JSON_MIMETYPE, MSGPACK_MIMETYPE, 'application/x-msgpack'],
+        default=JSON_MIMETYPE
+    )
+    return MSGPACK_MIMETYPE if best != JSON_MIMETYPE else JSON_MIMETYPE
+
+
+def request_payload() -> Optional[Dict]:
+    """
+    Decode the request body as JSON or MessagePack based on Content-Type
+
+    Returns:
+        The decoded body, or None if it is empty or cannot be decoded
+
+    Raises:
+        UnsupportedWireFormat: For MessagePack bodies without msgpack installed
+    """
+    mimetype = request.mimetype
+    if mimetype in MSGPACK_MIMETYPES:
+        data = request.get_data(cache=True)
+        if not data:
+            return None
+        try:
+            return decode(data, mimetype)
+        except UnsupportedWireFormat:
+            raise
+        except Exception:
+            return None
+    return request.get_json(silent=True)
+
+
+def todo_payload() -> Optional[Dict]:
+    """
+    Decode the request body and check it is a todo object
+
+    MessagePack can carry types JSON cannot (bytes, for example), which
+    would be stored and then break every JSON listing, so field types are
+    checked here for both formats.
+
+    Returns:
+        The decoded body, or None if it is empty or cannot be decoded
+
+    Raises:
+        UnsupportedWireFormat: For MessagePack bodies without msgpack installed
+        InvalidPayload: If the body is not an object or a field has the wrong type
+    """
+    data = request_payload()
+    if data is None:
+        return None
+    if not isinstance(data, dict):
+        raise InvalidPayload("Request body must be an object")
+    for field, field_type in TODO_FIELD_TYPES.items():
+        value = data.get(field)
+        if value is not None and not isinstance(value, field_type):
+            kind = "a boolean" if field_type is bool else "a string"
+            raise InvalidPayload(f"Field '{field}' must be {kind}")
+    return data
+
+
+def respond(payload: Any, status: int = 200) -> Response:
+    """
+    Build a response in the format the client asked for
+
+    Args:
+        payload: JSON-compatible data
+        status: HTTP status code
+
+    Returns:
+        A Flask response with the serialized payload
+    """
+    mimetype = response_mimetype()
+    if mimetype == JSON_MIMETYPE:
+        response = jsonify(payload)
+        response.status_code = status
+    else:
+        response = Response(encode(payload, mimetype), status=status, mimetype=mimetype)
+    if msgpack is not None:
+        response.vary.add('Accept')
+    return response
@@ -0,0 +1,120 @@
+"""
+Bounded LRU memoization for the string utility functions.
+
+Log-like inputs repeat a lot, so caching results in front of functions such
+as count_words or is_palindrome avoids recomputing them. The cache is bounded
+by an approximate size in bytes rather than by number of entries, because
+input lengths vary widely. Inputs longer than max_input_length skip the cache
+entirely, since hashing and storing them costs more than recomputing. So do
+bytearray and memoryview inputs: a bytearray may change after it is cached,
+and a cached memoryview would keep its whole underlying buffer alive.
+
+Example:
+    cache = StringCache(max_bytes=8 * 1024 * 1024)
+    cached_count_words = cache.wrap(count_words)
+    cached_count_words("hello world")
+    cache.stats()
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+
+# Rough per-entry overhead for the key tuple and the OrderedDict node
+ENTRY_OVERHEAD = 120
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_INPUT_LENGTH = 4096
+
+
+class StringCache:
+    """An LRU cache of function results bounded by approximate memory size."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_input_length=DEFAULT_MAX_INPUT_LENGTH):
+        """
+        Create a cache.
+
+        max_bytes: approximate upper bound on the memory held by cached entries
+        max_input_length: inputs longer than this bypass the cache (None for no limit)
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.max_input_length = max_input_length
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    def wrap(self, func):
+        """Return a memoized version of func that stores its results in this cache."""
+        @wraps(func)
+        def cached(text):
+            if not isinstance(text, (str, bytes)) or (
+                    self.max_input_length is not None and len(text) > self.max_input_length):
+                self.bypassed += 1
+                return func(text)
+            # Keyed on the function itself: lambdas and nested functions
+            # can share a __qualname__
+            key = (func, text)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self.misses += 1
+            result = func(text)
+            self._store(key, result)
+            return result
+
+        cached.cache = self
+        return cached
+
+    def _store(self, key, result):
+        """Insert a result and evict least recently used entries over the budget."""
+        size = sys.getsizeof(key[1]) + sys.getsizeof(result) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (result, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.bypassed = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Return hit/miss statistics and current usage."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def __len__(self):
+        return len(self._entries)
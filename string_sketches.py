@@ -0,0 +1,382 @@
+"""
+Streaming sketches for word statistics over unbounded text.
+
+An exact Counter of every word in a large log stream grows with the number
+of distinct words. These structures use fixed memory chosen from an error
+bound instead:
+
+    CountMinSketch  estimated frequency of any word (never underestimates)
+    SpaceSaving     the top-k most frequent words (heavy hitters)
+    HyperLogLog     approximate number of distinct words
+
+All three tokenize with string_utils.split_words, the same rule as
+count_words, and are mergeable: sketches built with the same parameters
+on separate chunks or processes combine into the sketch of the whole
+stream. add_text, add and estimate also take UTF-8 bytes, bytearray or
+memoryview. Count-Min and HyperLogLog hash those words without decoding
+them, and a word hashes the same as bytes or as str. SpaceSaving stores
+words, so it decodes bytes words to str and counts b"a" and "a" as one item.
+
+Example:
+    hll = HyperLogLog(error=0.01)
+    top = SpaceSaving(k=100)
+    for line in open("app.log"):
+        hll.add_text(line)
+        top.add_text(line)
+    hll.count(), top.top(10)
+
+Command line (chunks are sketched in worker processes and merged):
+    python string_sketches.py --top 20 --jobs 4 -i app.log
+"""
+
+import argparse
+import heapq
+import math
+import sys
+from hashlib import blake2b
+from multiprocessing import Pool
+
+from string_utils import split_words
+
+
+def _word(item, decode=False):
+    """
+    Return item in the form the sketches key on.
+
+    bytes, bytearray and memoryview items are UTF-8 words: returned as they
+    are, for hashing without a copy, or as str with decode=True. str words
+    are returned UTF-8 encoded, or as they are with decode=True.
+    """
+    if isinstance(item, (bytes, bytearray, memoryview)):
+        return str(item, "utf-8", "surrogateescape") if decode else item
+    if decode or not isinstance(item, str):
+        return item
+    return item.encode("utf-8", "surrogatepass")
+
+
+def _hash(item, seed, size):
+    """Return a size-byte hash of item as an integer."""
+    digest = blake2b(_word(item), digest_size=size, salt=seed.to_bytes(16, "little")).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _check_mergeable(sketch, other, attributes):
+    """Raise ValueError unless other has the same type and parameters as sketch."""
+    if type(other) is not type(sketch) or any(
+            getattr(sketch, name) != getattr(other, name) for name in attributes):
+        raise ValueError(f"Can only merge a {type(sketch).__name__} with the same "
+                         f"{', '.join(attributes)}")
+
+
+class CountMinSketch:
+    """
+    Frequency estimates in fixed memory.
+
+    With probability at least 1 - delta, estimate(x) is at most
+    epsilon * total above the true count of x, and it is never below it.
+    Uses ceil(e / epsilon) x ceil(ln(1 / delta)) counters.
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01, seed=0):
+        """
+        Create an empty sketch.
+
+        epsilon: error bound, as a fraction of the total count
+        delta: probability of exceeding the error bound
+        seed: hash seed; sketches must share it to be merged
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        self.epsilon = epsilon
+        self.delta = delta
+        self.seed = seed
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.total = 0
+        self._rows = [[0] * self.width for _ in range(self.depth)]
+
+    def _columns(self, item):
+        """Return the counter index of item in each row."""
+        # Two halves of one hash give every row's index (Kirsch-Mitzenmacher)
+        value = _hash(item, self.seed, 16)
+        h1, h2 = value & 0xFFFFFFFFFFFFFFFF, value >> 64 | 1
+        return [(h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, item, count=1):
+        """Count item count more times."""
+        for row, column in zip(self._rows, self._columns(item)):
+            row[column] += count
+        self.total += count
+
+    def add_text(self, text):
+        """Count every word in text."""
+        for word in split_words(text):
+            self.add(word)
+
+    def estimate(self, item):
+        """Return the estimated count of item."""
+        return min(row[column] for row, column in zip(self._rows, self._columns(item)))
+
+    def merge(self, other):
+        """Add the counts of another sketch with the same parameters, in place."""
+        _check_mergeable(self, other, ("width", "depth", "seed"))
+        for row, other_row in zip(self._rows, other._rows):
+            for column, value in enumerate(other_row):
+                if value:
+                    row[column] += value
+        self.total += other.total
+        return self
+
+
+class SpaceSaving:
+    """
+    The k most frequent items of a stream, using k counters.
+
+    Each monitored item has a count and an error: its true count is between
+    count - error and count. Every item whose true count exceeds total / k
+    is guaranteed to be monitored. When a new item arrives and all k
+    counters are in use, it replaces the item with the smallest count and
+    inherits that count as its error.
+    """
+
+    def __init__(self, k=100):
+        """
+        Create an empty summary.
+
+        k: number of counters; items more frequent than 1/k of the stream are found
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.total = 0
+        self._counts = {}
+        self._errors = {}
+        # Min-heap of (count, item); entries whose count is out of date are
+        # skipped when popped
+        self._heap = []
+
+    def add(self, item, count=1):
+        """Count item count more times."""
+        # One key type, so str and bytes input count together and sort
+        item = _word(item, decode=True)
+        self.total += count
+        counts = self._counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.k:
+            counts[item] = count
+            self._errors[item] = 0
+        else:
+            smallest, evicted = self._pop_min()
+            del counts[evicted]
+            del self._errors[evicted]
+            counts[item] = smallest + count
+            self._errors[item] = smallest
+        heapq.heappush(self._heap, (counts[item], item))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(value, key) for key, value in counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        """Remove and return the (count, item) with the smallest current count."""
+        while True:
+            value, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == value:
+                return value, item
+
+    def add_text(self, text):
+        """Count every word in text."""
+        for word in split_words(text):
+            self.add(word)
+
+    def top(self, n=None):
+        """Return up to n (item, count, error) tuples, most frequent first."""
+        ranked = sorted(self._counts.items(), key=lambda entry: (-entry[1], entry[0]))
+        return [(item, count, self._errors[item]) for item, count in ranked[:n]]
+
+    def estimate(self, item):
+        """Return the count of item, or 0 if it is not monitored."""
+        return self._counts.get(_word(item, decode=True), 0)
+
+    def merge(self, other):
+        """
+        Combine with another summary with the same k, in place.
+
+        An item missing from one summary may still have occurred up to that
+        summary's smallest count times, so that amount is added to both its
+        count and its error before the k largest are kept.
+        """
+        _check_mergeable(self, other, ("k",))
+        own_floor = min(self._counts.values()) if len(self._counts) == self.k else 0
+        other_floor = min(other._counts.values()) if len(other._counts) == other.k else 0
+        counts, errors = {}, {}
+        for item in self._counts.keys() | other._counts.keys():
+            if item in self._counts:
+                count, error = self._counts[item], self._errors[item]
+            else:
+                count, error = own_floor, own_floor
+            if item in other._counts:
+                count += other._counts[item]
+                error += other._errors[item]
+            else:
+                count += other_floor
+                error += other_floor
+            counts[item] = count
+            errors[item] = error
+
+        kept = heapq.nlargest(self.k, counts.items(), key=lambda entry: entry[1])
+        self._counts = dict(kept)
+        self._errors = {item: errors[item] for item in self._counts}
+        self._heap = [(value, key) for key, value in self._counts.items()]
+        heapq.heapify(self._heap)
+        self.total += other.total
+        return self
+
+
+class HyperLogLog:
+    """
+    Approximate count of distinct items in 2 ** precision bytes.
+
+    The relative standard error is about 1.04 / sqrt(2 ** precision), so
+    precision 14 (16 KB) gives roughly 0.8%.
+    """
+
+    def __init__(self, error=None, precision=14, seed=0):
+        """
+        Create an empty counter.
+
+        error: target relative standard error; overrides precision if given
+        precision: number of index bits, 4 to 18
+        seed: hash seed; counters must share it to be merged
+        """
+        if error is not None:
+            if not 0 < error < 1:
+                raise ValueError("error must be between 0 and 1")
+            precision = math.ceil(2 * math.log2(1.04 / error))
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18 (error 0.2% to 26%)")
+        self.precision = precision
+        self.seed = seed
+        self.m = 1 << precision
+        self._registers = bytearray(self.m)
+
+    @property
+    def error(self):
+        """Expected relative standard error of count()."""
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, item):
+        """Record an occurrence of item."""
+        value = _hash(item, self.seed, 8)
+        bits = 64 - self.precision
+        index = value >> bits
+        # Position of the first 1 bit in the remaining bits, counting from 1
+        rank = bits - (value & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def add_text(self, text):
+        """Record every word in text."""
+        for word in split_words(text):
+            self.add(word)
+
+    def count(self):
+        """Return the estimated number of distinct items added."""
+        m = self.m
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small cardinalities: linear counting over the empty registers
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def merge(self, other):
+        """Combine with another counter with the same precision and seed, in place."""
+        _check_mergeable(self, other, ("precision", "seed"))
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+
+def sketch_chunk(lines, k, error):
+    """Build a (SpaceSaving, HyperLogLog) pair for a list of lines."""
+    top, distinct = SpaceSaving(k), HyperLogLog(error=error)
+    for line in lines:
+        for word in split_words(line):
+            top.add(word)
+            distinct.add(word)
+    return top, distinct
+
+
+def summarize(streams, k=100, error=0.01, jobs=1, chunk_size=65536):
+    """
+    Sketch every word of the streams, in parallel chunks when jobs > 1.
+
+    Returns a merged (SpaceSaving, HyperLogLog) pair.
+    """
+    def chunks():
+        chunk = []
+        for stream in streams:
+            for line in stream:
+                chunk.append(line)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    top, distinct = SpaceSaving(k), HyperLogLog(error=error)
+    if jobs > 1:
+        with Pool(jobs) as pool:
+            partials = pool.imap_unordered(_sketch_chunk_args, ((c, k, error) for c in chunks()))
+            for chunk_top, chunk_distinct in partials:
+                top.merge(chunk_top)
+                distinct.merge(chunk_distinct)
+    else:
+        for chunk in chunks():
+            chunk_top, chunk_distinct = sketch_chunk(chunk, k, error)
+            top.merge(chunk_top)
+            distinct.merge(chunk_distinct)
+    return top, distinct
+
+
+def _sketch_chunk_args(args):
+    """Unpack arguments for sketch_chunk in a worker process."""
+    return sketch_chunk(*args)
+
+
+def main(argv=None):
+    """Print the most frequent words and the distinct word count."""
+    parser = argparse.ArgumentParser(description="Top words and distinct word count of text.")
+    parser.add_argument("-i", "--input", action="append", default=[],
+                        help="input file (repeatable, default: stdin)")
+    parser.add_argument("--top", type=int, default=20, help="words to show (default: 20)")
+    parser.add_argument("-k", type=int, default=1000,
+                        help="counters kept for heavy hitters (default: 1000)")
+    parser.add_argument("--error", type=float, default=0.01,
+                        help="relative error of the distinct count (default: 0.01)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes (default: 1)")
+    args = parser.parse_args(argv)
+
+    # Lines are split as bytes; only SpaceSaving decodes (single words)
+    files = [open(path, "rb") for path in args.input]
+    streams = files or [sys.stdin.buffer]
+    try:
+        top, distinct = summarize(streams, max(args.k, args.top), args.error, args.jobs)
+    finally:
+        for stream in files:
+            stream.close()
+
+    print(f"{top.total} words, about {distinct.count()} distinct "
+          f"(+/- {distinct.error:.1%})")
+    for word, count, error in top.top(args.top):
+        print(f"{count:>12}  {word}" + (f"  (+/- {error})" if error else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
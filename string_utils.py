@@ -1,6 +1,44 @@
 
-"""Simple string utility functions (Lab 2)."""
+"""
+Simple string utility functions (Lab 2).
 
+is_palindrome, count_vowels, split_words and count_words also accept bytes,
+bytearray and memoryview, read as UTF-8, and give the same result as calling
+them on the decoded text. They work on the bytes directly and only decode
+when a faster byte-level answer is not exact (split_words returns bytes
+words for such inputs). Invalid UTF-8 bytes count as non-space characters.
+"""
+
+BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+_VOWEL_BYTES = b"aeiouAEIOU"
+_LOWERCASE = bytes(range(256)).lower()
+# Bytes below 128 that str.split() treats as whitespace, which includes the
+# information separators \x1c-\x1f that bytes.split() does not
+_ASCII_WHITESPACE = bytes(b for b in range(128) if chr(b).isspace())
+# Only separators become b" " and everything else b"x", so words start at b" x"
+_WORD_TABLE = bytes(32 if b in _ASCII_WHITESPACE else 120 for b in range(256))
+_SEPARATOR_TABLE = bytes(32 if b in _ASCII_WHITESPACE else b for b in range(256))
+# First bytes of the UTF-8 encodings of the non-ASCII whitespace characters
+# (all of which are below U+10000)
+_UTF8_WHITESPACE_LEADS = sorted({chr(c).encode()[:1] for c in range(128, 0x10000)
+                                 if chr(c).isspace()})
+
+
+def _bytes_like(data):
+    """Return a buffer as an object with the bytes methods (bytes or bytearray)."""
+    # memoryview has no count/translate/split, so it is copied (no decoding)
+    return data.tobytes() if isinstance(data, memoryview) else data
+
+
+def _ascii_spaces_only(data):
+    """Return True if every whitespace character in UTF-8 data is ASCII."""
+    return data.isascii() or not any(lead in data for lead in _UTF8_WHITESPACE_LEADS)
+
+
+def _decode(data):
+    """Decode UTF-8 data, keeping invalid bytes as lone surrogates."""
+    return data.decode("utf-8", "surrogateescape")
 
 
 def reverse_string(text):
@@ -10,6 +48,13 @@ def reverse_string(text):
 
 def is_palindrome(text):
     """Check if a string is a palindrome (reads the same forwards and backwards)."""
+    if isinstance(text, BUFFER_TYPES):
+        data = _bytes_like(text)
+        if not data.isascii():
+            return is_palindrome(_decode(data))
+        # Drop spaces and lowercase in one pass
+        cleaned = data.translate(_LOWERCASE, delete=b" ")
+        return cleaned == cleaned[::-1]
     # Remove spaces and convert to lowercase for comparison
     cleaned = text.replace(" ", "").lower()
     return cleaned == cleaned[::-1]
@@ -17,6 +62,10 @@ def is_palindrome(text):
 
 def count_vowels(text):
     """Count the number of vowels in a string."""
+    if isinstance(text, BUFFER_TYPES):
+        # Exact for any UTF-8: bytes of non-ASCII characters are all >= 0x80
+        data = _bytes_like(text)
+        return len(data) - len(data.translate(None, delete=_VOWEL_BYTES))
     vowels = "aeiouAEIOU"
     count = 0
     for char in text:
@@ -30,11 +79,27 @@ def capitalize_words(text):
     return text.title()
 
 
+def split_words(text):
+    """Split a string into words, separated by any run of whitespace."""
+    if isinstance(text, BUFFER_TYPES):
+        data = bytes(text)
+        if _ascii_spaces_only(data):
+            return data.translate(_SEPARATOR_TABLE).split()
+        return [word.encode("utf-8", "surrogateescape") for word in _decode(data).split()]
+    return text.split()
+
+
 def count_words(text):
     """Count the number of words in a string."""
+    if isinstance(text, BUFFER_TYPES):
+        data = _bytes_like(text)
+        if not _ascii_spaces_only(data):
+            return count_words(_decode(data))
+        marked = data.translate(_WORD_TABLE)
+        return marked.count(b" x") + marked.startswith(b"x")
     if not text or text.isspace():
         return 0
-    return len(text.split())
+    return len(split_words(text))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,251 @@
+"""
+Command-line text processing built on the string utility functions.
+
+Reads lines from stdin or files and runs each one through a chain of
+operations, for example:
+
+    python string_utils_cli.py reverse capitalize words < input.txt
+    python string_utils_cli.py palindrome vowels --format ndjson -i a.txt -i b.txt
+    python string_utils_cli.py words --format csv --jobs 4 < big.log
+    python string_utils_cli.py capitalize words --cache-bytes 8000000 < app.log
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from functools import partial
+from multiprocessing import Pool
+
+from string_cache import StringCache
+from string_utils import (
+    reverse_string,
+    is_palindrome,
+    count_vowels,
+    capitalize_words,
+    count_words
+)
+
+
+# Operations that replace the current text of a line
+TRANSFORMS = {
+    "reverse": reverse_string,
+    "capitalize": capitalize_words,
+}
+
+# Operations that add a column computed from the current text
+COUNTERS = {
+    "words": count_words,
+    "vowels": count_vowels,
+}
+
+# Operations that drop lines for which they return False
+FILTERS = {
+    "palindrome": is_palindrome,
+}
+
+OPERATIONS = sorted(list(TRANSFORMS) + list(COUNTERS) + list(FILTERS))
+
+FORMATS = ("text", "ndjson", "csv")
+
+# Number of processed lines joined into a single write() call
+WRITE_BATCH = 4096
+
+
+# Pipelines built in this process, keyed by (ops, cache_bytes)
+_pipelines = {}
+
+
+def build_pipeline(ops, cache=None):
+    """
+    Turn a list of operation names into a list of (kind, name, func) steps.
+
+    If cache is a StringCache, every operation is memoized through it.
+    """
+    steps = []
+    for name in ops:
+        if name in TRANSFORMS:
+            kind, func = "transform", TRANSFORMS[name]
+        elif name in COUNTERS:
+            kind, func = "count", COUNTERS[name]
+        elif name in FILTERS:
+            kind, func = "filter", FILTERS[name]
+        else:
+            raise ValueError(f"Unknown operation: {name}")
+        if cache is not None:
+            func = cache.wrap(func)
+        steps.append((kind, name, func))
+    return steps
+
+
+def _get_pipeline(ops, cache_bytes):
+    """Return the pipeline for ops, building it (and its cache) once per process."""
+    key = (tuple(ops), cache_bytes)
+    steps = _pipelines.get(key)
+    if steps is None:
+        cache = StringCache(max_bytes=cache_bytes) if cache_bytes else None
+        steps = _pipelines[key] = build_pipeline(ops, cache)
+    return steps
+
+
+def process_line(line, steps):
+    """
+    Run one line through the pipeline.
+
+    Returns (text, counts) where counts is a list of (name, value) pairs in
+    pipeline order, or None if a filter dropped the line.
+    """
+    text = line
+    counts = []
+    for kind, name, func in steps:
+        if kind == "transform":
+            text = func(text)
+        elif kind == "count":
+            counts.append((name, func(text)))
+        elif not func(text):
+            return None
+    return text, counts
+
+
+def _process_chunk(lines, ops, cache_bytes=0):
+    """Process a list of lines; used as the unit of work for worker processes."""
+    steps = _get_pipeline(ops, cache_bytes)
+    return [process_line(line, steps) for line in lines]
+
+
+def format_text(result):
+    """Format a result as tab-separated text."""
+    text, counts = result
+    if not counts:
+        return text + "\n"
+    return text + "\t" + "\t".join(str(value) for _, value in counts) + "\n"
+
+
+def format_ndjson(result):
+    """Format a result as a single JSON object line."""
+    text, counts = result
+    record = {"text": text}
+    record.update(counts)
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def format_csv(result):
+    """Format a result as a CSV row."""
+    text, counts = result
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow([text] + [value for _, value in counts])
+    return buffer.getvalue()
+
+
+FORMATTERS = {
+    "text": format_text,
+    "ndjson": format_ndjson,
+    "csv": format_csv,
+}
+
+
+def read_lines(streams):
+    """Yield lines from each stream without their trailing newline."""
+    for stream in streams:
+        for line in stream:
+            yield line.rstrip("\r\n")
+
+
+def _chunked(lines, size):
+    """Group an iterable of lines into lists of at most size items."""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(ops, streams, out, output_format="text", jobs=1, chunk_size=WRITE_BATCH,
+        cache_bytes=0):
+    """
+    Process all lines from streams and write the results to out.
+
+    Work is split into chunks of lines; with jobs > 1 the chunks are handed to
+    a process pool and the results are written back in input order. A non-zero
+    cache_bytes memoizes the operations with a StringCache of that size (one
+    per process).
+
+    Returns the number of lines written.
+    """
+    steps = _get_pipeline(ops, cache_bytes)
+    formatter = FORMATTERS[output_format]
+    chunks = _chunked(read_lines(streams), chunk_size)
+
+    if output_format == "csv":
+        header = ["text"] + [name for kind, name, _ in steps if kind == "count"]
+        csv.writer(out, lineterminator="\n").writerow(header)
+
+    written = 0
+    pool = None
+    try:
+        if jobs > 1:
+            pool = Pool(jobs)
+            results = pool.imap(partial(_process_chunk, ops=ops, cache_bytes=cache_bytes), chunks)
+        else:
+            results = (_process_chunk(chunk, ops, cache_bytes) for chunk in chunks)
+
+        for processed in results:
+            lines = [formatter(result) for result in processed if result is not None]
+            out.write("".join(lines))
+            written += len(lines)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return written
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Apply string_utils operations to each input line."
+    )
+    parser.add_argument("ops", nargs="+", choices=OPERATIONS,
+                        help="operations to apply, in order")
+    parser.add_argument("-i", "--input", action="append", default=[],
+                        help="input file (repeatable, default: stdin)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="text",
+                        help="output format (default: text)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=WRITE_BATCH,
+                        help="lines per work unit and write (default: %(default)s)")
+    parser.add_argument("--cache-bytes", type=int, default=0,
+                        help="memoize results in an LRU cache of this many bytes per process")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for the command-line tool."""
+    args = parse_args(argv)
+    out = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="")
+    files = [open(path, encoding="utf-8", errors="replace") for path in args.input]
+    streams = files or [io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace")]
+    try:
+        run(args.ops, streams, out, args.format, args.jobs, args.chunk_size,
+            args.cache_bytes)
+        out.flush()
+    except BrokenPipeError:
+        # Downstream command (e.g. head) closed the pipe early; silence the
+        # flush at interpreter exit as recommended by the signal module docs
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        for stream in files:
+            stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Unit tests for the string utils memoization cache.
+"""
+
+import unittest
+from string_cache import StringCache
+from string_utils import count_words, is_palindrome
+
+
+class TestStringCache(unittest.TestCase):
+    """Test cases for StringCache."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.calls = []
+
+        def counting(text):
+            self.calls.append(text)
+            return count_words(text)
+
+        self.cache = StringCache(max_bytes=10_000, max_input_length=50)
+        self.cached = self.cache.wrap(counting)
+
+    def test_results_match(self):
+        """Test that cached results match the wrapped function."""
+        self.assertEqual(self.cached("hello world"), 2)
+        self.assertEqual(self.cached("hello world"), 2)
+        self.assertEqual(self.cached(""), 0)
+
+    def test_hits_and_misses(self):
+        """Test that repeated inputs are served from the cache."""
+        for _ in range(5):
+            self.cached("a b c")
+        self.cached("d e")
+
+        stats = self.cache.stats()
+        self.assertEqual(self.calls, ["a b c", "d e"])
+        self.assertEqual(stats["hits"], 4)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["entries"], 2)
+        self.assertGreater(stats["bytes"], 0)
+
+    def test_long_inputs_bypass_cache(self):
+        """Test that inputs over max_input_length are not cached."""
+        text = "word " * 20
+        self.cached(text)
+        self.cached(text)
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.cache.stats()["bypassed"], 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_mutable_buffers_bypass_cache(self):
+        """Test that bytearray and memoryview inputs are not cached."""
+        self.assertEqual(self.cached(bytearray(b"hello world")), 2)
+        self.assertEqual(self.cached(memoryview(b"hello world")), 2)
+        self.assertEqual(self.cached(b"hello world"), 2)
+        self.assertEqual(self.cached(b"hello world"), 2)
+
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(self.cache.stats()["bypassed"], 2)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_byte_limit_evicts_least_recently_used(self):
+        """Test that the cache stays under max_bytes by evicting old entries."""
+        for i in range(500):
+            self.cached(f"entry number {i}")
+
+        stats = self.cache.stats()
+        self.assertLessEqual(stats["bytes"], self.cache.max_bytes)
+        self.assertGreater(stats["evictions"], 0)
+
+        self.calls.clear()
+        self.cached("entry number 499")
+        self.cached("entry number 0")
+        self.assertEqual(self.calls, ["entry number 0"])
+
+    def test_functions_with_same_name_do_not_share_entries(self):
+        """Test that lambdas with the same qualname keep separate entries."""
+        upper = self.cache.wrap(lambda text: text.upper())
+        length = self.cache.wrap(lambda text: len(text))
+
+        self.assertEqual(upper("abc"), "ABC")
+        self.assertEqual(length("abc"), 3)
+
+    def test_functions_do_not_share_entries(self):
+        """Test that different wrapped functions keep separate entries."""
+        cached_palindrome = self.cache.wrap(is_palindrome)
+        self.assertEqual(self.cached("noon"), 1)
+        self.assertIs(cached_palindrome("noon"), True)
+
+    def test_clear(self):
+        """Test that clear empties the cache and resets statistics."""
+        self.cached("a b")
+        self.cached("a b")
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.stats()["hits"], 0)
+        self.assertEqual(self.cache.stats()["bytes"], 0)
+
+    def test_invalid_size(self):
+        """Test that a non-positive size raises ValueError."""
+        with self.assertRaises(ValueError):
+            StringCache(max_bytes=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+Unit tests for the streaming word sketches.
+"""
+
+import io
+import pickle
+import random
+import unittest
+from collections import Counter
+
+from string_sketches import CountMinSketch, HyperLogLog, SpaceSaving, summarize
+
+
+def zipf_words(count, vocabulary, seed=1):
+    """Return a skewed stream of words, like real text."""
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    return rng.choices(words, weights, k=count)
+
+
+class TestCountMinSketch(unittest.TestCase):
+    """Test cases for CountMinSketch."""
+
+    def test_never_underestimates_and_within_bound(self):
+        """Test estimates against exact counts."""
+        stream = zipf_words(20000, 2000)
+        exact = Counter(stream)
+        sketch = CountMinSketch(epsilon=0.005, delta=0.01)
+        for word in stream:
+            sketch.add(word)
+
+        bound = sketch.epsilon * sketch.total
+        errors = [sketch.estimate(word) - count for word, count in exact.items()]
+        self.assertTrue(all(error >= 0 for error in errors))
+        self.assertLessEqual(sum(error > bound for error in errors), 0.01 * len(errors) + 1)
+        self.assertLessEqual(sketch.estimate("never-seen"), bound)
+
+    def test_dimensions_follow_error_bounds(self):
+        """Test that width and depth come from epsilon and delta."""
+        sketch = CountMinSketch(epsilon=0.01, delta=0.001)
+        self.assertEqual((sketch.width, sketch.depth), (272, 7))
+
+    def test_merge(self):
+        """Test that merged sketches equal one sketch over both streams."""
+        left, right, whole = CountMinSketch(0.01), CountMinSketch(0.01), CountMinSketch(0.01)
+        left.add_text("a b a c")
+        right.add_text("a d")
+        whole.add_text("a b a c a d")
+
+        left.merge(right)
+        self.assertEqual(left._rows, whole._rows)
+        self.assertEqual(left.total, 6)
+        with self.assertRaises(ValueError):
+            left.merge(CountMinSketch(0.02))
+
+    def test_buffer_items(self):
+        """Test that bytes, bytearray and memoryview words count as the str word."""
+        sketch = CountMinSketch(0.01)
+        sketch.add("caf\u00e9")
+        sketch.add("caf\u00e9".encode("utf-8"))
+        sketch.add(bytearray("caf\u00e9".encode("utf-8")))
+        sketch.add(memoryview("caf\u00e9".encode("utf-8")))
+        self.assertEqual(sketch.estimate("caf\u00e9"), 4)
+        self.assertEqual(sketch.estimate(bytearray("caf\u00e9".encode("utf-8"))), 4)
+
+
+class TestSpaceSaving(unittest.TestCase):
+    """Test cases for SpaceSaving."""
+
+    def test_finds_heavy_hitters(self):
+        """Test that every word above total / k is reported."""
+        stream = zipf_words(50000, 5000)
+        exact = Counter(stream)
+        summary = SpaceSaving(k=50)
+        for word in stream:
+            summary.add(word)
+
+        found = {item for item, _, _ in summary.top()}
+        for word, count in exact.items():
+            if count > len(stream) / summary.k:
+                self.assertIn(word, found)
+        for item, count, error in summary.top():
+            self.assertLessEqual(count - error, exact[item])
+            self.assertGreaterEqual(count, exact[item])
+        self.assertEqual(summary.top(1)[0][0], "w0")
+
+    def test_exact_when_under_capacity(self):
+        """Test that counts are exact with fewer distinct words than k."""
+        summary = SpaceSaving(k=10)
+        summary.add_text("the cat and the hat and the bat")
+
+        self.assertEqual(summary.top(2), [("the", 3, 0), ("and", 2, 0)])
+        self.assertEqual(summary.estimate("dog"), 0)
+
+    def test_mixed_str_and_bytes(self):
+        """Test that bytes words are counted together with equal str words."""
+        top = SpaceSaving(k=10)
+        top.add_text("x a")
+        top.add_text(b"y a")
+        top.add_text(memoryview("caf\u00e9 a".encode("utf-8")))
+
+        self.assertEqual(top.top(2), [("a", 3, 0), ("caf\u00e9", 1, 0)])
+        self.assertEqual(top.estimate("a"), 3)
+        self.assertEqual(top.estimate(b"a"), 3)
+        self.assertEqual(top.estimate(memoryview(b"a")), 3)
+
+    def test_merge(self):
+        """Test merging summaries of two halves of a stream."""
+        stream = zipf_words(20000, 1000)
+        exact = Counter(stream)
+        left, right = SpaceSaving(k=40), SpaceSaving(k=40)
+        for word in stream[:10000]:
+            left.add(word)
+        for word in stream[10000:]:
+            right.add(word)
+
+        merged = pickle.loads(pickle.dumps(left)).merge(right)
+        self.assertEqual(merged.total, len(stream))
+        for item, count, error in merged.top():
+            self.assertGreaterEqual(count, exact[item])
+            self.assertLessEqual(count - error, exact[item])
+        self.assertEqual([item for item, _, _ in merged.top(3)], ["w0", "w1", "w2"])
+        with self.assertRaises(ValueError):
+            merged.merge(SpaceSaving(k=5))
+
+
+class TestHyperLogLog(unittest.TestCase):
+    """Test cases for HyperLogLog."""
+
+    def test_estimates_within_error(self):
+        """Test cardinality estimates at several sizes."""
+        for distinct in (10, 1000, 100000):
+            hll = HyperLogLog(precision=12)
+            for i in range(distinct):
+                hll.add(f"word-{i}")
+                hll.add(f"word-{i}")
+            self.assertLess(abs(hll.count() - distinct) / distinct, 4 * hll.error)
+
+    def test_error_selects_precision(self):
+        """Test that a target error picks enough registers."""
+        hll = HyperLogLog(error=0.01)
+        self.assertEqual(hll.precision, 14)
+        self.assertLessEqual(hll.error, 0.01)
+        with self.assertRaises(ValueError):
+            HyperLogLog(error=0.0001)
+
+    def test_merge(self):
+        """Test that merging counts the union."""
+        left, right = HyperLogLog(precision=12), HyperLogLog(precision=12)
+        for i in range(6000):
+            left.add(f"word-{i}")
+        for i in range(4000, 10000):
+            right.add(f"word-{i}")
+
+        left.merge(right)
+        self.assertLess(abs(left.count() - 10000) / 10000, 4 * left.error)
+        with self.assertRaises(ValueError):
+            left.merge(HyperLogLog(precision=12, seed=1))
+
+    def test_add_text_uses_word_tokenization(self):
+        """Test that only distinct words are counted."""
+        hll = HyperLogLog()
+        hll.add_text("to be or not to be")
+        self.assertEqual(hll.count(), 4)
+
+    def test_bytes_match_text(self):
+        """Test that bytes input hashes words the same as str input."""
+        text, data = HyperLogLog(precision=8), HyperLogLog(precision=8)
+        text.add_text("caf\u00e9 au lait caf\u00e9")
+        data.add_text(memoryview("caf\u00e9 au lait caf\u00e9".encode("utf-8")))
+        self.assertEqual(text._registers, data._registers)
+
+    def test_add_buffer_items(self):
+        """Test that add takes bytearray and memoryview words like str ones."""
+        text, data = HyperLogLog(precision=8), HyperLogLog(precision=8)
+        text.add("caf\u00e9")
+        text.add("au")
+        data.add(bytearray("caf\u00e9".encode("utf-8")))
+        data.add(memoryview(b"au"))
+        self.assertEqual(text._registers, data._registers)
+
+
+class TestSummarize(unittest.TestCase):
+    """Test cases for chunked summaries."""
+
+    def test_chunks_merge_to_exact_small_counts(self):
+        """Test that per-chunk sketches combine correctly."""
+        lines = ["a b c a", "b a d", "a e"] * 100
+        top, distinct = summarize([io.StringIO("\n".join(lines))], k=10, chunk_size=7)
+
+        self.assertEqual(top.total, 900)
+        self.assertEqual(top.top(2), [("a", 400, 0), ("b", 200, 0)])
+        self.assertEqual(distinct.count(), 5)
+
+    def test_binary_streams(self):
+        """Test that binary streams are sketched without decoding."""
+        top, distinct = summarize([io.BytesIO(b"a b a\nc a\n")], k=10)
+
+        self.assertEqual(top.top(1), [("a", 3, 0)])
+        self.assertEqual(distinct.count(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
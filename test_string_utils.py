@@ -8,7 +8,8 @@ from string_utils import (
     is_palindrome,
     count_vowels,
     capitalize_words,
-    count_words
+    count_words,
+    split_words
 )
 
 
@@ -53,6 +54,61 @@ class TestStringUtils(unittest.TestCase):
         self.assertEqual(count_words("   "), 0)
         self.assertEqual(count_words("Python is awesome"), 3)
 
+    def test_split_words(self):
+        """Test splitting on runs of whitespace."""
+        self.assertEqual(split_words(" hello\tworld\n again "), ["hello", "world", "again"])
+        self.assertEqual(split_words(""), [])
+
+
+class TestBufferInputs(unittest.TestCase):
+    """Test that bytes-like inputs give the same results as decoded text."""
+
+    SAMPLES = [
+        "hello world",
+        "A man a plan a canal Panama",
+        "",
+        "   ",
+        " tabs\tand\nnew lines\r\n",
+        "unit\x1fseparators\x1cbetween",
+        "café naïve Über",
+        "\u201cquoted\u201d\u00a0no-break\u3000ideographic\u2003em",
+        "été",
+    ]
+
+    @staticmethod
+    def buffers(text):
+        """Return text as bytes, bytearray and a memoryview slice."""
+        data = text.encode("utf-8")
+        return [data, bytearray(data), memoryview(b"--" + data + b"--")[2:-2]]
+
+    def test_results_match_decoded_text(self):
+        """Test every function on every buffer type against the str result."""
+        for text in self.SAMPLES:
+            for data in self.buffers(text):
+                with self.subTest(text=text, type=type(data).__name__):
+                    self.assertEqual(count_vowels(data), count_vowels(text))
+                    self.assertEqual(count_words(data), count_words(text))
+                    self.assertEqual(is_palindrome(data), is_palindrome(text))
+                    self.assertEqual(split_words(data),
+                                     [word.encode("utf-8") for word in split_words(text)])
+
+    def test_palindrome_bytes(self):
+        """Test palindromes given as bytes, including non-ASCII ones."""
+        self.assertTrue(is_palindrome(b"Never odd or even"))
+        self.assertTrue(is_palindrome("été".encode("utf-8")))
+        self.assertFalse(is_palindrome(memoryview(b"hello")))
+
+    def test_split_words_returns_bytes(self):
+        """Test that words from any buffer are hashable bytes."""
+        for data in self.buffers("one two"):
+            self.assertEqual(split_words(data), [b"one", b"two"])
+
+    def test_invalid_utf8_counts_as_text(self):
+        """Test that invalid UTF-8 bytes are non-space, non-vowel characters."""
+        self.assertEqual(count_words(b"ab\xff cd"), 2)
+        self.assertEqual(split_words(b"ab\xff \xc2\xa0cd"), [b"ab\xff", b"cd"])
+        self.assertEqual(count_vowels(b"\xffa\xfe"), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
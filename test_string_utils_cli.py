@@ -0,0 +1,73 @@
+"""
+Unit tests for the string utils command-line tool.
+"""
+
+import io
+import json
+import unittest
+from string_utils_cli import build_pipeline, process_line, run
+
+
+class TestStringUtilsCli(unittest.TestCase):
+    """Test cases for the string utils command-line tool."""
+
+    def run_cli(self, ops, text, output_format="text", jobs=1, chunk_size=2, cache_bytes=0):
+        """Run the pipeline over text and return the written output."""
+        out = io.StringIO()
+        run(ops, [io.StringIO(text)], out, output_format, jobs, chunk_size, cache_bytes)
+        return out.getvalue()
+
+    def test_process_line_chain(self):
+        """Test that operations are applied in order."""
+        steps = build_pipeline(["reverse", "capitalize", "words"])
+        self.assertEqual(process_line("hello world", steps), ("Dlrow Olleh", [("words", 2)]))
+
+    def test_process_line_filter(self):
+        """Test that the palindrome filter drops lines."""
+        steps = build_pipeline(["palindrome"])
+        self.assertIsNone(process_line("hello", steps))
+        self.assertEqual(process_line("racecar", steps), ("racecar", []))
+
+    def test_unknown_operation(self):
+        """Test that unknown operations raise ValueError."""
+        with self.assertRaises(ValueError):
+            build_pipeline(["shout"])
+
+    def test_text_output(self):
+        """Test tab-separated text output."""
+        output = self.run_cli(["words", "vowels"], "hello world\nabc\n")
+        self.assertEqual(output, "hello world\t2\t3\nabc\t1\t1\n")
+
+    def test_ndjson_output(self):
+        """Test NDJSON output."""
+        output = self.run_cli(["palindrome", "words"], "racecar\nhello\nnoon\n", "ndjson")
+        records = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(records, [
+            {"text": "racecar", "words": 1},
+            {"text": "noon", "words": 1}
+        ])
+
+    def test_csv_output(self):
+        """Test CSV output with header and quoting."""
+        output = self.run_cli(["vowels"], "a, e\n", "csv")
+        self.assertEqual(output, 'text,vowels\n"a, e",2\n')
+
+    def test_multiple_processes(self):
+        """Test that worker processes keep input order."""
+        text = "".join(f"line {i}\n" for i in range(50))
+        self.assertEqual(
+            self.run_cli(["reverse", "words"], text, jobs=2),
+            self.run_cli(["reverse", "words"], text, jobs=1)
+        )
+
+    def test_cached_pipeline(self):
+        """Test that memoized operations give the same output."""
+        text = "hello world\nracecar\n" * 10
+        self.assertEqual(
+            self.run_cli(["capitalize", "words", "vowels"], text, cache_bytes=100_000),
+            self.run_cli(["capitalize", "words", "vowels"], text)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()